@@ -0,0 +1,140 @@
+"""
+WordRepository의 비동기 버전
+
+각 메서드는 같은 이름의 WordRepository 메서드를 db_executor에서 실행한다.
+읽기는 읽기 스레드풀, 쓰기는 단일 쓰기 큐를 거친다.
+단어 목록은 다 읽은 결과(mode="list", "json")만 - 스트림은 라우트가 WordRepository에서 바로 받는다.
+"""
+
+from typing import List, Optional, Tuple
+from db_executor import db_executor
+from models import Word, WordPatch, WordUpdate
+from repository import Cursor, ListMode, WordFilter, WordList, WordRepository
+
+
+class AsyncWordRepository:
+    """이벤트 루프를 막지 않는 단어 데이터베이스 접근 계층"""
+
+    @staticmethod
+    async def all_words(
+        after: Optional[Cursor] = None, limit: Optional[int] = None, sort: Optional[str] = None, mode: ListMode = "list"
+    ) -> WordList:
+        return await db_executor.read(WordRepository.all_words, after, limit, sort, mode)
+
+    @staticmethod
+    async def words_by_kanji(
+        kanji: str,
+        after: Optional[Cursor] = None,
+        limit: Optional[int] = None,
+        sort: Optional[str] = None,
+        mode: ListMode = "list",
+    ) -> WordList:
+        return await db_executor.read(WordRepository.words_by_kanji, kanji, after, limit, sort, mode)
+
+    @staticmethod
+    async def words_by_category(
+        category: str,
+        after: Optional[Cursor] = None,
+        limit: Optional[int] = None,
+        descendants: bool = False,
+        sort: Optional[str] = None,
+        mode: ListMode = "list",
+    ) -> WordList:
+        return await db_executor.read(
+            WordRepository.words_by_category, category, after, limit, descendants, sort, mode
+        )
+
+    @staticmethod
+    async def search_words(query: str, limit: int = 50, offset: int = 0, mode: ListMode = "list") -> WordList:
+        return await db_executor.read(WordRepository.search_words, query, limit, offset, mode)
+
+    @staticmethod
+    async def get_data_version() -> str:
+        return await db_executor.read(WordRepository.get_data_version)
+
+    @staticmethod
+    async def get_all_kanji() -> List[str]:
+        return await db_executor.read(WordRepository.get_all_kanji)
+
+    @staticmethod
+    async def get_kanji_stats(sort: str = "count", limit: Optional[int] = None, offset: int = 0) -> List[dict]:
+        return await db_executor.read(WordRepository.get_kanji_stats, sort, limit, offset)
+
+    @staticmethod
+    async def get_random_kanji(weighted: bool = False, category: Optional[str] = None) -> Optional[str]:
+        return await db_executor.read(WordRepository.get_random_kanji, weighted, category)
+
+    @staticmethod
+    async def get_random_words(n: int = 1, weighted: bool = False, category: Optional[str] = None) -> List[dict]:
+        return await db_executor.read(WordRepository.get_random_words, n, weighted, category)
+
+    @staticmethod
+    async def get_all_categories() -> List[str]:
+        return await db_executor.read(WordRepository.get_all_categories)
+
+    @staticmethod
+    async def get_category_tree() -> List[dict]:
+        return await db_executor.read(WordRepository.get_category_tree)
+
+    @staticmethod
+    async def get_category_children(category: str) -> Optional[dict]:
+        return await db_executor.read(WordRepository.get_category_children, category)
+
+    @staticmethod
+    async def get_hot_words(limit: int = 20) -> List[dict]:
+        return await db_executor.read(WordRepository.get_hot_words, limit)
+
+    @staticmethod
+    async def flush_view_counts() -> int:
+        return await db_executor.write(WordRepository.flush_view_counts)
+
+    @staticmethod
+    async def get_due_reviews(n: int = 20) -> List[dict]:
+        # 꺼낸 단어를 임대하므로(due_at 갱신) 쓰기 큐에서
+        return await db_executor.write(WordRepository.get_due_reviews, n)
+
+    @staticmethod
+    async def answer_reviews(answers: List[Tuple[int, int]]) -> dict:
+        return await db_executor.write(WordRepository.answer_reviews, answers)
+
+    @staticmethod
+    async def filtered_words(
+        word_filter: WordFilter,
+        after: Optional[Cursor] = None,
+        limit: Optional[int] = None,
+        sort: Optional[str] = None,
+        mode: ListMode = "list",
+    ) -> WordList:
+        return await db_executor.read(WordRepository.filtered_words, word_filter, after, limit, sort, mode)
+
+    @staticmethod
+    async def count_filtered_words(word_filter: WordFilter) -> int:
+        return await db_executor.read(WordRepository.count_filtered_words, word_filter)
+
+    @staticmethod
+    async def get_changes(since: Optional[int] = None, limit: int = 1000) -> dict:
+        return await db_executor.read(WordRepository.get_changes, since, limit)
+
+    @staticmethod
+    async def add_word(word: Word) -> dict:
+        return await db_executor.write(WordRepository.add_word, word)
+
+    @staticmethod
+    async def move_category(category: str, parent: Optional[str]) -> dict:
+        return await db_executor.write(WordRepository.move_category, category, parent)
+
+    @staticmethod
+    async def add_words_bulk(words: List[Word]) -> List[Optional[int]]:
+        return await db_executor.write(WordRepository.add_words_bulk, words)
+
+    @staticmethod
+    async def update_word(word_id: int, updated_word: WordUpdate) -> dict:
+        return await db_executor.write(WordRepository.update_word, word_id, updated_word)
+
+    @staticmethod
+    async def patch_word(word_id: int, patch: WordPatch) -> dict:
+        return await db_executor.write(WordRepository.patch_word, word_id, patch)
+
+    @staticmethod
+    async def delete_word(word_id: int) -> dict:
+        return await db_executor.write(WordRepository.delete_word, word_id)
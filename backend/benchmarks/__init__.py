@@ -0,0 +1 @@
+"""백엔드 성능 측정 스크립트 모음 (backend 디렉터리에서 python -m benchmarks.<모듈> 로 실행)"""
@@ -0,0 +1,133 @@
+"""
+동시 요청 처리 비교 - 동기 경로 vs 비동기 경로
+
+- sync: 기존 sync def 라우트처럼 anyio 스레드풀(기본 40개)에서 WordRepository를 직접 호출.
+        쓰기 스레드마다 자기 연결을 쓰므로 쓰기끼리 SQLite 잠금을 두고 경쟁한다.
+- async: AsyncWordRepository - 읽기는 DB 읽기 스레드풀, 쓰기는 단일 쓰기 큐.
+
+클라이언트마다 읽기(/words_list 상당)와 쓰기(wrong_count 수정)를 섞어 보내고
+읽기/쓰기 지연 시간 분포, 전체 처리 시간, 실패 수를 비교한다. 원본 DB는 복사본으로 측정.
+
+    python -m benchmarks.concurrency --clients 32 --requests 20 --write-ratio 0.2
+"""
+
+import argparse
+import asyncio
+import os
+import random
+import shutil
+import statistics
+import tempfile
+import time
+
+import anyio
+
+import database
+from async_repository import AsyncWordRepository
+from db_executor import db_executor
+from models import WordUpdate
+from repository import WordRepository
+
+
+def _percentile(values, p: float) -> float:
+    if not values:
+        return 0.0
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * p))]
+
+
+def _summary(latencies) -> dict:
+    return {
+        "count": len(latencies),
+        "p50_ms": _percentile(latencies, 0.5) * 1000,
+        "p95_ms": _percentile(latencies, 0.95) * 1000,
+        "mean_ms": statistics.fmean(latencies) * 1000 if latencies else 0.0,
+    }
+
+
+async def _run_workload(read, write, samples, clients: int, requests: int, write_ratio: float, seed: int) -> dict:
+    rnd = random.Random(seed)
+    plans = [[rnd.random() < write_ratio for _ in range(requests)] for _ in range(clients)]
+    reads, writes = [], []
+    errors = 0
+
+    async def client(plan):
+        nonlocal errors
+        for is_write in plan:
+            start = time.perf_counter()
+            try:
+                if is_write:
+                    word = rnd.choice(samples)
+                    await write(word["id"], WordUpdate(**{**word, "wrong_count": rnd.randint(0, 5)}))
+                    writes.append(time.perf_counter() - start)
+                else:
+                    await read()
+                    reads.append(time.perf_counter() - start)
+            except Exception:
+                errors += 1
+
+    start = time.perf_counter()
+    await asyncio.gather(*(client(plan) for plan in plans))
+    return {
+        "total_s": time.perf_counter() - start,
+        "errors": errors,
+        "read": _summary(reads),
+        "write": _summary(writes),
+    }
+
+
+async def run(db_path: str, clients: int = 32, requests: int = 20, write_ratio: float = 0.2, seed: int = 0) -> dict:
+    """두 경로에서 같은 작업을 실행한 결과"""
+    database.configure_database(db_path)
+    samples = WordRepository.all_words(limit=200)
+
+    async def sync_read():
+        return await anyio.to_thread.run_sync(WordRepository.all_words)
+
+    async def sync_write(word_id, word):
+        return await anyio.to_thread.run_sync(WordRepository.update_word, word_id, word)
+
+    try:
+        results = {
+            "sync": await _run_workload(sync_read, sync_write, samples, clients, requests, write_ratio, seed),
+            "async": await _run_workload(
+                AsyncWordRepository.all_words,
+                AsyncWordRepository.update_word,
+                samples,
+                clients,
+                requests,
+                write_ratio,
+                seed,
+            ),
+        }
+    finally:
+        db_executor.shutdown()
+        database.close_db_pools()
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="동기/비동기 경로 동시성 벤치마크")
+    parser.add_argument("--db", default=database.DATABASE_URL, help="측정할 DB 파일 (복사본으로 측정)")
+    parser.add_argument("--clients", type=int, default=32)
+    parser.add_argument("--requests", type=int, default=20, help="클라이언트당 요청 수")
+    parser.add_argument("--write-ratio", type=float, default=0.2)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db_copy = os.path.join(tmp, "bench.db")
+        shutil.copy(args.db, db_copy)
+        results = asyncio.run(run(db_copy, args.clients, args.requests, args.write_ratio))
+
+    print(f"동시 클라이언트 {args.clients}개 x 요청 {args.requests}개 (쓰기 비율 {args.write_ratio:.0%})")
+    for name, result in results.items():
+        read, write = result["read"], result["write"]
+        print(
+            f"  - {name:5}: 전체 {result['total_s']:.2f}s | 실패 {result['errors']}"
+            f" | 읽기 p50 {read['p50_ms']:.1f}ms p95 {read['p95_ms']:.1f}ms"
+            f" | 쓰기 p50 {write['p50_ms']:.1f}ms p95 {write['p95_ms']:.1f}ms"
+        )
+
+
+if __name__ == "__main__":
+    main()
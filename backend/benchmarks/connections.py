@@ -0,0 +1,81 @@
+"""
+요청 1회당 DB 연결 오버헤드 측정
+
+- before: 매번 sqlite3.connect (PRAGMA 없음) - 기존 get_db_connection 방식
+- fresh: 매번 PRAGMA가 적용된 새 연결 (get_db_connection)
+- pooled: 스레드별 풀 연결 재사용 (db_connection)
+
+원본 DB를 건드리지 않도록 임시 디렉터리에 복사한 뒤 측정한다.
+
+    python -m benchmarks.connections --iterations 2000
+"""
+
+import argparse
+import os
+import shutil
+import sqlite3
+import tempfile
+import time
+
+import database
+
+QUERY = "SELECT name FROM categories ORDER BY name"
+
+
+def _time_per_call(fn, iterations: int) -> float:
+    """fn을 iterations번 실행한 평균 시간 (µs)"""
+    fn()  # 워밍업
+    start = time.perf_counter()
+    for _ in range(iterations):
+        fn()
+    return (time.perf_counter() - start) / iterations * 1_000_000
+
+
+def run(db_path: str, iterations: int = 2000) -> dict:
+    """세 가지 연결 방식의 호출당 평균 시간(µs) 측정"""
+    database.configure_database(db_path)
+
+    def before():
+        conn = sqlite3.connect(db_path)
+        conn.row_factory = sqlite3.Row
+        conn.execute(QUERY).fetchall()
+        conn.close()
+
+    def fresh():
+        conn = database.get_db_connection()
+        conn.execute(QUERY).fetchall()
+        conn.close()
+
+    def pooled():
+        with database.db_connection(readonly=True) as conn:
+            conn.execute(QUERY).fetchall()
+
+    try:
+        return {
+            "before_us": _time_per_call(before, iterations),
+            "fresh_us": _time_per_call(fresh, iterations),
+            "pooled_us": _time_per_call(pooled, iterations),
+        }
+    finally:
+        database.close_db_pools()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="DB 연결 오버헤드 벤치마크")
+    parser.add_argument("--db", default=database.DATABASE_URL, help="측정할 DB 파일 (복사본으로 측정)")
+    parser.add_argument("--iterations", type=int, default=2000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db_copy = os.path.join(tmp, "bench.db")
+        shutil.copy(args.db, db_copy)
+        result = run(db_copy, args.iterations)
+
+    print(f"요청당 연결 오버헤드 ({args.iterations:,}회 평균, 쿼리 포함)")
+    print(f"  - before (connect, PRAGMA 없음): {result['before_us']:8.1f} µs")
+    print(f"  - fresh  (connect + PRAGMA)    : {result['fresh_us']:8.1f} µs")
+    print(f"  - pooled (스레드별 재사용)      : {result['pooled_us']:8.1f} µs")
+
+
+if __name__ == "__main__":
+    main()
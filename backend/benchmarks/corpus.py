@@ -0,0 +1,160 @@
+"""
+벤치마크용 합성 단어장 생성기
+
+같은 seed면 항상 같은 단어장을 만든다. 실제 단어장과 비슷하도록
+- 한자는 자주 쓰는 한자 목록에서 Zipf 분포로 뽑아 1~3글자 한자어를 만들고, 일부는 오쿠리가나를 붙인다
+- 히라가나만 있는 단어와 예문(문장)도 섞는다
+- 읽기(히라가나)와 한국어 발음, 한국어 뜻을 함께 만든다
+- 카테고리도 Zipf 분포로 0~3개씩 붙인다
+
+    python -m benchmarks.corpus --size 10k --out corpus_10k.db
+"""
+
+import argparse
+import random
+from datetime import datetime, timedelta, timezone
+from typing import Iterator, List, Tuple
+
+import database
+from repository import WordRepository
+
+SIZES = {"1k": 1_000, "10k": 10_000, "100k": 100_000, "1m": 1_000_000}
+
+COMMON_KANJI = (
+    "日一国会人年大十二本中長出三同時政事自行社見月分議後前民生連五発間対上部東者党地合市業内相方四定"
+    "今回新場金員九入選立開手米力学問高代明実円関決子動京全目表戦経通外最言氏現理調体化田当八六約主題"
+    "下首意法不来作性的要用制治度務強気小七成期公持野協取都和統以機平総加山思家話世受区領多県続進正安"
+    "設保改数記院女初北午指権心界支第産結百派点教報済書府活原先共得解名交資予川向際査勝面委告軍文反元"
+    "重近千考判認画海参売利組知案道信策集在件団別物側任引使求所次水半品昨論計死官増係感特情投示変打男"
+    "基私各始島直両朝革価式確村提運終挙果西勢減台広容必応演電歳住争談能無再位置企真流格有疑口過局少放"
+    "税検藤町常校料沢裁状工建語球営空職証土与急止送援供可役構木割聞身費付施切由説転食比難防補車優夫研"
+    "収断井何南石足違消境神番規術護展態導鮮備宅害配副算視条幹独警宮究育席輸訪楽起万着乗店述残想線率病"
+)
+HIRAGANA = (
+    "あいうえおかきくけこさしすせそたちつてとなにぬねのはひふへほまみむめもやゆよらりるれろわん"
+    "がぎぐげござじずぜぞだでどばびぶべぼぱぴぷぺぽ"
+)
+KANA_TO_HANGUL = dict(zip(
+    HIRAGANA,
+    "아이우에오카키쿠케코사시스세소타치츠테토나니누네노하히후헤호마미무메모야유요라리루레로와응"
+    "가기구게고자지즈제조다데도바비부베보파피푸페포",
+))
+OKURIGANA = ["る", "う", "く", "す", "む", "い", "しい", "める", "える", "かる", "らう"]
+HANGUL_SYLLABLES = "가나다라마바사아자차카타파하고노도로모보소오조초코토포호구누두루무부수우주추거너더러머버서어저학생선물건강문화"
+CATEGORIES = [
+    "자연물", "방향", "시간", "직업", "언론", "요리", "동물", "감정", "교통", "학교", "회사", "경어", "존경어",
+    "겸양어", "북마크", "문법", "예문", "가족", "날씨", "건강", "스포츠", "음악", "여행", "쇼핑", "의류", "색",
+    "숫자", "신체", "집", "도시", "정치", "경제", "과학", "컴퓨터", "법률", "의학", "역사", "종교", "예술", "문학",
+]
+SENTENCE_ENDINGS = ["です。", "ます。", "でした。", "ましょう。", "だよ。", "わよ。", "んだ。"]
+
+BASE_TIME = datetime(2024, 1, 1, tzinfo=timezone.utc)
+
+
+def _zipf_weights(n: int, s: float = 1.1) -> List[float]:
+    return [1 / (rank ** s) for rank in range(1, n + 1)]
+
+
+class CorpusGenerator:
+    """seed로 결정되는 합성 단어 생성기"""
+
+    def __init__(self, seed: int = 0):
+        self.rnd = random.Random(seed)
+        self.kanji = list(dict.fromkeys(COMMON_KANJI))
+        self.kanji_weights = _zipf_weights(len(self.kanji))
+        self.category_weights = _zipf_weights(len(CATEGORIES), 0.9)
+
+    def _kana(self, length: int) -> str:
+        return "".join(self.rnd.choice(HIRAGANA) for _ in range(length))
+
+    def _korean_pronunciation(self, kana: str) -> str:
+        return "".join(KANA_TO_HANGUL.get(char, "") for char in kana)
+
+    def _meaning(self) -> str:
+        length = self.rnd.randint(2, 4)
+        return "".join(self.rnd.choice(HANGUL_SYLLABLES) for _ in range(length)) + self.rnd.choice(["", "", "하다", "되다"])
+
+    def _categories(self) -> List[str]:
+        count = self.rnd.choices([0, 1, 2, 3], weights=[40, 40, 15, 5])[0]
+        return list(dict.fromkeys(self.rnd.choices(CATEGORIES, weights=self.category_weights, k=count)))
+
+    def word(self, index: int) -> Tuple:
+        """index번째 단어 - WordRepository._insert_words가 받는 튜플 형식"""
+        kind = self.rnd.random()
+        if kind < 0.8:
+            # 한자어 (+ 오쿠리가나)
+            kanji = "".join(self.rnd.choices(self.kanji, weights=self.kanji_weights, k=self.rnd.choice([1, 2, 2, 2, 3])))
+            okurigana = self.rnd.choice(OKURIGANA) if self.rnd.random() < 0.3 else ""
+            reading = self._kana(len(kanji) * 2) + okurigana
+            word = kanji + okurigana
+        elif kind < 0.9:
+            # 히라가나만 있는 단어
+            reading = self._kana(self.rnd.randint(2, 5))
+            word = reading
+        else:
+            # 예문
+            parts = [
+                "".join(self.rnd.choices(self.kanji, weights=self.kanji_weights, k=2)) + self._kana(2)
+                for _ in range(self.rnd.randint(2, 4))
+            ]
+            word = "".join(parts) + self.rnd.choice(SENTENCE_ENDINGS)
+            reading = ""
+
+        categories = self._categories()
+        if kind >= 0.9:
+            categories = ["예문"] + [c for c in categories if c != "예문"]
+
+        created_at = BASE_TIME + timedelta(minutes=index * 7)
+        updated_at = created_at + timedelta(minutes=self.rnd.randint(0, 60 * 24 * 30) if self.rnd.random() < 0.2 else 0)
+        return (
+            word,
+            reading,
+            self._meaning(),
+            self._korean_pronunciation(reading),
+            min(int(self.rnd.expovariate(1.5)), 20),
+            created_at.isoformat(sep=" "),
+            updated_at.isoformat(sep=" "),
+            categories,
+        )
+
+    def words(self, count: int) -> Iterator[Tuple]:
+        for index in range(count):
+            yield self.word(index)
+
+
+def build_corpus_db(path: str, size: int, seed: int = 0, batch_size: int = 5000) -> int:
+    """path에 size개 단어의 합성 DB 생성 (중복으로 빠진 만큼 더 만들어 정확히 size개), 생성된 단어 수 반환"""
+    database.configure_database(path)
+    database.init_db()
+
+    generator = CorpusGenerator(seed)
+    inserted = 0
+    index = 0
+    with database.db_connection() as conn:
+        cursor = conn.cursor()
+        category_cache = WordRepository._load_category_ids(cursor)
+        while inserted < size:
+            batch = [generator.word(index + i) for i in range(min(batch_size, size - inserted))]
+            index += len(batch)
+            word_ids = WordRepository._insert_words(cursor, batch, category_cache)
+            inserted += sum(1 for word_id in word_ids if word_id is not None)
+            conn.commit()
+        conn.execute("ANALYZE")
+    database.close_db_pools()
+    return inserted
+
+
+def main():
+    parser = argparse.ArgumentParser(description="합성 단어장 DB 생성")
+    parser.add_argument("--size", default="10k", help=f"단어 수 ({', '.join(SIZES)} 또는 숫자)")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--out", required=True, help="생성할 DB 파일")
+    args = parser.parse_args()
+
+    size = SIZES.get(args.size.lower()) or int(args.size)
+    count = build_corpus_db(args.out, size, args.seed)
+    print(f"✅ {args.out}: 단어 {count:,}개 생성")
+
+
+if __name__ == "__main__":
+    main()
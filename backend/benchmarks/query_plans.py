@@ -0,0 +1,181 @@
+"""
+repository.py 조회 쿼리의 실행 계획 회귀 검사
+
+마이그레이션을 적용한 DB에서 각 쿼리의 EXPLAIN QUERY PLAN을 확인한다.
+- 인덱스 없이 테이블 전체를 읽는 'SCAN <table>'이 있으면 실패
+- 정렬이 인덱스 순서로 처리되어야 하는 쿼리(keyset 페이지네이션, 전체 목록)에 'USE TEMP B-TREE'가 있으면 실패
+
+전체 목록처럼 모든 행이 필요한 쿼리는 인덱스 전체를 순서대로 읽는 것(SCAN ... USING INDEX)까지 허용한다.
+
+    python -m benchmarks.query_plans [--db kanji_vocab.db]   # 문제가 있으면 종료 코드 1
+"""
+
+import argparse
+import os
+import re
+import shutil
+import sqlite3
+import sys
+import tempfile
+
+import database
+import repository
+import view_counter
+from metrics import explain_query_plan
+
+SAMPLE_CURSOR = ("2025-01-01 00:00:00+00:00", 1)
+SAMPLE_KEY_CURSOR = ("あ", 1)
+
+# (이름, SQL, 파라미터, 정렬에 임시 B-tree 허용 여부)
+#   한자/카테고리 기본 정렬(단어순)은 걸러진 소수의 행만 정렬하므로 허용
+#   GET /words도 인덱스로 구한 ID 집합의 행만 정렬한다
+QUERIES = [
+    ("all_words", *repository._all_words_query(None, None), False),
+    ("all_words (page)", *repository._all_words_query(None, 100), False),
+    ("all_words (cursor)", *repository._all_words_query(SAMPLE_CURSOR, 100), False),
+    # sort= 정렬은 정렬 키 인덱스 순서로 읽는다 (migrations.py 7단계)
+    *(
+        (f"all_words (sort={sort}, cursor)", *repository._all_words_query(SAMPLE_KEY_CURSOR, 100, sort=sort), False)
+        for sort in ("word", "reading", "meaning")
+    ),
+    ("words_by_kanji", *repository._kanji_words_query("日", None, None), True),
+    ("words_by_kanji (cursor)", *repository._kanji_words_query("日", SAMPLE_CURSOR, 100), True),
+    (
+        "words_by_kanji (sort=position, cursor)",
+        *repository._kanji_words_query("日", (0, 1), 100, sort="position"),
+        False,
+    ),
+    (
+        "words_by_category (sort=meaning, cursor)",
+        *repository._category_words_query("방향", SAMPLE_KEY_CURSOR, 100, sort="meaning"),
+        True,
+    ),
+    ("words_by_category", *repository._category_words_query("방향", None, None), True),
+    ("words_by_category (cursor)", *repository._category_words_query("방향", SAMPLE_CURSOR, 100), True),
+    ("words_by_category (descendants)", *repository._category_words_query("경어", None, None, descendants=True), True),
+    (
+        "words_by_category (descendants, cursor)",
+        *repository._category_words_query("경어", SAMPLE_CURSOR, 100, descendants=True),
+        True,
+    ),
+    (
+        "filtered_words (and + kanji, cursor)",
+        *repository._filtered_words_query(
+            repository.WordFilter(("방향", "시간"), "and", ("예문",), "日"), SAMPLE_CURSOR, 100
+        ),
+        True,
+    ),
+    (
+        "filtered_words (or, page)",
+        *repository._filtered_words_query(repository.WordFilter(("방향", "시간"), "or"), None, 100),
+        True,
+    ),
+    ("count_filtered_words", *repository._filtered_count_query(repository.WordFilter(("방향", "시간"), "or")), True),
+    ("search_words (prefix)", *repository._search_query("학", 50, 0), True),
+    ("search_words (trigram)", *repository._search_query("바라보", 50, 0), True),
+    # 라우트가 실제로 쓰는 쿼리 - JSON 조각 응답은 columns=KEY_COLUMNS로 정렬된 id와 정렬 키만 읽는다 (커버링 인덱스)
+    *(
+        (f"all_words (json, sort={sort}{', cursor' if cursor else ''})", *query, False)
+        for sort in (None, "word", "reading", "meaning")
+        for cursor in (None, SAMPLE_CURSOR if sort is None else SAMPLE_KEY_CURSOR)
+        for query in [repository._all_words_query(cursor, 100, repository.KEY_COLUMNS, sort)]
+    ),
+    ("all_words (json, full)", *repository._all_words_query(None, None, repository.KEY_COLUMNS), False),
+    *(
+        (f"words_by_kanji (json, sort={sort}, cursor)", *query, sort != "position")
+        for sort, cursor in (
+            (None, SAMPLE_CURSOR),
+            ("word", SAMPLE_KEY_CURSOR),
+            ("reading", SAMPLE_KEY_CURSOR),
+            ("meaning", SAMPLE_KEY_CURSOR),
+            ("position", (0, 1)),
+        )
+        for query in [repository._kanji_words_query("日", cursor, 100, repository.KEY_COLUMNS, sort)]
+    ),
+    ("words_by_kanji (json)", *repository._kanji_words_query("日", None, None, repository.KEY_COLUMNS), True),
+    (
+        "words_by_category (json, cursor)",
+        *repository._category_words_query("방향", SAMPLE_CURSOR, 100, repository.KEY_COLUMNS),
+        True,
+    ),
+    (
+        "words_by_category (json, descendants, cursor)",
+        *repository._category_words_query("경어", SAMPLE_CURSOR, 100, repository.KEY_COLUMNS, True),
+        True,
+    ),
+    (
+        "words_by_category (json, sort=reading, cursor)",
+        *repository._category_words_query("방향", SAMPLE_KEY_CURSOR, 100, repository.KEY_COLUMNS, sort="reading"),
+        True,
+    ),
+    (
+        "filtered_words (json, and + kanji, cursor)",
+        *repository._filtered_words_query(
+            repository.WordFilter(("방향", "시간"), "and", ("예문",), "日"), SAMPLE_CURSOR, 100, repository.KEY_COLUMNS
+        ),
+        True,
+    ),
+    ("search_words (json, prefix)", *repository._search_query("학", 50, 0, repository.KEY_COLUMNS), True),
+    ("search_words (json, trigram)", *repository._search_query("바라보", 50, 0, repository.KEY_COLUMNS), True),
+    ("get_all_kanji", repository.ALL_KANJI_SQL, [], False),
+    ("get_all_categories", repository.ALL_CATEGORIES_SQL, [], False),
+    ("get_category_tree", repository.CATEGORY_TREE_SQL, [], False),
+    ("get_category_children (id)", repository.CATEGORY_ID_SQL, ["경어"], False),
+    ("get_category_children (path)", repository.CATEGORY_PATH_SQL, [1], False),
+    # 하위 트리 단어 수의 COUNT(DISTINCT)는 임시 B-tree를 쓴다 (결과 정렬은 인덱스 순서)
+    ("get_category_children", repository.CATEGORY_CHILDREN_SQL, [1], True),
+    # 랜덤 단어 / 인기 단어의 단어 조회
+    ("words_by_ids", *repository._words_by_ids_query([1, 2, 3]), True),
+    ("hot_words", view_counter.HOT_WORDS_SQL, [20], False),
+    ("hot_words (pending)", *view_counter.view_counts_query([1, 2, 3]), True),
+    ("get_kanji_stats (count)", *repository._kanji_stats_query("count", 100, 0), False),
+    ("get_kanji_stats (difficulty)", *repository._kanji_stats_query("difficulty", 100, 0), False),
+    ("get_changes", *repository._changes_query(100, 1000), False),
+    ("get_due_reviews", repository.DUE_REVIEWS_SQL, [2000000000, 20], False),
+]
+
+FULL_SCAN = re.compile(r"^\s*SCAN (\w+)\b(?! USING)")
+
+
+def check(conn: sqlite3.Connection) -> list:
+    """문제가 있는 쿼리 목록 [(이름, 사유, 실행 계획)]"""
+    failures = []
+    for name, sql, params, allow_temp_sort in QUERIES:
+        plan = explain_query_plan(conn, sql, params)
+        reasons = [f"전체 스캔: {line.strip()}" for line in plan if FULL_SCAN.match(line)]
+        if not allow_temp_sort:
+            reasons += [f"정렬: {line.strip()}" for line in plan if "USE TEMP B-TREE" in line]
+        # FTS5 가상 테이블은 MATCH 조건이면 'SCAN <fts> VIRTUAL TABLE INDEX ...'로 표시되며 전체 스캔이 아니다
+        reasons = [r for r in reasons if "VIRTUAL TABLE" not in r]
+        if reasons:
+            failures.append((name, reasons, plan))
+    return failures
+
+
+def main():
+    parser = argparse.ArgumentParser(description="조회 쿼리 실행 계획 검사")
+    parser.add_argument("--db", help="검사할 DB (복사본에 마이그레이션 적용, 생략하면 빈 DB)")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = os.path.join(tmp, "plans.db")
+        if args.db:
+            shutil.copy(args.db, db_path)
+        database.configure_database(db_path)
+        database.init_db()
+        conn = database.get_db_connection()
+        failures = check(conn)
+        conn.close()
+
+    for name, reasons, plan in failures:
+        print(f"❌ {name}")
+        for reason in reasons:
+            print(f"    {reason}")
+        print("    실행 계획:\n" + "\n".join("      " + line for line in plan))
+    if failures:
+        sys.exit(1)
+    print(f"✅ 쿼리 {len(QUERIES)}개 모두 인덱스 사용")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,83 @@
+"""
+WordRepository 메서드와 extract_kanji_from_word 마이크로벤치마크
+
+쓰기 메서드는 단어장을 바꾸므로 benchmarks.run이 만든 복사본 DB에서 실행한다.
+"""
+
+import itertools
+import random
+
+import database
+from benchmarks.corpus import CorpusGenerator
+from benchmarks.timing import measure
+from models import Word, WordUpdate
+from repository import WordRepository
+from utils import extract_kanji_from_word
+
+
+def _samples(seed: int = 0):
+    """조회에 쓸 한자/카테고리/단어 표본"""
+    rnd = random.Random(seed)
+    kanji = WordRepository.get_all_kanji()
+    categories = WordRepository.get_all_categories()
+    words = WordRepository.all_words(limit=500)
+    return rnd, kanji, categories, words
+
+
+def run(db_path: str, min_time: float = 0.2, seed: int = 0) -> dict:
+    """메서드별 시간 통계"""
+    database.configure_database(db_path)
+    rnd, kanji, categories, words = _samples(seed)
+    results = {}
+
+    def bench(name, fn, **kwargs):
+        results[name] = measure(fn, min_time=min_time, **kwargs)
+
+    # 읽기
+    bench("get_all_words", WordRepository.all_words)
+    bench("get_all_words_page", lambda: WordRepository.all_words(limit=100))
+    bench("stream_all_words", lambda: sum(1 for _ in WordRepository.all_words(mode="stream")))
+    bench("get_words_by_kanji", lambda: WordRepository.words_by_kanji(rnd.choice(kanji)))
+    bench("get_words_by_category", lambda: WordRepository.words_by_category(rnd.choice(categories)))
+    bench("search_words", lambda: WordRepository.search_words(rnd.choice(words)["meaning"][:2]))
+    bench("get_all_kanji", WordRepository.get_all_kanji)
+    bench("get_all_categories", WordRepository.get_all_categories)
+
+    # 쓰기 - 새 단어 추가 후 수정, 삭제
+    generator = CorpusGenerator(seed + 1)
+    counter = itertools.count()
+    added_ids = []
+
+    def new_word() -> Word:
+        word, hiragana, meaning, korean, *_ = generator.word(next(counter))
+        return Word(word=f"{word}{next(counter)}", hiragana=hiragana, meaning=meaning, korean=korean, category=["벤치"])
+
+    def add():
+        WordRepository.add_word(new_word())
+
+    bench("add_word", add, max_iterations=500)
+    added_ids.extend(w["id"] for w in WordRepository.words_by_category("벤치"))
+
+    def update():
+        word = rnd.choice(words)
+        WordRepository.update_word(word["id"], WordUpdate(**{**word, "wrong_count": rnd.randint(0, 5)}))
+
+    bench("update_word", update, max_iterations=500)
+
+    bench(
+        "add_words_bulk_100",
+        lambda: WordRepository.add_words_bulk([new_word() for _ in range(100)]),
+        max_iterations=50,
+    )
+
+    delete_ids = iter(added_ids)
+    bench("delete_word", lambda: WordRepository.delete_word(next(delete_ids)), max_iterations=len(added_ids))
+
+    # 한자 추출
+    texts = [w["word"] for w in words]
+    results["extract_kanji_from_word_x500"] = measure(
+        lambda: [extract_kanji_from_word(text) for text in texts], min_time=min_time
+    )
+
+    database.close_db_pools()
+    return results
@@ -0,0 +1,92 @@
+"""
+라우트별 end-to-end 시간 측정 (FastAPI TestClient, httpx 필요: pip install httpx)
+
+응답 캐시를 매번 비운 'cold' 시간과, 캐시/ETag가 적용된 'warm', '304' 시간을 함께 잰다.
+"""
+
+import itertools
+import random
+
+from fastapi.testclient import TestClient
+
+import database
+from benchmarks.timing import measure
+from cache import response_cache
+
+
+def run(db_path: str, min_time: float = 0.2, seed: int = 0) -> dict:
+    """라우트별 시간 통계"""
+    database.configure_database(db_path)
+    import main  # configure_database 이후에 앱을 불러와야 시작 이벤트가 대상 DB를 쓴다
+
+    rnd = random.Random(seed)
+    results = {}
+    with TestClient(main.app) as client:
+        kanji = client.get("/kanji").json()
+        categories = client.get("/categories").json()
+        words = client.get("/words_list", params={"limit": 500}).json()
+
+        def bench(name, method, url_fn, **kwargs):
+            def call():
+                response = client.request(method, url_fn(), **kwargs)
+                response.raise_for_status()
+
+            results[name] = measure(call, min_time=min_time, setup=response_cache.clear)
+
+        bench("GET /kanji", "GET", lambda: "/kanji")
+        bench("GET /categories", "GET", lambda: "/categories")
+        bench("GET /words_list", "GET", lambda: "/words_list")
+        bench("GET /words_list?limit=100", "GET", lambda: "/words_list?limit=100")
+        bench("GET /words_list?stream=true", "GET", lambda: "/words_list?stream=true")
+        bench("GET /kanji/{kanji}", "GET", lambda: f"/kanji/{rnd.choice(kanji)}")
+        bench("GET /category/{category}", "GET", lambda: f"/category/{rnd.choice(categories)}")
+        bench("GET /search", "GET", lambda: f"/search?q={rnd.choice(words)['meaning'][:2]}")
+
+        # 캐시 적중 / 304
+        client.get("/words_list")
+        results["GET /words_list (warm)"] = measure(lambda: client.get("/words_list"), min_time=min_time)
+        # TestClient(httpx)는 기본으로 gzip을 요청하므로 압축하지 않은 본문과 따로 잰다
+        results["GET /words_list (warm, identity)"] = measure(
+            lambda: client.get("/words_list", headers={"Accept-Encoding": "identity"}), min_time=min_time
+        )
+        etag = client.get("/words_list").headers["etag"]
+        results["GET /words_list (304)"] = measure(
+            lambda: client.get("/words_list", headers={"If-None-Match": etag}), min_time=min_time
+        )
+
+        # 쓰기
+        counter = itertools.count()
+
+        def post_word():
+            n = next(counter)
+            client.post("/kanji", json={"word": f"試{n}", "hiragana": f"し{n}", "meaning": "시험", "korean": "시"})
+
+        results["POST /kanji"] = measure(post_word, min_time=min_time, max_iterations=500)
+
+        def put_word():
+            word = rnd.choice(words)
+            client.put(f"/kanji/{word['id']}", json={**word, "wrong_count": rnd.randint(0, 5)})
+
+        results["PUT /kanji/{word_id}"] = measure(put_word, min_time=min_time, max_iterations=500)
+
+        bulk_counter = itertools.count()
+        bulk_ids = []
+
+        def post_bulk():
+            n = next(bulk_counter)
+            items = [
+                {"word": f"束{n}-{i}", "hiragana": f"たば{n}-{i}", "meaning": "묶음", "korean": "타바"}
+                for i in range(100)
+            ]
+            report = client.post("/kanji/bulk", json=items).json()
+            bulk_ids.extend(item["id"] for item in report["items"] if item["status"] == "inserted")
+
+        results["POST /kanji/bulk (100)"] = measure(post_bulk, min_time=min_time, max_iterations=50)
+
+        ids = iter(bulk_ids)
+        results["DELETE /kanji/{word_id}"] = measure(
+            lambda: client.delete(f"/kanji/{next(ids)}"), min_time=min_time, max_iterations=len(bulk_ids)
+        )
+
+    database.close_db_pools()
+    return results
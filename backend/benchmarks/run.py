@@ -0,0 +1,148 @@
+"""
+벤치마크 실행기 - 단어 수별 합성 단어장에서 각 스위트를 실행하고 결과를 JSON으로 저장
+
+    python -m benchmarks.run --sizes 1k,10k --out bench_results.json
+    python -m benchmarks.run --sizes 1k --compare bench_results.json   # 이전 결과와 비교
+
+합성 DB는 benchmarks/.corpus/에 한 번 만들어 두고, 스위트마다 복사본에서 실행한다.
+비교 시 p50이 --threshold 배 이상 느려진 항목이 있으면 종료 코드 1.
+"""
+
+import argparse
+import json
+import os
+import platform
+import shutil
+import sqlite3
+import subprocess
+import sys
+import tempfile
+from datetime import datetime, timezone
+
+from benchmarks import corpus
+
+SUITES = ("repository", "routes", "tokenizer", "serialization")
+CORPUS_DIR = os.path.join(os.path.dirname(__file__), ".corpus")
+
+
+def _corpus_path(size_name: str, seed: int) -> str:
+    """합성 DB 경로 (없으면 생성)"""
+    os.makedirs(CORPUS_DIR, exist_ok=True)
+    path = os.path.join(CORPUS_DIR, f"corpus_{size_name}_{seed}.db")
+    if not os.path.exists(path):
+        print(f"📊 합성 단어장 생성 중: {size_name}")
+        tmp_path = path + ".tmp"
+        for leftover in (tmp_path, tmp_path + "-wal", tmp_path + "-shm"):
+            if os.path.exists(leftover):
+                os.remove(leftover)
+        corpus.build_corpus_db(tmp_path, corpus.SIZES[size_name], seed)
+        os.replace(tmp_path, path)
+    return path
+
+
+def _git_commit() -> str:
+    try:
+        return subprocess.check_output(["git", "rev-parse", "HEAD"], text=True, stderr=subprocess.DEVNULL).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return ""
+
+
+def _run_suite(suite: str, db_path: str, min_time: float, seed: int) -> dict:
+    if suite == "repository":
+        from benchmarks import repository as module
+    elif suite == "tokenizer":
+        from benchmarks import tokenizer as module
+    elif suite == "serialization":
+        from benchmarks import serialization as module
+    else:
+        from benchmarks import routes as module
+    return module.run(db_path, min_time=min_time, seed=seed)
+
+
+def run(sizes, suites, min_time: float = 0.2, seed: int = 0) -> dict:
+    results = {}
+    for size_name in sizes:
+        source = _corpus_path(size_name, seed)
+        results[size_name] = {}
+        for suite in suites:
+            print(f"⏱  {size_name} / {suite}")
+            with tempfile.TemporaryDirectory() as tmp:
+                db_copy = os.path.join(tmp, "bench.db")
+                shutil.copy(source, db_copy)
+                results[size_name][suite] = _run_suite(suite, db_copy, min_time, seed)
+    return {
+        "meta": {
+            "commit": _git_commit(),
+            "created_at": datetime.now(timezone.utc).isoformat(),
+            "python": platform.python_version(),
+            "sqlite": sqlite3.sqlite_version,
+            "platform": platform.platform(),
+            "seed": seed,
+            "min_time": min_time,
+        },
+        "results": results,
+    }
+
+
+def compare(old: dict, new: dict, threshold: float) -> list:
+    """같은 항목끼리 p50 비율 비교, threshold 배 이상 느려진 항목 목록 반환"""
+    regressions = []
+    for size_name, suites in new["results"].items():
+        for suite, benches in suites.items():
+            old_benches = old.get("results", {}).get(size_name, {}).get(suite, {})
+            for name, stats in benches.items():
+                if name not in old_benches or not old_benches[name]["p50_ms"]:
+                    continue
+                ratio = stats["p50_ms"] / old_benches[name]["p50_ms"]
+                mark = "⚠️ " if ratio >= threshold else "  "
+                print(
+                    f"{mark}{size_name:>5} {suite:<10} {name:<36}"
+                    f" {old_benches[name]['p50_ms']:9.3f}ms -> {stats['p50_ms']:9.3f}ms (x{ratio:.2f})"
+                )
+                if ratio >= threshold:
+                    regressions.append((size_name, suite, name, ratio))
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="백엔드 벤치마크 실행")
+    parser.add_argument("--sizes", default="1k,10k", help=f"쉼표로 구분 ({', '.join(corpus.SIZES)})")
+    parser.add_argument("--suites", default=",".join(SUITES), help=f"쉼표로 구분 ({', '.join(SUITES)})")
+    parser.add_argument("--min-time", type=float, default=0.2, help="항목당 최소 측정 시간(초)")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--out", help="결과를 저장할 JSON 파일")
+    parser.add_argument("--compare", help="비교할 이전 결과 JSON 파일")
+    parser.add_argument("--threshold", type=float, default=1.2, help="회귀로 판단할 p50 비율")
+    args = parser.parse_args()
+
+    sizes = [s.strip().lower() for s in args.sizes.split(",") if s.strip()]
+    suites = [s.strip() for s in args.suites.split(",") if s.strip()]
+    for size_name in sizes:
+        if size_name not in corpus.SIZES:
+            parser.error(f"알 수 없는 크기: {size_name}")
+    for suite in suites:
+        if suite not in SUITES:
+            parser.error(f"알 수 없는 스위트: {suite}")
+
+    report = run(sizes, suites, args.min_time, args.seed)
+
+    if args.out:
+        with open(args.out, "w", encoding="utf-8") as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+        print(f"✅ 결과 저장: {args.out}")
+    else:
+        json.dump(report, sys.stdout, ensure_ascii=False, indent=2)
+        print()
+
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as f:
+            old = json.load(f)
+        regressions = compare(old, report, args.threshold)
+        if regressions:
+            print(f"❌ 회귀 {len(regressions)}건 (p50 x{args.threshold} 이상)")
+            sys.exit(1)
+        print("✅ 회귀 없음")
+
+
+if __name__ == "__main__":
+    main()
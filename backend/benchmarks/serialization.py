@@ -0,0 +1,64 @@
+"""
+단어 목록 직렬화 벤치마크 - FastAPI 기본 경로(jsonable_encoder)와 JSON 조각 경로 비교
+
+- jsonable_encoder: 행마다 dict를 만들고 FastAPI가 jsonable_encoder로 다시 훑은 뒤 json.dumps
+- dict_dumps: 행마다 dict를 만들고 바로 json.dumps (조각 캐시 도입 전 응답 캐시 경로)
+- fragments_cold: 조각 캐시를 비운 상태 - id 조회 + SQLite json_object
+- fragments_warm: 모든 조각이 캐시에 있는 상태 - id 조회 + 이어 붙이기
+
+    python -m benchmarks.serialization --db benchmarks/.corpus/corpus_10k_0.db
+"""
+
+import argparse
+import json
+
+from fastapi.encoders import jsonable_encoder
+
+import database
+from benchmarks.timing import measure
+from fragments import dump_word, word_fragments
+from repository import WordRepository
+
+
+def _dumps(content) -> bytes:
+    return json.dumps(content, ensure_ascii=False, allow_nan=False, separators=(",", ":")).encode("utf-8")
+
+
+def run(db_path: str, min_time: float = 0.2, seed: int = 0) -> dict:
+    """경로별 전체 목록 / 100개 페이지 / NDJSON 직렬화 시간"""
+    database.configure_database(db_path)
+    results = {}
+    for name, kwargs in {"all": {}, "page100": {"limit": 100}}.items():
+        results[f"{name}_jsonable_encoder"] = measure(
+            lambda: _dumps(jsonable_encoder(WordRepository.all_words(**kwargs))), min_time=min_time
+        )
+        results[f"{name}_dict_dumps"] = measure(
+            lambda: _dumps(WordRepository.all_words(**kwargs)), min_time=min_time
+        )
+        results[f"{name}_fragments_cold"] = measure(
+            lambda: WordRepository.all_words(**kwargs, mode="json"), min_time=min_time, setup=word_fragments.clear
+        )
+        WordRepository.all_words(**kwargs, mode="json")
+        results[f"{name}_fragments_warm"] = measure(
+            lambda: WordRepository.all_words(**kwargs, mode="json"), min_time=min_time
+        )
+
+    results["ndjson_per_row"] = measure(
+        lambda: sum(len(dump_word(word) + "\n") for word in WordRepository.all_words(mode="stream")), min_time=min_time
+    )
+    results["ndjson_batched_warm"] = measure(
+        lambda: sum(len(chunk) for chunk in WordRepository.all_words(mode="ndjson")), min_time=min_time
+    )
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="단어 목록 직렬화 벤치마크")
+    parser.add_argument("--db", default=database.DATABASE_URL, help="대상 DB 파일")
+    parser.add_argument("--min-time", type=float, default=0.5)
+    args = parser.parse_args()
+    print(json.dumps(run(args.db, args.min_time), ensure_ascii=False, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,37 @@
+"""벤치마크 공통 시간 측정 도구"""
+
+import statistics
+import time
+from typing import Callable, Optional
+
+
+def measure(
+    fn: Callable[[], object],
+    min_time: float = 0.2,
+    max_iterations: int = 10_000,
+    min_iterations: int = 3,
+    setup: Optional[Callable[[], object]] = None,
+) -> dict:
+    """fn을 min_time초 이상(최소 min_iterations회) 반복 실행한 시간 통계 (ms)
+
+    setup이 있으면 매 실행 전에 호출하며, 그 시간은 측정에서 뺀다.
+    """
+    samples = []
+    started = time.perf_counter()
+    while len(samples) < max_iterations and (
+        len(samples) < min_iterations or time.perf_counter() - started < min_time
+    ):
+        if setup is not None:
+            setup()
+        start = time.perf_counter()
+        fn()
+        samples.append(time.perf_counter() - start)
+
+    samples.sort()
+    return {
+        "iterations": len(samples),
+        "mean_ms": statistics.fmean(samples) * 1000,
+        "p50_ms": samples[len(samples) // 2] * 1000,
+        "p95_ms": samples[min(len(samples) - 1, int(len(samples) * 0.95))] * 1000,
+        "min_ms": samples[0] * 1000,
+    }
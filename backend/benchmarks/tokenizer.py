@@ -0,0 +1,58 @@
+"""
+한자 토크나이저 벤치마크 - 이전 방식(문자마다 U+4E00~U+9FFF 비교)과 tokenizer 비교
+
+합성 단어장의 단어/예문으로 측정하며 DB는 쓰지 않는다. (benchmarks.run의 tokenizer 스위트)
+이전 방식은 중복을 지우지 않아 같은 결과를 내려면 dict.fromkeys가 더 필요하다. (legacy_dedupe)
+
+    python -m benchmarks.tokenizer [--count 5000]
+"""
+
+import argparse
+import json
+
+import tokenizer
+from benchmarks.corpus import CorpusGenerator
+from benchmarks.timing import measure
+
+
+def _legacy_extract(word: str) -> list:
+    """tokenizer 도입 전 utils.extract_kanji_from_word (중복 제거 없음)"""
+    kanji_list = [char for char in word if "一" <= char <= "鿿"]
+    if not kanji_list:
+        kanji_list = ["＿"]
+    return kanji_list
+
+
+def _legacy_is_kanji(char: str) -> bool:
+    """tokenizer 도입 전 utils.is_kanji"""
+    return "一" <= char <= "鿿"
+
+
+def run(db_path: str = None, min_time: float = 0.2, seed: int = 0, count: int = 5000) -> dict:
+    """방식별 count개 단어 처리 시간 (db_path는 다른 스위트와 같은 형태로 받기만 한다)"""
+    generator = CorpusGenerator(seed)
+    words = [row[0] for row in generator.words(count)]
+    chars = "".join(words)
+    return {
+        f"legacy_per_char_x{count}": measure(lambda: [_legacy_extract(w) for w in words], min_time=min_time),
+        f"legacy_dedupe_x{count}": measure(
+            lambda: [list(dict.fromkeys(_legacy_extract(w))) for w in words], min_time=min_time
+        ),
+        f"extract_kanji_x{count}": measure(lambda: [tokenizer.extract_kanji(w) for w in words], min_time=min_time),
+        f"extract_kanji_bulk_x{count}": measure(lambda: tokenizer.extract_kanji_bulk(words), min_time=min_time),
+        f"legacy_is_kanji_x{len(chars)}": measure(lambda: list(map(_legacy_is_kanji, chars)), min_time=min_time),
+        f"is_kanji_x{len(chars)}": measure(lambda: list(map(tokenizer.is_kanji, chars)), min_time=min_time),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="한자 토크나이저 벤치마크")
+    parser.add_argument("--count", type=int, default=5000, help="단어 수")
+    parser.add_argument("--min-time", type=float, default=0.5)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+    print(json.dumps(run(None, args.min_time, args.seed, args.count), ensure_ascii=False, indent=2))
+
+
+if __name__ == "__main__":
+    main()
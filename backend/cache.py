@@ -0,0 +1,153 @@
+"""
+조회 응답 캐시
+
+- 쿼리와 파라미터로 만든 키마다 직렬화된 JSON 본문을 보관 (LRU, 개수/메모리 상한)
+- 항목은 만들 때의 데이터 버전(read_data_version)과 함께 저장하고, 버전이 바뀌면 무효로 본다
+- ETag는 데이터 버전이므로, 버전이 같으면 조회/직렬화 없이 304로 응답할 수 있다
+- 압축한 본문(gzip, br)은 처음 요청될 때 만들어 같은 항목에 함께 보관 (compression.py)
+
+데이터 버전은 DB에서 읽으므로 (migrations.py 10단계) 다른 프로세스(uvicorn 워커, migrate.py,
+tokenizer.py backfill 등)가 커밋한 변경도 다음 요청부터 반영되고, 워커가 달라도 같은 ETag가 나온다.
+캐시 키는 노트북(database.current_notebook)별로 구분되며, 노트북마다 DB 파일이 달라 버전도 따로 올라간다.
+"""
+
+import sqlite3
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Dict, Hashable, List, NamedTuple, Optional, Tuple
+
+from database import current_notebook
+
+# 캐시 상한
+MAX_CACHE_ENTRIES = 256
+MAX_CACHE_BYTES = 64 * 1024 * 1024
+
+# epoch, version과 변경 로그의 마지막 seq (sqlite_sequence는 tombstone을 정리해도 줄지 않는다)
+DATA_VERSION_SQL = """
+    SELECT epoch, version, COALESCE((SELECT seq FROM sqlite_sequence WHERE name = 'word_changes'), 0)
+    FROM data_version
+"""
+
+
+class DataVersion(NamedTuple):
+    """DB의 데이터 버전 - 단어 단위 변경은 seq, 그 밖의 변경은 version이 올라간다"""
+
+    epoch: str
+    version: int
+    seq: int
+
+    @property
+    def token(self) -> str:
+        return f"{self.epoch}-{self.version}-{self.seq}"
+
+
+def read_data_version(conn: sqlite3.Connection) -> DataVersion:
+    """conn에서 보이는 데이터 버전 (트랜잭션 안이면 그 트랜잭션의 스냅샷 기준)"""
+    epoch, version, seq = conn.execute(DATA_VERSION_SQL).fetchone()
+    return DataVersion(epoch, version, seq)
+
+
+def changed_word_ids(conn: sqlite3.Connection, since_seq: int) -> Optional[List[int]]:
+    """변경 로그에서 seq가 since_seq보다 큰 단어 id (바뀐 순서)
+
+    그 사이 tombstone이 정리되어 삭제를 놓쳤을 수 있으면 None - 호출한 쪽은 전체를 다시 읽는다.
+    """
+    horizon = conn.execute("SELECT value FROM sync_state WHERE name = 'tombstone_horizon'").fetchone()
+    if horizon is not None and horizon[0] > since_seq:
+        return None
+    return [row[0] for row in conn.execute("SELECT word_id FROM word_changes WHERE seq > ? ORDER BY seq", (since_seq,))]
+
+
+def etag_for(version: str) -> str:
+    """데이터 버전(토큰)에 해당하는 ETag"""
+    return f'"{version}"'
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """If-None-Match 헤더가 etag와 일치하는지 확인"""
+    if not if_none_match:
+        return False
+    candidates = [tag.strip() for tag in if_none_match.split(",")]
+    return "*" in candidates or etag in candidates or f"W/{etag}" in candidates
+
+
+@dataclass
+class CacheEntry:
+    version: str
+    body: bytes
+    headers: dict = field(default_factory=dict)
+    # 인코딩(gzip, br) -> 압축한 본문
+    encoded: Dict[str, bytes] = field(default_factory=dict)
+    # 응답에 들어간 단어 id (조회 수 집계용, view_counter.py)
+    word_ids: Tuple[int, ...] = ()
+    notebook: Optional[str] = field(default_factory=current_notebook)
+
+    @property
+    def etag(self) -> str:
+        return etag_for(self.version)
+
+    @property
+    def size(self) -> int:
+        return len(self.body) + sum(len(body) for body in self.encoded.values())
+
+
+class ResponseCache:
+    """데이터 버전으로 무효화되는 LRU 응답 캐시 - 키는 현재 노트북별로 구분된다 (상한은 모든 노트북 합계)"""
+
+    def __init__(self, max_entries: int = MAX_CACHE_ENTRIES, max_bytes: int = MAX_CACHE_BYTES):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._entries: "OrderedDict[Hashable, CacheEntry]" = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable, version: str) -> Optional[CacheEntry]:
+        """데이터 버전이 version인 항목 반환 (없거나 오래된 항목이면 None)"""
+        key = (current_notebook(), key)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            if entry.version != version:
+                self._remove(key)
+                return None
+            self._entries.move_to_end(key)
+            return entry
+
+    def put(self, key: Hashable, entry: CacheEntry) -> CacheEntry:
+        """항목 저장 후 상한을 넘으면 오래 안 쓴 항목부터 제거"""
+        if entry.size > self.max_bytes:
+            return entry
+        key = (entry.notebook, key)
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+            self._entries[key] = entry
+            self._bytes += entry.size
+            while len(self._entries) > self.max_entries or self._bytes > self.max_bytes:
+                self._remove(next(iter(self._entries)))
+        return entry
+
+    def add_encoding(self, key: Hashable, entry: CacheEntry, encoding: str, body: bytes):
+        """항목에 압축한 본문 추가 (캐시에 들어 있는 항목이면 메모리 상한에도 반영)"""
+        key = (entry.notebook, key)
+        with self._lock:
+            entry.encoded[encoding] = body
+            if self._entries.get(key) is not entry:
+                return
+            self._bytes += len(body)
+            while self._bytes > self.max_bytes:
+                self._remove(next(iter(self._entries)))
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def _remove(self, key: Hashable):
+        entry = self._entries.pop(key)
+        self._bytes -= entry.size
+
+
+response_cache = ResponseCache()
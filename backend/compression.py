@@ -0,0 +1,76 @@
+"""
+응답 압축 (gzip, brotli)
+
+- 캐시를 거치는 응답은 압축한 본문을 CacheEntry에 인코딩별로 함께 보관한다.
+  같은 데이터 버전의 반복 요청은 조회도 압축도 하지 않는다.
+- NDJSON 스트리밍은 compress_stream()으로 청크마다 압축해 바로 내보낸다. (GZipMiddleware는 끝까지 모아서 보냄)
+- 그 밖에 캐시를 거치지 않는 응답은 main.py의 GZipMiddleware가 gzip으로 압축한다.
+- brotli는 선택 의존성 (pip install brotli), 설치되어 있지 않으면 gzip만 사용
+- COMPRESS_MIN_SIZE(환경 변수 KANJI_COMPRESS_MIN_SIZE)바이트 미만의 본문은 압축하지 않는다
+"""
+
+import gzip
+import os
+import zlib
+from typing import Iterable, Iterator, Optional
+
+try:
+    import brotli
+except ImportError:  # 선택 의존성
+    brotli = None
+
+COMPRESS_MIN_SIZE = int(os.environ.get("KANJI_COMPRESS_MIN_SIZE", "1024"))
+
+# 캐시된 본문은 데이터 버전마다 한 번만 압축하므로 중간 이상의 압축률을 쓴다
+GZIP_LEVEL = 6
+BROTLI_QUALITY = 5
+
+# 같은 q 값이면 앞쪽을 고른다
+SUPPORTED_ENCODINGS = ("br", "gzip") if brotli is not None else ("gzip",)
+
+
+def negotiate(accept_encoding: Optional[str]) -> Optional[str]:
+    """Accept-Encoding 헤더에서 사용할 인코딩 (압축하지 않으면 None)"""
+    if not accept_encoding:
+        return None
+    weights = {}
+    for item in accept_encoding.split(","):
+        coding, _, params = item.strip().partition(";")
+        q = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                q = float(params[2:])
+            except ValueError:
+                q = 0.0
+        weights[coding.strip().lower()] = q
+
+    best, best_q = None, 0.0
+    for encoding in SUPPORTED_ENCODINGS:
+        q = weights.get(encoding, weights.get("*", 0.0))
+        if q > best_q:
+            best, best_q = encoding, q
+    return best
+
+
+def compress(body: bytes, encoding: str) -> bytes:
+    """negotiate()가 고른 인코딩으로 압축"""
+    if encoding == "br":
+        return brotli.compress(body, quality=BROTLI_QUALITY)
+    # mtime=0: 같은 본문이면 압축 결과도 같도록
+    return gzip.compress(body, compresslevel=GZIP_LEVEL, mtime=0)
+
+
+def compress_stream(chunks: Iterable[bytes], encoding: str) -> Iterator[bytes]:
+    """청크마다 압축해 flush - 클라이언트가 받은 청크까지는 바로 풀 수 있다 (스트리밍이 끝날 때까지 기다리지 않음)"""
+    if encoding == "br":
+        compressor = brotli.Compressor(quality=BROTLI_QUALITY)
+        for chunk in chunks:
+            yield compressor.process(chunk) + compressor.flush()
+        yield compressor.finish()
+        return
+    # wbits 31: gzip 헤더 / 트레일러
+    compressor = zlib.compressobj(GZIP_LEVEL, zlib.DEFLATED, 31)
+    for chunk in chunks:
+        yield compressor.compress(chunk) + compressor.flush(zlib.Z_SYNC_FLUSH)
+    yield compressor.flush()
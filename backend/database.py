@@ -1,71 +1,358 @@
+import re
 import sqlite3
+import threading
+from collections import OrderedDict
+from contextlib import contextmanager
+from contextvars import ContextVar
 from datetime import datetime, timezone
-from typing import List, Optional
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
 import os
+from metrics import InstrumentedConnection
+from migrations import apply_migrations
 
 DATABASE_URL = "kanji_vocab.db"
 
+# 노트북 - 사용자(학습자)마다 따로 두는 DB 파일. 요청의 X-Notebook 헤더로 고른다 (main.py)
+# 헤더가 없으면 기본 DB(DATABASE_URL)를 쓴다
+NOTEBOOK_DIR = os.environ.get("KANJI_NOTEBOOK_DIR", "notebooks")
+# 연결 풀을 열어 두는 노트북 수 (넘으면 가장 오래 안 쓴 노트북의 연결부터 닫는다, 기본 DB는 항상 열어 둠)
+MAX_OPEN_NOTEBOOKS = int(os.environ.get("KANJI_MAX_OPEN_NOTEBOOKS", "32"))
+# 파일 이름으로 쓰므로 경로 구분자 / 점이 들어가지 않는 이름만 허용
+NOTEBOOK_NAME = re.compile(r"[A-Za-z0-9_-]{1,64}")
 
-def get_db_connection():
-    """SQLite 연결 획득"""
-    conn = sqlite3.connect(DATABASE_URL)
+# 연결을 열 때마다 적용하는 PRAGMA (configure_database로 변경 가능)
+DB_PRAGMAS = {
+    "journal_mode": "WAL",  # 읽기와 쓰기가 서로 막지 않도록
+    "synchronous": "NORMAL",  # WAL에서는 NORMAL로도 커밋 내구성 충분
+    "busy_timeout": 5000,  # ms, 쓰기 잠금 대기 시간
+    "foreign_keys": "ON",  # ON DELETE CASCADE 동작에 필요
+    "cache_size": -16000,  # 음수면 KiB 단위 (약 16MB)
+    "mmap_size": 256 * 1024 * 1024,
+    "temp_store": "MEMORY",
+}
+
+# 데이터베이스 파일 단위로 적용되어 읽기 전용 연결에서는 건너뛰는 PRAGMA
+WRITE_ONLY_PRAGMAS = {"journal_mode"}
+
+
+def _apply_pragmas(conn: sqlite3.Connection, readonly: bool = False):
+    """연결에 DB_PRAGMAS 적용"""
+    for name, value in DB_PRAGMAS.items():
+        if readonly and name in WRITE_ONLY_PRAGMAS:
+            continue
+        conn.execute(f"PRAGMA {name} = {value}")
+    if readonly:
+        conn.execute("PRAGMA query_only = ON")
+
+
+_notebook: ContextVar[Optional[str]] = ContextVar("notebook", default=None)
+
+
+def current_notebook() -> Optional[str]:
+    """현재 요청(컨텍스트)의 노트북 이름 (None이면 기본 DB)"""
+    return _notebook.get()
+
+
+@contextmanager
+def use_notebook(name: Optional[str]) -> Iterator[None]:
+    """블록 안의 DB 접근을 노트북 name의 파일로 (None이면 기본 DB)
+
+    contextvar이므로 db_executor의 DB 스레드와 스트리밍 응답에도 그대로 전달된다.
+    """
+    if name is not None and not NOTEBOOK_NAME.fullmatch(name):
+        raise ValueError(f"노트북 이름은 영문/숫자/_/- 1~64자여야 합니다: {name!r}")
+    token = _notebook.set(name)
+    try:
+        yield
+    finally:
+        _notebook.reset(token)
+
+
+def notebook_path(name: Optional[str]) -> str:
+    """노트북의 DB 파일 경로 (None이면 기본 DB)"""
+    if name is None:
+        return DATABASE_URL
+    return os.path.join(NOTEBOOK_DIR, f"{name}.db")
+
+
+def list_notebooks() -> List[str]:
+    """NOTEBOOK_DIR에 있는 노트북 이름 (이름순)"""
+    if not os.path.isdir(NOTEBOOK_DIR):
+        return []
+    names = (entry[:-3] for entry in os.listdir(NOTEBOOK_DIR) if entry.endswith(".db"))
+    return sorted(name for name in names if NOTEBOOK_NAME.fullmatch(name))
+
+
+def _open_connection(
+    readonly: bool = False, check_same_thread: bool = True, path: Optional[str] = None
+) -> sqlite3.Connection:
+    """PRAGMA가 적용된 새 SQLite 연결 생성 (path를 생략하면 현재 노트북의 DB 파일)"""
+    if path is None:
+        path = notebook_path(current_notebook())
+    if readonly:
+        uri = Path(path).resolve().as_uri() + "?mode=ro"
+        conn = sqlite3.connect(
+            uri, uri=True, check_same_thread=check_same_thread, factory=InstrumentedConnection
+        )
+    else:
+        conn = sqlite3.connect(path, check_same_thread=check_same_thread, factory=InstrumentedConnection)
     conn.row_factory = sqlite3.Row
+    _apply_pragmas(conn, readonly)
     return conn
 
 
-def init_db():
-    """데이터베이스 초기화 - 테이블 생성"""
-    conn = get_db_connection()
-    cursor = conn.cursor()
-
-    # Words 테이블
-    cursor.execute("""
-        CREATE TABLE IF NOT EXISTS words (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            word TEXT NOT NULL,
-            hiragana TEXT NOT NULL,
-            meaning TEXT NOT NULL,
-            korean TEXT NOT NULL,
-            wrong_count INTEGER DEFAULT 0,
-            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-            updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-            UNIQUE(word, hiragana)
-        )
-    """)
+def get_db_connection(check_same_thread: bool = True):
+    """SQLite 연결 획득 (풀을 거치지 않는 새 연결, 사용 후 직접 close)
 
-    # Categories 테이블 (N:M 관계)
-    cursor.execute("""
-        CREATE TABLE IF NOT EXISTS categories (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            name TEXT UNIQUE NOT NULL
-        )
-    """)
-
-    # Word-Category 매핑 테이블
-    cursor.execute("""
-        CREATE TABLE IF NOT EXISTS word_categories (
-            word_id INTEGER NOT NULL,
-            category_id INTEGER NOT NULL,
-            PRIMARY KEY (word_id, category_id),
-            FOREIGN KEY (word_id) REFERENCES words(id) ON DELETE CASCADE,
-            FOREIGN KEY (category_id) REFERENCES categories(id) ON DELETE CASCADE
-        )
-    """)
-
-    # Kanji 인덱스 테이블 (검색 최적화)
-    cursor.execute("""
-        CREATE TABLE IF NOT EXISTS word_kanji (
-            word_id INTEGER NOT NULL,
-            kanji TEXT NOT NULL,
-            PRIMARY KEY (word_id, kanji),
-            FOREIGN KEY (word_id) REFERENCES words(id) ON DELETE CASCADE
-        )
-    """)
+    스트리밍 응답처럼 한 연결을 여러 스레드가 순서대로 이어서 쓰는 경우 check_same_thread=False
+    현재 노트북이 처음 쓰이는 것이면 먼저 파일을 만들고 마이그레이션한다.
+    """
+    notebook = current_notebook()
+    if notebook is None:
+        return _open_connection(check_same_thread=check_same_thread)
+    shard = _shards.acquire(notebook)
+    try:
+        return _open_connection(check_same_thread=check_same_thread, path=shard.path)
+    finally:
+        _shards.release(shard)
+
+
+class ConnectionPool:
+    """스레드마다 연결을 하나씩 만들어 재사용하는 SQLite 연결 풀 (DB 파일 하나)"""
+
+    def __init__(self, path: str, readonly: bool = False):
+        self.path = path
+        self.readonly = readonly
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._connections: List[sqlite3.Connection] = []
+
+    def acquire(self) -> sqlite3.Connection:
+        """현재 스레드의 연결 반환 (없으면 생성)"""
+        local = self._local
+        conn = getattr(local, "conn", None)
+        if conn is None:
+            # close_all은 다른 스레드에서 호출되므로 check_same_thread 해제
+            conn = _open_connection(self.readonly, check_same_thread=False, path=self.path)
+            local.conn = conn
+            local.depth = 0
+            with self._lock:
+                self._connections.append(conn)
+        local.depth += 1
+        return conn
+
+    def release(self, conn: sqlite3.Connection):
+        """연결 반납 - 가장 바깥 사용이 끝날 때 커밋되지 않은 트랜잭션을 롤백"""
+        local = self._local
+        if getattr(local, "conn", None) is not conn:
+            return
+        local.depth -= 1
+        if local.depth == 0 and conn.in_transaction:
+            conn.rollback()
+
+    def close_all(self):
+        """풀이 만든 모든 연결 종료"""
+        with self._lock:
+            connections, self._connections = self._connections, []
+            self._local = threading.local()
+        for conn in connections:
+            conn.close()
+
+
+class Shard:
+    """DB 파일(기본 DB 또는 노트북) 하나의 쓰기 / 읽기 연결 풀"""
+
+    def __init__(self, notebook: Optional[str]):
+        self.notebook = notebook
+        self.path = notebook_path(notebook)
+        self.write_pool = ConnectionPool(self.path)
+        self.read_pool = ConnectionPool(self.path, readonly=True)
+        # 풀의 연결을 빌려 쓰고 있는 수 / LRU에서 빠졌는지 (ShardRegistry 잠금 안에서 변경)
+        self.users = 0
+        self.evicted = False
+        # 기본 DB는 시작할 때 init_db로 마이그레이션한다
+        self._migrated = notebook is None
+        self._migrate_lock = threading.Lock()
 
-    conn.commit()
-    conn.close()
+    def ensure_migrated(self):
+        """처음 열 때 한 번 - 파일이 없으면 만들고 적용되지 않은 마이그레이션 실행"""
+        if self._migrated:
+            return
+        with self._migrate_lock:
+            if self._migrated:
+                return
+            os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+            conn = _open_connection(path=self.path)
+            try:
+                apply_migrations(conn)
+            finally:
+                conn.close()
+            self._migrated = True
+
+    def close(self):
+        self.write_pool.close_all()
+        self.read_pool.close_all()
+
+
+class ShardRegistry:
+    """DB 파일별 연결 풀 - 노트북은 최근에 쓴 max_open개까지만 열어 둔다 (LRU)
+
+    풀은 스레드마다 연결을 하나씩 두므로 열린 연결 수는 노트북 수 x (DB 스레드 수 + 1)를 넘지 않는다.
+    LRU에서 빠진 노트북의 연결은 바로 닫고, 그때 쓰고 있던 요청이 있으면 마지막으로 반납할 때 닫는다.
+    """
+
+    def __init__(self, max_open: int = MAX_OPEN_NOTEBOOKS):
+        self.max_open = max_open
+        self._shards: "OrderedDict[Optional[str], Shard]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._evict_listeners: List[Callable[[str], None]] = []
+
+    def __len__(self) -> int:
+        """열려 있는 노트북 수 (기본 DB 제외)"""
+        return len(self._shards) - (None in self._shards)
+
+    def on_evict(self, listener: Callable[[str], None]):
+        """노트북이 LRU에서 빠질 때 부를 함수 등록 (노트북별 메모리 상태 정리)"""
+        self._evict_listeners.append(listener)
+
+    def acquire(self, notebook: Optional[str]) -> Shard:
+        """노트북의 샤드를 빌림 (처음 열면 마이그레이션) - 다 쓰면 release"""
+        evicted = []
+        with self._lock:
+            shard = self._shards.get(notebook)
+            if shard is None:
+                shard = self._shards[notebook] = Shard(notebook)
+                evicted = self._evict()
+            else:
+                self._shards.move_to_end(notebook)
+            shard.users += 1
+        self._closed(evicted)
+        try:
+            shard.ensure_migrated()
+        except Exception:
+            self.release(shard)
+            raise
+        return shard
+
+    def release(self, shard: Shard):
+        with self._lock:
+            shard.users -= 1
+            close = shard.evicted and shard.users == 0
+        if close:
+            shard.close()
+
+    def close_all(self):
+        """모든 샤드의 연결 종료"""
+        with self._lock:
+            shards, self._shards = list(self._shards.values()), OrderedDict()
+            for shard in shards:
+                shard.evicted = True
+        for shard in shards:
+            shard.close()
+
+    def _evict(self) -> List[Shard]:
+        """상한을 넘은 만큼 가장 오래 안 쓴 노트북을 LRU에서 뺀다 (잠금 안에서 호출)"""
+        evicted = []
+        while len(self) > self.max_open:
+            notebook = next(name for name in self._shards if name is not None)
+            shard = self._shards.pop(notebook)
+            shard.evicted = True
+            evicted.append(shard)
+        return evicted
+
+    def _closed(self, evicted: List[Shard]):
+        for shard in evicted:
+            # 쓰고 있으면 마지막 release에서 닫는다
+            with self._lock:
+                idle = shard.users == 0
+            if idle:
+                shard.close()
+            for listener in self._evict_listeners:
+                listener(shard.notebook)
+
+
+_shards = ShardRegistry()
+
+
+class NotebookLocal:
+    """노트북마다 따로 두는 프로세스 안 상태 - 속성 접근을 현재 노트북의 인스턴스로 넘긴다
+
+    예: random_index = NotebookLocal(RandomIndex) -> random_index.sample_words(...)는 현재 노트북의 인덱스
+    discard_on_evict면 노트북이 LRU에서 빠질 때 인스턴스를 버리고 다음에 쓸 때 새로 만든다.
+    """
+
+    def __init__(self, factory: Callable[[], Any], discard_on_evict: bool = False):
+        self._factory = factory
+        self._instances: Dict[Optional[str], Any] = {}
+        self._lock = threading.Lock()
+        if discard_on_evict:
+            _shards.on_evict(self.discard)
+
+    def get(self, notebook: Optional[str] = None) -> Any:
+        """노트북의 인스턴스 (없으면 생성)"""
+        instance = self._instances.get(notebook)
+        if instance is None:
+            with self._lock:
+                instance = self._instances.get(notebook)
+                if instance is None:
+                    instance = self._instances[notebook] = self._factory()
+        return instance
+
+    def items(self) -> List[Tuple[Optional[str], Any]]:
+        """만들어진 [(노트북, 인스턴스)]"""
+        with self._lock:
+            return list(self._instances.items())
+
+    def discard(self, notebook: Optional[str]):
+        with self._lock:
+            self._instances.pop(notebook, None)
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self.get(current_notebook()), name)
+
+
+@contextmanager
+def db_connection(readonly: bool = False) -> Iterator[sqlite3.Connection]:
+    """풀에서 현재 스레드의 연결을 빌려 사용 (GET 경로는 readonly=True, 현재 노트북의 DB 파일)"""
+    shard = _shards.acquire(current_notebook())
+    pool = shard.read_pool if readonly else shard.write_pool
+    conn = pool.acquire()
+    try:
+        yield conn
+    finally:
+        pool.release(conn)
+        _shards.release(shard)
+
+
+def close_db_pools():
+    """모든 풀의 연결 종료 (애플리케이션 종료 시)"""
+    _shards.close_all()
+
+
+def configure_database(
+    path: Optional[str] = None, pragmas: Optional[dict] = None, notebook_dir: Optional[str] = None
+):
+    """데이터베이스 파일 경로 / PRAGMA / 노트북 디렉터리 변경 - 기존 풀 연결은 모두 닫힌다"""
+    global DATABASE_URL, NOTEBOOK_DIR
+    close_db_pools()
+    if path is not None:
+        DATABASE_URL = path
+    if notebook_dir is not None:
+        NOTEBOOK_DIR = notebook_dir
+    if pragmas is not None:
+        DB_PRAGMAS.update(pragmas)
+
+
+def init_db():
+    """데이터베이스 초기화 - 아직 적용되지 않은 스키마 마이그레이션 실행"""
+    conn = get_db_connection()
+    try:
+        apply_migrations(conn)
+    finally:
+        conn.close()
 
 
 def db_exists() -> bool:
-    """데이터베이스 파일이 존재하는지 확인"""
+    """기본 데이터베이스 파일이 존재하는지 확인"""
     return os.path.exists(DATABASE_URL)
@@ -0,0 +1,72 @@
+"""
+DB 호출 전용 실행기
+
+sqlite3 호출은 블로킹이므로 이벤트 루프 밖의 전용 스레드에서 실행한다.
+- 읽기: READ_WORKERS개의 스레드풀 (스레드마다 읽기 전용 풀 연결을 재사용)
+- 쓰기: 스레드 하나짜리 큐 WRITE_WORKERS개 - 노트북(DB 파일)마다 항상 같은 큐를 쓰므로 한 파일에 대한 쓰기는
+  한 줄로 처리되어 프로세스 안에서 'database is locked'가 생기지 않고, 다른 노트북의 쓰기는 따로 진행된다
+"""
+
+import asyncio
+import contextvars
+import functools
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, List, Optional
+
+from database import current_notebook
+
+READ_WORKERS = 8
+WRITE_WORKERS = 4
+
+
+class DatabaseExecutor:
+    """읽기 스레드풀과 노트북별 단일 쓰기 스레드를 관리"""
+
+    def __init__(self, read_workers: int = READ_WORKERS, write_workers: int = WRITE_WORKERS):
+        self.read_workers = read_workers
+        self.write_workers = write_workers
+        self._reads: Optional[ThreadPoolExecutor] = None
+        self._writes: List[ThreadPoolExecutor] = []
+        self._lock = threading.Lock()
+
+    def _executors(self):
+        """필요할 때 실행기 생성 (shutdown 후 다시 쓰면 새로 만든다)"""
+        with self._lock:
+            if self._reads is None:
+                self._reads = ThreadPoolExecutor(self.read_workers, thread_name_prefix="db-read")
+                self._writes = [
+                    ThreadPoolExecutor(1, thread_name_prefix=f"db-write-{index}") for index in range(self.write_workers)
+                ]
+            return self._reads, self._writes
+
+    @staticmethod
+    async def _run(executor: ThreadPoolExecutor, fn: Callable, *args, **kwargs) -> Any:
+        # 요청 단위 contextvar(계측 등)가 DB 스레드에서도 보이도록 현재 컨텍스트에서 실행
+        ctx = contextvars.copy_context()
+        call = functools.partial(ctx.run, fn, *args, **kwargs)
+        return await asyncio.get_running_loop().run_in_executor(executor, call)
+
+    async def read(self, fn: Callable, *args, **kwargs) -> Any:
+        """읽기 스레드풀에서 실행"""
+        reads, _ = self._executors()
+        return await self._run(reads, fn, *args, **kwargs)
+
+    async def write(self, fn: Callable, *args, **kwargs) -> Any:
+        """현재 노트북의 쓰기 큐(단일 스레드)에서 순서대로 실행"""
+        _, writes = self._executors()
+        queue = writes[hash(current_notebook()) % len(writes)]
+        return await self._run(queue, fn, *args, **kwargs)
+
+    def shutdown(self):
+        """대기 중인 작업을 마치고 스레드 종료"""
+        with self._lock:
+            reads, writes = self._reads, self._writes
+            self._reads, self._writes = None, []
+        if reads is not None:
+            for queue in writes:
+                queue.shutdown(wait=True)
+            reads.shutdown(wait=True)
+
+
+db_executor = DatabaseExecutor()
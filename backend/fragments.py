@@ -0,0 +1,151 @@
+"""
+단어별 JSON 조각 캐시
+
+목록 응답을 행마다 dict로 만든 뒤 다시 직렬화하지 않고, 단어 하나의 JSON 객체 문자열(조각)을
+SQLite의 json_object로 바로 만들어 보관한다. 목록 조회는 정렬된 id만 읽은 뒤 조각을 이어 붙인다.
+- 날짜는 DB에 저장된 문자열 그대로 한 번에 들어간다 (Python datetime 변환 없음)
+- 조회할 때마다 DB의 데이터 버전(cache.read_data_version)의 seq와 맞춘다. 마지막으로 맞춘 seq 이후
+  변경 로그(word_changes)에 기록된 단어의 조각만 지우므로 다른 프로세스(uvicorn 워커, migrate.py,
+  tokenizer.py backfill 등)가 커밋한 변경도 다음 조회부터 반영된다.
+  (조각의 내용 - 단어 컬럼과 카테고리 이름 - 은 모두 word_changes에 기록되는 변경이라 version은 보지 않는다)
+
+단어 id는 노트북마다 따로 매겨지므로 조각은 (노트북, 단어 id)로 보관한다. (상한은 모든 노트북 합계)
+"""
+
+import json
+import re
+import sqlite3
+import threading
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from cache import changed_word_ids, read_data_version
+from database import current_notebook
+
+# 조각 상한 (넘으면 오래된 것부터 제거)
+MAX_FRAGMENT_BYTES = 64 * 1024 * 1024
+
+# 단어 하나를 응답과 같은 키 순서의 JSON 객체로 (repository.WORD_COLUMNS와 같은 내용)
+WORD_JSON = """
+    json_object(
+        'id', w.id, 'word', w.word, 'hiragana', w.hiragana, 'meaning', w.meaning, 'korean', w.korean,
+        'wrong_count', w.wrong_count, 'created_at', w.created_at, 'updated_at', w.updated_at,
+        'category', json((
+            SELECT json_group_array(c.name)
+            FROM word_categories wc2
+            JOIN categories c ON c.id = wc2.category_id
+            WHERE wc2.word_id = w.id
+        ))
+    )
+"""
+
+# SQLite 변수 개수 제한(기본 999 이상)을 넘지 않도록 나눠서 조회
+_CHUNK_SIZE = 500
+
+# 조각의 시작 - 문자열 안의 따옴표는 \"로 이스케이프되므로 단어 객체의 시작에서만 일치한다
+_WORD_ID = re.compile(rb'\{"id":(\d+),')
+
+
+def dump_word(word: dict) -> str:
+    """dict로 된 단어를 조각과 같은 형식으로 (스냅샷 모드 등 SQLite를 거치지 않는 경우)"""
+    return json.dumps(word, ensure_ascii=False, allow_nan=False, separators=(",", ":"))
+
+
+def word_ids_in(body: bytes) -> Tuple[int, ...]:
+    """조각(또는 dump_word)을 이어 붙인 목록 본문에 들어 있는 단어 id (순서대로)"""
+    return tuple(int(word_id) for word_id in _WORD_ID.findall(body))
+
+
+class FragmentCache:
+    """(노트북, 단어 id) -> JSON 조각"""
+
+    def __init__(self, max_bytes: int = MAX_FRAGMENT_BYTES):
+        self.max_bytes = max_bytes
+        self._fragments: Dict[Tuple[Optional[str], int], str] = {}
+        self._bytes = 0
+        self._lock = threading.Lock()
+        # 노트북 -> 조각이 맞춰져 있는 (epoch, seq)
+        self._synced: Dict[Optional[str], Tuple[str, int]] = {}
+
+    def __len__(self) -> int:
+        return len(self._fragments)
+
+    def fragments(self, conn: sqlite3.Connection, word_ids: List[int]) -> List[str]:
+        """word_ids 순서대로 조각 (없는 것은 conn에서 만들어 저장)
+
+        conn은 현재 노트북의 DB 연결이고, word_ids를 읽은 읽기 트랜잭션 안이어야 한다.
+        """
+        notebook = current_notebook()
+        version = read_data_version(conn)
+        synced = (version.epoch, version.seq)
+        if not self._sync(conn, notebook, synced):
+            # 다른 조회가 이미 더 새로운 데이터에 맞춘 뒤 - 이 트랜잭션의 데이터로만 만들고 저장하지 않는다
+            built = self._build(conn, word_ids)
+            return [built[word_id] for word_id in word_ids]
+        get = self._fragments.get
+        found = {}
+        missing = []
+        for word_id in word_ids:
+            fragment = get((notebook, word_id))
+            if fragment is None:
+                missing.append(word_id)
+            else:
+                found[word_id] = fragment
+        built = self._build(conn, missing)
+        if built:
+            self._store(notebook, built, synced)
+            found.update(built)
+        return [found[word_id] for word_id in word_ids]
+
+    @staticmethod
+    def _build(conn: sqlite3.Connection, word_ids: List[int]) -> Dict[int, str]:
+        built = {}
+        for start in range(0, len(word_ids), _CHUNK_SIZE):
+            chunk = word_ids[start:start + _CHUNK_SIZE]
+            placeholders = ",".join("?" * len(chunk))
+            sql = f"SELECT w.id, {WORD_JSON} FROM words w WHERE w.id IN ({placeholders})"
+            built.update((row[0], row[1]) for row in conn.execute(sql, chunk))
+        return built
+
+    def _sync(self, conn: sqlite3.Connection, notebook: Optional[str], synced: Tuple[str, int]) -> bool:
+        """노트북의 조각을 conn이 보는 데이터에 맞춤 (conn이 이미 맞춘 것보다 오래된 데이터를 보면 False)"""
+        with self._lock:
+            known = self._synced.get(notebook)
+            if known == synced:
+                return True
+            changed = None
+            if known is not None and known[0] == synced[0]:
+                if known[1] > synced[1]:
+                    return False
+                changed = changed_word_ids(conn, known[1])
+            if changed is None:
+                # 처음이거나 DB 파일이 바뀌었거나 삭제 기록이 정리된 뒤 - 노트북의 조각을 모두 버린다
+                changed = [word_id for key_notebook, word_id in self._fragments if key_notebook == notebook]
+            for word_id in changed:
+                old = self._fragments.pop((notebook, word_id), None)
+                if old is not None:
+                    self._bytes -= len(old)
+            self._synced[notebook] = synced
+            return True
+
+    def _store(self, notebook: Optional[str], built: Dict[int, str], synced: Tuple[str, int]):
+        with self._lock:
+            # 조회하는 사이 다른 조회가 더 새로운 데이터에 맞췄으면 저장하지 않는다
+            if self._synced.get(notebook) != synced:
+                return
+            for word_id, fragment in built.items():
+                old = self._fragments.pop((notebook, word_id), None)
+                if old is not None:
+                    self._bytes -= len(old)
+                self._fragments[notebook, word_id] = fragment
+                self._bytes += len(fragment)
+            while self._bytes > self.max_bytes and self._fragments:
+                self._bytes -= len(self._fragments.pop(next(iter(self._fragments))))
+
+    def clear(self):
+        with self._lock:
+            self._fragments.clear()
+            self._synced.clear()
+            self._bytes = 0
+
+
+word_fragments = FragmentCache()
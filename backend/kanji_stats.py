@@ -0,0 +1,104 @@
+"""
+한자별 통계(kanji_stats) 재생성 / 정합성 검사
+
+kanji_stats는 word_kanji, words의 트리거가 증분으로 갱신한다. (migrations.py 4단계)
+트리거를 거치지 않고 DB를 고쳤거나 의심스러울 때 이 스크립트로 확인하고 다시 만든다.
+
+    python kanji_stats.py check      # 불일치가 있으면 목록을 출력하고 종료 코드 1
+    python kanji_stats.py rebuild    # word_kanji + words로 전체 재집계
+"""
+
+import argparse
+import sqlite3
+import sys
+from typing import List
+
+import database
+from migrations import BUMP_DATA_VERSION_SQL
+
+# word_kanji + words에서 직접 집계한 한자별 통계 (kanji_stats와 같은 컬럼 순서)
+AGGREGATE_SQL = """
+    SELECT wk.kanji, COUNT(*) AS word_count, CAST(TOTAL(w.wrong_count) AS INTEGER) AS total_wrong,
+           MAX(w.updated_at) AS last_updated
+    FROM word_kanji wk JOIN words w ON w.id = wk.word_id
+    GROUP BY wk.kanji
+"""
+
+STATS_COLUMNS = ("word_count", "total_wrong", "last_updated")
+
+
+def rebuild_kanji_stats(conn: sqlite3.Connection) -> int:
+    """kanji_stats 전체를 다시 집계 (하나의 트랜잭션), 한자 수 반환"""
+    cursor = conn.cursor()
+    try:
+        cursor.execute("BEGIN IMMEDIATE")
+        cursor.execute("DELETE FROM kanji_stats")
+        cursor.execute(
+            f"INSERT INTO kanji_stats (kanji, word_count, total_wrong, last_updated) {AGGREGATE_SQL}"
+        )
+        count = cursor.rowcount
+        # kanji_stats만 바뀌고 변경 로그에는 남지 않으므로 응답 캐시가 알 수 있게
+        cursor.execute(BUMP_DATA_VERSION_SQL)
+        conn.commit()
+    except Exception:
+        conn.rollback()
+        raise
+    return count
+
+
+def check_kanji_stats(conn: sqlite3.Connection) -> List[dict]:
+    """kanji_stats와 실제 집계를 비교해 다른 한자 목록 반환 (없으면 빈 목록)
+
+    각 항목: {"kanji", "column", "stored", "expected"} - 한쪽에만 있는 한자는 column이 "missing" / "extra"
+    """
+    expected = {row[0]: tuple(row[1:]) for row in conn.execute(AGGREGATE_SQL)}
+    stored = {
+        row[0]: tuple(row[1:])
+        for row in conn.execute("SELECT kanji, word_count, total_wrong, last_updated FROM kanji_stats")
+    }
+
+    problems = []
+    for kanji in sorted(expected.keys() | stored.keys()):
+        if kanji not in stored:
+            problems.append({"kanji": kanji, "column": "missing", "stored": None, "expected": expected[kanji]})
+        elif kanji not in expected:
+            problems.append({"kanji": kanji, "column": "extra", "stored": stored[kanji], "expected": None})
+        else:
+            for column, have, want in zip(STATS_COLUMNS, stored[kanji], expected[kanji]):
+                if have != want:
+                    problems.append({"kanji": kanji, "column": column, "stored": have, "expected": want})
+    return problems
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="한자별 통계(kanji_stats) 관리")
+    parser.add_argument("command", choices=["check", "rebuild"])
+    parser.add_argument("--db", help="DB 파일 (기본: database.DATABASE_URL)")
+    args = parser.parse_args()
+
+    if args.db:
+        database.configure_database(args.db)
+    database.init_db()
+    conn = database.get_db_connection()
+    try:
+        if args.command == "rebuild":
+            count = rebuild_kanji_stats(conn)
+            print(f"✅ kanji_stats 재생성 완료: 한자 {count:,}개")
+            return 0
+
+        problems = check_kanji_stats(conn)
+        if not problems:
+            print("✅ kanji_stats가 word_kanji / words와 일치합니다.")
+            return 0
+        for problem in problems[:50]:
+            print(f"  {problem['kanji']} {problem['column']}: 저장 {problem['stored']!r} / 실제 {problem['expected']!r}")
+        if len(problems) > 50:
+            print(f"  ... 외 {len(problems) - 50}건")
+        print(f"❌ 불일치 {len(problems)}건 - python kanji_stats.py rebuild 로 다시 만드세요.")
+        return 1
+    finally:
+        conn.close()
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,27 +1,94 @@
-from fastapi import FastAPI
+import asyncio
+import time
+from typing import Optional
+
+from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
-from database import db_exists, init_db
+from fastapi.middleware.gzip import GZipMiddleware
+from fastapi.responses import JSONResponse
+from compression import COMPRESS_MIN_SIZE, GZIP_LEVEL
+from database import NOTEBOOK_NAME, close_db_pools, db_exists, init_db, use_notebook
+from db_executor import db_executor
+from metrics import end_request, registry, start_request
+from async_repository import AsyncWordRepository
 
 # 라우터 임포트
 from routes import router
+from snapshot import serving_snapshot
+from view_counter import FLUSH_INTERVAL, view_counter
 
 app = FastAPI(title="JLPT 어휘 Web API", version="2.0.0")
 
+# 캐시를 거치지 않는 응답 압축 - 캐시된 응답(미리 압축한 본문)과 NDJSON 스트림(청크마다 직접 압축)은 routes에서
+# (Content-Encoding이 이미 있는 응답은 GZipMiddleware가 그대로 통과시킴)
+app.add_middleware(GZipMiddleware, minimum_size=COMPRESS_MIN_SIZE, compresslevel=GZIP_LEVEL)
+
+# 라우터 등록
+app.include_router(router)
+
+# 노트북(사용자별 DB 파일)을 고르는 요청 헤더 - 없으면 기본 DB (database.py)
+NOTEBOOK_HEADER = "X-Notebook"
+
+
+@app.middleware("http")
+async def select_notebook(request: Request, call_next):
+    """X-Notebook 헤더의 노트북을 요청 처리 동안 현재 노트북으로 설정"""
+    name = request.headers.get(NOTEBOOK_HEADER)
+    if name is not None and not NOTEBOOK_NAME.fullmatch(name):
+        return JSONResponse(
+            status_code=400, content={"detail": "노트북 이름은 영문/숫자/_/- 1~64자여야 합니다."}
+        )
+    with use_notebook(name):
+        response = await call_next(request)
+    # 같은 URL이라도 노트북마다 응답이 다르다
+    response.headers.add_vary_header(NOTEBOOK_HEADER)
+    return response
+
+
+@app.middleware("http")
+async def instrument_requests(request: Request, call_next):
+    """라우트별 지연 시간과 요청당 SQL 실행 수/행 수 기록 (/metrics)"""
+    stats, token = start_request()
+    start = time.perf_counter()
+    status = 500
+    try:
+        response = await call_next(request)
+        status = response.status_code
+        return response
+    finally:
+        end_request(token)
+        route = request.scope.get("route")
+        registry.observe(
+            request.method,
+            route.path if route is not None else "unmatched",
+            status,
+            time.perf_counter() - start,
+            stats,
+        )
+
+
 # CORS 설정 (React가 다른 포트에서 실행될 때 필요)
+# 마지막에 추가한 미들웨어가 가장 바깥에서 실행된다 - 위 미들웨어가 바로 반환하는 응답(잘못된 X-Notebook의 400 등)에도
+# CORS 헤더가 붙도록 맨 마지막에 등록
 app.add_middleware(
     CORSMiddleware,
     allow_origins=["*"],
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Next-Cursor", "X-Total-Count"],
 )
 
-# 라우터 등록
-app.include_router(router)
-
 
 @app.on_event("startup")
 def startup_event():
     """애플리케이션 시작 시 데이터베이스 초기화"""
+    snap = serving_snapshot()
+    if snap is not None:
+        print(f"📦 읽기 전용 스냅샷 모드: {snap.path} (단어 {len(snap):,}개, 생성 {snap.meta['created_at']})")
+        if not db_exists():
+            # 검색 / 카테고리 계층 / 통계 / 랜덤 / 변경 로그는 SQLite가 있어야 응답한다 (없으면 503, routes.require_database)
+            print("⚠️ 원본 DB가 없어 단어 / 한자 / 카테고리 조회만 가능합니다.")
+            return
     if not db_exists():
         print("📊 데이터베이스 생성 중...")
         init_db()
@@ -29,4 +96,51 @@ def startup_event():
         print("\n마이그레이션을 실행하세요:")
         print("  python migrate.py")
     else:
+        # 기존 DB에도 새로 추가된 테이블/인덱스를 생성 (IF NOT EXISTS)
+        init_db()
         print("✅ 데이터베이스 준비 완료!")
+
+
+# 조회 수 버퍼를 주기적으로 기록하는 작업 (view_counter.py)
+_view_flush_task: Optional[asyncio.Task] = None
+
+
+async def _flush_all_views():
+    """노트북마다 버퍼의 조회 수를 그 노트북의 쓰기 큐에서 기록 (한 노트북이 실패해도 나머지는 계속)"""
+    for notebook, counter in view_counter.items():
+        if not counter.pending_count():
+            continue
+        try:
+            with use_notebook(notebook):
+                await AsyncWordRepository.flush_view_counts()
+        except Exception as e:
+            # 버퍼로 되돌렸으므로 다음 주기에 다시 기록
+            print(f"⚠️ 조회 수 기록 실패 ({notebook or '기본 DB'}): {e}")
+
+
+async def _flush_views_periodically():
+    while True:
+        await asyncio.sleep(FLUSH_INTERVAL)
+        await _flush_all_views()
+
+
+@app.on_event("startup")
+async def start_view_flush():
+    """조회 수 주기 기록 시작 (스냅샷 모드에서는 기본 DB의 조회 수를 세지 않고 노트북 것만 기록)"""
+    global _view_flush_task
+    _view_flush_task = asyncio.create_task(_flush_views_periodically())
+
+
+@app.on_event("shutdown")
+async def shutdown_event():
+    """애플리케이션 종료 시 남은 조회 수를 기록하고 DB 스레드와 풀에 남은 데이터베이스 연결 정리
+
+    조회 수도 쓰기 큐를 거치므로 아직 처리 중인 쓰기가 끝난 뒤 기록된다.
+    """
+    if _view_flush_task is not None:
+        _view_flush_task.cancel()
+    try:
+        await _flush_all_views()
+    finally:
+        db_executor.shutdown()
+        close_db_pools()
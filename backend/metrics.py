@@ -0,0 +1,250 @@
+"""
+요청 계측 - 라우트별 지연 시간, 요청당 SQL 실행 수/반환 행 수, Prometheus 텍스트 출력
+
+- database가 만드는 모든 연결은 InstrumentedConnection이며, 커서가 실행한 문장 수와 읽은 행 수를
+  현재 요청의 RequestStats(contextvar)에 기록한다.
+- main.py의 미들웨어가 요청마다 RequestStats를 만들고 끝나면 MetricsRegistry에 반영한다.
+- KANJI_SLOW_QUERY_MS 환경 변수를 지정하면 그보다 오래 걸린 문장을 EXPLAIN QUERY PLAN과 함께 로그로 남긴다.
+
+스트리밍 응답은 본문을 보내는 동안 실행된 쿼리가 집계되지 않는다.
+"""
+
+import contextvars
+import logging
+import os
+import sqlite3
+import threading
+import time
+from dataclasses import dataclass
+from typing import Dict, Optional, Sequence, Tuple
+
+logger = logging.getLogger("kanji.sql")
+
+# 느린 쿼리 기준 (ms, 지정하지 않으면 기록하지 않음)
+SLOW_QUERY_MS: Optional[float] = float(os.environ["KANJI_SLOW_QUERY_MS"]) if os.environ.get("KANJI_SLOW_QUERY_MS") else None
+
+LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0)
+STATEMENT_BUCKETS = (0, 1, 2, 3, 5, 10, 25, 50, 100, 250, 1000)
+ROW_BUCKETS = (0, 1, 10, 50, 100, 500, 1000, 5000, 10000, 50000, 100000)
+
+
+@dataclass
+class RequestStats:
+    """요청 하나 동안의 SQL 실행 통계"""
+
+    statements: int = 0
+    rows: int = 0
+    sql_seconds: float = 0.0
+
+
+_request_stats: contextvars.ContextVar[Optional[RequestStats]] = contextvars.ContextVar("request_stats", default=None)
+
+
+def start_request() -> Tuple[RequestStats, contextvars.Token]:
+    """현재 컨텍스트에서 요청 통계 수집 시작"""
+    stats = RequestStats()
+    return stats, _request_stats.set(stats)
+
+
+def end_request(token: contextvars.Token):
+    _request_stats.reset(token)
+
+
+class InstrumentedCursor(sqlite3.Cursor):
+    """실행한 문장 수, 읽은 행 수, 소요 시간을 현재 요청에 기록하는 커서"""
+
+    _sql: Optional[str] = None
+    _params = None
+    _elapsed = 0.0
+
+    def execute(self, sql, parameters=()):
+        self._finish()
+        start = time.perf_counter()
+        try:
+            return super().execute(sql, parameters)
+        finally:
+            self._begin(sql, parameters, time.perf_counter() - start)
+
+    def executemany(self, sql, seq_of_parameters):
+        self._finish()
+        start = time.perf_counter()
+        try:
+            return super().executemany(sql, seq_of_parameters)
+        finally:
+            self._begin(sql, None, time.perf_counter() - start)
+            self._finish()
+
+    def fetchone(self):
+        start = time.perf_counter()
+        row = super().fetchone()
+        self._record_rows(0 if row is None else 1, time.perf_counter() - start, done=row is None)
+        return row
+
+    def fetchmany(self, size=None):
+        size = self.arraysize if size is None else size
+        start = time.perf_counter()
+        rows = super().fetchmany(size)
+        self._record_rows(len(rows), time.perf_counter() - start, done=len(rows) < size)
+        return rows
+
+    def fetchall(self):
+        start = time.perf_counter()
+        rows = super().fetchall()
+        self._record_rows(len(rows), time.perf_counter() - start, done=True)
+        return rows
+
+    def __next__(self):
+        start = time.perf_counter()
+        try:
+            row = super().__next__()
+        except StopIteration:
+            self._record_rows(0, time.perf_counter() - start, done=True)
+            raise
+        self._record_rows(1, time.perf_counter() - start, done=False)
+        return row
+
+    def close(self):
+        self._finish()
+        super().close()
+
+    def _begin(self, sql: str, parameters, elapsed: float):
+        self._sql = sql
+        self._params = parameters
+        self._elapsed = elapsed
+        stats = _request_stats.get()
+        if stats is not None:
+            stats.statements += 1
+            stats.sql_seconds += elapsed
+
+    def _record_rows(self, count: int, elapsed: float, done: bool):
+        self._elapsed += elapsed
+        stats = _request_stats.get()
+        if stats is not None:
+            stats.rows += count
+            stats.sql_seconds += elapsed
+        if done:
+            self._finish()
+
+    def _finish(self):
+        """직전 문장의 결과를 다 읽었으면 느린 쿼리 여부 확인"""
+        sql, self._sql = self._sql, None
+        if sql is None or SLOW_QUERY_MS is None or self._elapsed * 1000 < SLOW_QUERY_MS:
+            return
+        plan = explain_query_plan(self.connection, sql, self._params)
+        logger.warning(
+            "느린 쿼리 %.1fms\n%s\n파라미터: %r\n실행 계획:\n%s",
+            self._elapsed * 1000,
+            sql.strip(),
+            self._params,
+            "\n".join(plan),
+        )
+
+
+class InstrumentedConnection(sqlite3.Connection):
+    """InstrumentedCursor를 기본 커서로 쓰는 연결"""
+
+    def cursor(self, factory=None):
+        return super().cursor(factory or InstrumentedCursor)
+
+    def execute(self, sql, parameters=()):
+        return self.cursor().execute(sql, parameters)
+
+    def executemany(self, sql, seq_of_parameters):
+        return self.cursor().executemany(sql, seq_of_parameters)
+
+
+def explain_query_plan(conn: sqlite3.Connection, sql: str, parameters=None) -> list:
+    """EXPLAIN QUERY PLAN 결과를 들여쓰기한 줄 목록으로 반환 (계측 없이 실행)"""
+    stripped = sql.lstrip().upper()
+    if not (stripped.startswith("SELECT") or stripped.startswith("WITH")):
+        return []
+    try:
+        cursor = sqlite3.Connection.cursor(conn, sqlite3.Cursor)
+        rows = cursor.execute(f"EXPLAIN QUERY PLAN {sql}", parameters or ()).fetchall()
+    except sqlite3.Error as e:
+        return [f"(실행 계획 조회 실패: {e})"]
+    depth = {0: 0}
+    lines = []
+    for node_id, parent_id, _, detail in rows:
+        depth[node_id] = depth.get(parent_id, 0) + 1
+        lines.append("  " * depth[node_id] + detail)
+    return lines
+
+
+class Histogram:
+    """Prometheus 형식 누적 히스토그램 (라벨 조합별)"""
+
+    def __init__(self, name: str, help_text: str, buckets: Sequence[float]):
+        self.name = name
+        self.help_text = help_text
+        self.buckets = tuple(buckets)
+        self._series: Dict[tuple, list] = {}
+
+    def observe(self, labels: tuple, value: float):
+        series = self._series.get(labels)
+        if series is None:
+            # [버킷별 개수..., 합계, 전체 개수]
+            series = self._series[labels] = [0] * len(self.buckets) + [0.0, 0]
+        for i, bound in enumerate(self.buckets):
+            if value <= bound:
+                series[i] += 1
+        series[-2] += value
+        series[-1] += 1
+
+    def render(self, label_names: Sequence[str]) -> list:
+        lines = [f"# HELP {self.name} {self.help_text}", f"# TYPE {self.name} histogram"]
+        for labels, series in sorted(self._series.items()):
+            label_text = ",".join(f'{k}="{_escape(v)}"' for k, v in zip(label_names, labels))
+            for bound, count in zip(self.buckets, series):
+                lines.append(f'{self.name}_bucket{{{label_text},le="{_format(bound)}"}} {count}')
+            lines.append(f'{self.name}_bucket{{{label_text},le="+Inf"}} {series[-1]}')
+            lines.append(f"{self.name}_sum{{{label_text}}} {_format(series[-2])}")
+            lines.append(f"{self.name}_count{{{label_text}}} {series[-1]}")
+        return lines
+
+
+def _escape(value) -> str:
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _format(value: float) -> str:
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class MetricsRegistry:
+    """요청 지표 모음"""
+
+    LABELS = ("method", "route")
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.requests: Dict[tuple, int] = {}
+        self.latency = Histogram("http_request_duration_seconds", "요청 처리 시간", LATENCY_BUCKETS)
+        self.sql_time = Histogram("db_query_duration_seconds", "요청당 SQLite 실행/읽기 시간 합계", LATENCY_BUCKETS)
+        self.statements = Histogram("db_statements_per_request", "요청당 실행한 SQL 문장 수", STATEMENT_BUCKETS)
+        self.rows = Histogram("db_rows_per_request", "요청당 읽은 행 수", ROW_BUCKETS)
+
+    def observe(self, method: str, route: str, status: int, seconds: float, stats: RequestStats):
+        labels = (method, route)
+        with self._lock:
+            key = (method, route, str(status))
+            self.requests[key] = self.requests.get(key, 0) + 1
+            self.latency.observe(labels, seconds)
+            self.sql_time.observe(labels, stats.sql_seconds)
+            self.statements.observe(labels, stats.statements)
+            self.rows.observe(labels, stats.rows)
+
+    def render(self) -> str:
+        """Prometheus 텍스트 형식"""
+        with self._lock:
+            lines = ["# HELP http_requests_total 처리한 요청 수", "# TYPE http_requests_total counter"]
+            for (method, route, status), count in sorted(self.requests.items()):
+                lines.append(
+                    f'http_requests_total{{method="{method}",route="{_escape(route)}",status="{status}"}} {count}'
+                )
+            for histogram in (self.latency, self.sql_time, self.statements, self.rows):
+                lines.extend(histogram.render(self.LABELS))
+        return "\n".join(lines) + "\n"
+
+
+registry = MetricsRegistry()
@@ -1,120 +1,238 @@
 """
 JSON 데이터를 SQLite 데이터베이스로 마이그레이션하는 스크립트
+
+- kanji_index.json ({ kanji: [word_objects] })을 통째로 읽지 않고 조금씩 파싱
+- (word, hiragana) 해시 셋으로 중복 제거
+- batch_size개씩 하나의 트랜잭션으로 일괄 삽입
+- 배치를 커밋할 때마다 진행 위치를 함께 저장하므로, 중단되면 마지막 커밋 지점부터 이어서 진행
+
+    python migrate.py [--file kanji_index.json] [--batch-size 1000] [--restart]
 """
 
+import argparse
+import codecs
 import json
-from datetime import datetime
+import os
+import time
+from typing import Iterator, Tuple
 from database import init_db, get_db_connection
-from utils import extract_kanji_from_word
+from repository import WordRepository
 
 JSON_FILE = "kanji_index.json"
-
-
-def migrate_json_to_db():
+BATCH_SIZE = 1000
+CHUNK_SIZE = 64 * 1024
+
+
+class _JsonStreamReader:
+    """파일을 CHUNK_SIZE씩 읽으면서 JSON 토큰/값을 순서대로 꺼내는 간단한 리더"""
+
+    def __init__(self, f, chunk_size: int = CHUNK_SIZE):
+        self._file = f
+        self._chunk_size = chunk_size
+        self._decoder = json.JSONDecoder()
+        self._text_decoder = codecs.getincrementaldecoder("utf-8-sig")()
+        self._buf = ""
+        self._pos = 0
+        self._eof = False
+        self.bytes_read = 0
+
+    def _fill(self) -> bool:
+        """버퍼에 다음 청크 추가 (더 읽을 게 없으면 False)"""
+        if self._eof:
+            return False
+        chunk = self._file.read(self._chunk_size)
+        self.bytes_read += len(chunk)
+        if not chunk:
+            self._eof = True
+            self._buf = self._buf[self._pos:] + self._text_decoder.decode(b"", final=True)
+        else:
+            self._buf = self._buf[self._pos:] + self._text_decoder.decode(chunk)
+        self._pos = 0
+        return True
+
+    def _peek(self) -> str:
+        """공백을 건너뛴 다음 문자 (파일 끝이면 빈 문자열)"""
+        while True:
+            while self._pos < len(self._buf) and self._buf[self._pos] in " \t\r\n":
+                self._pos += 1
+            if self._pos < len(self._buf):
+                return self._buf[self._pos]
+            if not self._fill():
+                return ""
+
+    def expect(self, chars: str) -> str:
+        """다음 문자가 chars 중 하나면 소비하고 반환"""
+        char = self._peek()
+        if not char or char not in chars:
+            raise ValueError(f"JSON 형식 오류: {chars!r} 중 하나가 필요하지만 {char!r} (위치 {self.bytes_read})")
+        self._pos += 1
+        return char
+
+    def value(self):
+        """다음 JSON 값 하나를 파싱 (버퍼에 다 들어올 때까지 더 읽는다)"""
+        self._peek()
+        while True:
+            try:
+                obj, end = self._decoder.raw_decode(self._buf, self._pos)
+                self._pos = end
+                return obj
+            except json.JSONDecodeError:
+                if not self._fill():
+                    raise
+
+    def iter_kanji_index(self) -> Iterator[Tuple[str, dict]]:
+        """{ kanji: [word_objects] } 구조에서 (kanji, word_object)를 하나씩 반환"""
+        self.expect("{")
+        if self._peek() == "}":
+            return
+        while True:
+            kanji = self.value()
+            self.expect(":")
+            self.expect("[")
+            if self._peek() == "]":
+                self._pos += 1
+            else:
+                while True:
+                    yield kanji, self.value()
+                    if self.expect(",]") == "]":
+                        break
+            if self.expect(",}") == "}":
+                return
+
+
+def _categories(value) -> list:
+    """category 값을 중복 없는 이름 목록으로 정리 (문자열 하나만 있는 경우 포함)"""
+    if isinstance(value, str):
+        value = [value]
+    cleaned = []
+    for item in value or []:
+        if isinstance(item, str) and item.strip() and item.strip() not in cleaned:
+            cleaned.append(item.strip())
+    return cleaned
+
+
+def _ensure_progress_table(cursor):
+    """이어하기용 진행 상황 테이블 생성"""
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS migration_progress (
+            source TEXT PRIMARY KEY,
+            processed INTEGER NOT NULL,
+            migrated INTEGER NOT NULL,
+            duplicates INTEGER NOT NULL,
+            updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+    """)
+
+
+def migrate_json_to_db(json_file: str = JSON_FILE, batch_size: int = BATCH_SIZE, restart: bool = False):
     """JSON 파일의 모든 데이터를 SQLite로 마이그레이션"""
 
     # 데이터베이스 초기화
     init_db()
     conn = get_db_connection()
     cursor = conn.cursor()
+    _ensure_progress_table(cursor)
 
-    # JSON 파일 읽기
-    with open(JSON_FILE, encoding="utf-8") as f:
-        json_data = json.load(f)
+    source = os.path.abspath(json_file)
+    if restart:
+        cursor.execute("DELETE FROM migration_progress WHERE source = ?", (source,))
+    conn.commit()
 
-    # 전체 단어 수 추적 (중복 제거)
-    migrated_count = 0
-    duplicate_count = 0
-    total_words = []
+    # 이전 실행에서 마지막으로 커밋된 위치
+    cursor.execute("SELECT processed, migrated, duplicates FROM migration_progress WHERE source = ?", (source,))
+    row = cursor.fetchone()
+    resume_from, migrated_count, duplicate_count = (tuple(row) if row else (0, 0, 0))
+    if resume_from:
+        print(f"⏩ 이전 진행 위치부터 이어서 진행: {resume_from:,}번째 항목 이후")
+
+    # 이미 저장된 단어는 중복으로 처리 (이어하기 포함)
+    cursor.execute("SELECT word, hiragana FROM words")
+    seen = {(row["word"], row["hiragana"]) for row in cursor.fetchall()}
+    category_cache = WordRepository._load_category_ids(cursor)
+
+    total_size = os.path.getsize(json_file)
+    started = time.perf_counter()
+    processed = 0
+    batch = []
+
+    def flush():
+        """현재 배치와 진행 위치를 하나의 트랜잭션으로 커밋"""
+        nonlocal migrated_count, duplicate_count
+        if batch:
+            word_ids = WordRepository._insert_words(cursor, batch, category_cache)
+            inserted = sum(1 for word_id in word_ids if word_id is not None)
+            migrated_count += inserted
+            duplicate_count += len(word_ids) - inserted
+            batch.clear()
+        cursor.execute(
+            """
+            INSERT INTO migration_progress (source, processed, migrated, duplicates, updated_at)
+            VALUES (?, ?, ?, ?, CURRENT_TIMESTAMP)
+            ON CONFLICT(source) DO UPDATE SET
+                processed = excluded.processed,
+                migrated = excluded.migrated,
+                duplicates = excluded.duplicates,
+                updated_at = excluded.updated_at
+            """,
+            (source, processed, migrated_count, duplicate_count),
+        )
+        conn.commit()
+
+        elapsed = time.perf_counter() - started
+        percent = reader.bytes_read / total_size * 100 if total_size else 100
+        print(
+            f"  ... {percent:5.1f}% | 처리 {processed:,}개 | 이동 {migrated_count:,}개"
+            f" | 중복 {duplicate_count:,}개 | {elapsed:.1f}s"
+        )
 
     # JSON 구조: { kanji: [word_objects] }
-    for kanji, words_list in json_data.items():
-        for word_obj in words_list:
+    with open(json_file, "rb") as f:
+        reader = _JsonStreamReader(f)
+        for kanji, word_obj in reader.iter_kanji_index():
+            processed += 1
+            if processed <= resume_from:
+                continue
+
             # 단어 정보 추출
             word = word_obj.get("word", "")
             hiragana = word_obj.get("hiragana", "")
-            meaning = word_obj.get("meaning", "")
-            korean = word_obj.get("korean", "")
-            categories = word_obj.get("category", [])
-            wrong_count = word_obj.get("wrong_count", 0)
-
-            # created_at, updated_at 파싱
-            created_at_str = word_obj.get("created_at", "")
-            updated_at_str = word_obj.get("updated_at", "")
 
             # 이미 처리한 단어인지 확인 (중복 방지)
-            is_duplicate = False
-            for existing_word in total_words:
-                if existing_word["word"] == word and existing_word["hiragana"] == hiragana:
-                    is_duplicate = True
-                    duplicate_count += 1
-                    break
-
-            if is_duplicate:
+            key = (word, hiragana)
+            if key in seen:
+                duplicate_count += 1
                 continue
-
-            total_words.append(
-                {
-                    "word": word,
-                    "hiragana": hiragana,
-                    "meaning": meaning,
-                    "korean": korean,
-                }
+            seen.add(key)
+
+            batch.append(
+                (
+                    word,
+                    hiragana,
+                    word_obj.get("meaning", ""),
+                    word_obj.get("korean", ""),
+                    word_obj.get("wrong_count", 0),
+                    word_obj.get("created_at", ""),
+                    word_obj.get("updated_at", ""),
+                    _categories(word_obj.get("category")),
+                )
             )
+            if len(batch) >= batch_size:
+                flush()
 
-            try:
-                # 단어 삽입
-                cursor.execute(
-                    """
-                    INSERT INTO words (word, hiragana, meaning, korean, wrong_count, created_at, updated_at)
-                    VALUES (?, ?, ?, ?, ?, ?, ?)
-                    """,
-                    (word, hiragana, meaning, korean, wrong_count, created_at_str, updated_at_str),
-                )
-                word_id = cursor.lastrowid
-
-                # 카테고리 추가
-                if categories:
-                    for category in categories:
-                        # 카테고리 존재 여부 확인
-                        cursor.execute("SELECT id FROM categories WHERE name = ?", (category,))
-                        cat_row = cursor.fetchone()
-
-                        if cat_row:
-                            category_id = cat_row["id"]
-                        else:
-                            cursor.execute("INSERT INTO categories (name) VALUES (?)", (category,))
-                            category_id = cursor.lastrowid
-
-                        # 매핑 추가
-                        cursor.execute(
-                            "INSERT OR IGNORE INTO word_categories (word_id, category_id) VALUES (?, ?)",
-                            (word_id, category_id),
-                        )
-
-                # 한자 인덱스 추가 (중복 제거)
-                kanji_list = extract_kanji_from_word(word)
-                kanji_set = set(kanji_list)  # 중복된 한자 제거
-                for k in kanji_set:
-                    cursor.execute(
-                        "INSERT OR IGNORE INTO word_kanji (word_id, kanji) VALUES (?, ?)",
-                        (word_id, k),
-                    )
-
-                migrated_count += 1
-
-            except Exception as e:
-                print(f"Error migrating word '{word}': {e}")
-                continue
+        flush()
 
-    conn.commit()
     conn.close()
 
     print(f"✅ 마이그레이션 완료!")
     print(f"  - 이동된 단어: {migrated_count}개")
     print(f"  - 제거된 중복: {duplicate_count}개")
-    print(f"  - 총 고유 단어: {len(total_words)}개")
+    print(f"  - 총 처리 항목: {processed}개")
 
 
 if __name__ == "__main__":
-    migrate_json_to_db()
+    parser = argparse.ArgumentParser(description="kanji_index.json -> SQLite 마이그레이션")
+    parser.add_argument("--file", default=JSON_FILE, help="가져올 JSON 파일")
+    parser.add_argument("--batch-size", type=int, default=BATCH_SIZE, help="트랜잭션당 단어 수")
+    parser.add_argument("--restart", action="store_true", help="저장된 진행 위치를 무시하고 처음부터")
+    args = parser.parse_args()
+    migrate_json_to_db(args.file, args.batch_size, args.restart)
@@ -0,0 +1,475 @@
+"""
+스키마 마이그레이션
+
+PRAGMA user_version에 마지막으로 적용한 마이그레이션 번호를 저장한다.
+MIGRATIONS의 n번째 함수(1부터)가 버전 n으로 올리는 단계이며, 아직 적용하지 않은 단계만
+각각 하나의 트랜잭션으로 순서대로 실행한다. 기존 kanji_vocab.db(버전 0)도 그대로 올릴 수 있도록
+첫 단계는 IF NOT EXISTS로 작성한다.
+
+새 마이그레이션은 MIGRATIONS 끝에 함수를 추가한다. (이미 배포된 단계는 고치지 않는다)
+"""
+
+import sqlite3
+from typing import Callable, List
+
+from sort_keys import rebuild_sort_keys
+
+
+def _create_base_tables(cursor):
+    """1: 기본 테이블"""
+    # Words 테이블
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS words (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            word TEXT NOT NULL,
+            hiragana TEXT NOT NULL,
+            meaning TEXT NOT NULL,
+            korean TEXT NOT NULL,
+            wrong_count INTEGER DEFAULT 0,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            UNIQUE(word, hiragana)
+        )
+    """)
+
+    # Categories 테이블 (N:M 관계)
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS categories (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            name TEXT UNIQUE NOT NULL
+        )
+    """)
+
+    # Word-Category 매핑 테이블
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS word_categories (
+            word_id INTEGER NOT NULL,
+            category_id INTEGER NOT NULL,
+            PRIMARY KEY (word_id, category_id),
+            FOREIGN KEY (word_id) REFERENCES words(id) ON DELETE CASCADE,
+            FOREIGN KEY (category_id) REFERENCES categories(id) ON DELETE CASCADE
+        )
+    """)
+
+    # Kanji 인덱스 테이블 (검색 최적화)
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS word_kanji (
+            word_id INTEGER NOT NULL,
+            kanji TEXT NOT NULL,
+            PRIMARY KEY (word_id, kanji),
+            FOREIGN KEY (word_id) REFERENCES words(id) ON DELETE CASCADE
+        )
+    """)
+
+
+# FTS5 검색 테이블 - words를 content 테이블로 쓰므로 본문은 중복 저장하지 않는다
+#   words_fts: unicode61 토크나이저 + 접두사 인덱스 (짧은 검색어의 접두사 검색)
+#   words_fts_trigram: trigram 토크나이저 (3글자 이상 검색어의 부분 문자열 검색)
+SEARCH_TABLES = {
+    "words_fts": "tokenize='unicode61', prefix='1 2 3'",
+    "words_fts_trigram": "tokenize='trigram'",
+}
+SEARCH_COLUMNS = ("word", "hiragana", "meaning", "korean")
+
+
+def _create_search_index(cursor):
+    """2: FTS5 테이블과 words 동기화 트리거 (기존 단어로 채움)"""
+    columns = ", ".join(SEARCH_COLUMNS)
+    new_values = ", ".join(f"new.{c}" for c in SEARCH_COLUMNS)
+    old_values = ", ".join(f"old.{c}" for c in SEARCH_COLUMNS)
+
+    for table, options in SEARCH_TABLES.items():
+        cursor.execute(f"""
+            CREATE VIRTUAL TABLE IF NOT EXISTS {table} USING fts5(
+                {columns}, content='words', content_rowid='id', {options}
+            )
+        """)
+        cursor.execute(f"""
+            CREATE TRIGGER IF NOT EXISTS {table}_ai AFTER INSERT ON words BEGIN
+                INSERT INTO {table} (rowid, {columns}) VALUES (new.id, {new_values});
+            END
+        """)
+        cursor.execute(f"""
+            CREATE TRIGGER IF NOT EXISTS {table}_ad AFTER DELETE ON words BEGIN
+                INSERT INTO {table} ({table}, rowid, {columns}) VALUES ('delete', old.id, {old_values});
+            END
+        """)
+        cursor.execute(f"""
+            CREATE TRIGGER IF NOT EXISTS {table}_au AFTER UPDATE OF {columns} ON words BEGIN
+                INSERT INTO {table} ({table}, rowid, {columns}) VALUES ('delete', old.id, {old_values});
+                INSERT INTO {table} (rowid, {columns}) VALUES (new.id, {new_values});
+            END
+        """)
+        cursor.execute(f"INSERT INTO {table} ({table}) VALUES ('rebuild')")
+
+
+def _create_secondary_indexes(cursor):
+    """3: repository.py 조회용 보조 인덱스"""
+    # 최신순 목록 / (updated_at, id) keyset 페이지네이션 - 역방향으로 읽어 정렬 없이 사용
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_words_updated_at ON words (updated_at, id)")
+    # 한자 -> 단어 (PRIMARY KEY가 (word_id, kanji)라 kanji로는 찾을 수 없음), DISTINCT kanji 목록도 이 인덱스로
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_word_kanji_kanji ON word_kanji (kanji, word_id)")
+    # 카테고리 -> 단어
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_word_categories_category ON word_categories (category_id, word_id)")
+    cursor.execute("ANALYZE")
+
+
+def _create_kanji_stats(cursor):
+    """4: 한자별 통계 테이블(kanji_stats)과 증분 갱신 트리거"""
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS kanji_stats (
+            kanji TEXT PRIMARY KEY,
+            word_count INTEGER NOT NULL,
+            total_wrong INTEGER NOT NULL,
+            last_updated TIMESTAMP,
+            difficulty REAL GENERATED ALWAYS AS (CAST(total_wrong AS REAL) / word_count) VIRTUAL
+        ) WITHOUT ROWID
+    """)
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_kanji_stats_count ON kanji_stats (word_count DESC, kanji)")
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_kanji_stats_difficulty ON kanji_stats (difficulty DESC, kanji)")
+
+    # 한자 하나의 통계를 word_kanji + words에서 다시 집계 ({kanji} 자리에 old.kanji 등)
+    recompute = """
+        DELETE FROM kanji_stats WHERE kanji = {kanji};
+        INSERT INTO kanji_stats (kanji, word_count, total_wrong, last_updated)
+        SELECT wk.kanji, COUNT(*), TOTAL(w.wrong_count), MAX(w.updated_at)
+        FROM word_kanji wk JOIN words w ON w.id = wk.word_id
+        WHERE wk.kanji = {kanji}
+        GROUP BY wk.kanji;
+    """
+
+    # 추가는 자주 일어나므로(일괄 추가) 다시 집계하지 않고 증감만 반영
+    cursor.execute("""
+        CREATE TRIGGER IF NOT EXISTS kanji_stats_wk_ai AFTER INSERT ON word_kanji BEGIN
+            INSERT INTO kanji_stats (kanji, word_count, total_wrong, last_updated)
+            SELECT new.kanji, 1, COALESCE(w.wrong_count, 0), w.updated_at FROM words w WHERE w.id = new.word_id
+            ON CONFLICT (kanji) DO UPDATE SET
+                word_count = word_count + 1,
+                total_wrong = total_wrong + excluded.total_wrong,
+                last_updated = MAX(COALESCE(last_updated, excluded.last_updated), COALESCE(excluded.last_updated, last_updated));
+        END
+    """)
+    # 삭제는 ON DELETE CASCADE로 words 행이 먼저 사라질 수 있으므로 해당 한자만 다시 집계
+    cursor.execute(f"""
+        CREATE TRIGGER IF NOT EXISTS kanji_stats_wk_ad AFTER DELETE ON word_kanji BEGIN
+            {recompute.format(kanji="old.kanji")}
+        END
+    """)
+    cursor.execute("""
+        CREATE TRIGGER IF NOT EXISTS kanji_stats_words_au AFTER UPDATE OF wrong_count, updated_at ON words
+        WHEN new.updated_at >= old.updated_at OR old.updated_at IS NULL BEGIN
+            UPDATE kanji_stats
+            SET total_wrong = total_wrong + COALESCE(new.wrong_count, 0) - COALESCE(old.wrong_count, 0),
+                last_updated = MAX(COALESCE(last_updated, new.updated_at), COALESCE(new.updated_at, last_updated))
+            WHERE kanji IN (SELECT kanji FROM word_kanji WHERE word_id = new.id);
+        END
+    """)
+    # updated_at이 과거로 바뀌면 최댓값을 증감으로 구할 수 없으므로 해당 단어의 한자들을 다시 집계
+    cursor.execute("""
+        CREATE TRIGGER IF NOT EXISTS kanji_stats_words_au_rewind AFTER UPDATE OF wrong_count, updated_at ON words
+        WHEN new.updated_at < old.updated_at OR (new.updated_at IS NULL AND old.updated_at IS NOT NULL) BEGIN
+            DELETE FROM kanji_stats WHERE kanji IN (SELECT kanji FROM word_kanji WHERE word_id = new.id);
+            INSERT INTO kanji_stats (kanji, word_count, total_wrong, last_updated)
+            SELECT wk.kanji, COUNT(*), TOTAL(w.wrong_count), MAX(w.updated_at)
+            FROM word_kanji wk JOIN words w ON w.id = wk.word_id
+            WHERE wk.kanji IN (SELECT kanji FROM word_kanji WHERE word_id = new.id)
+            GROUP BY wk.kanji;
+        END
+    """)
+
+    # 기존 데이터로 채움
+    cursor.execute("DELETE FROM kanji_stats")
+    cursor.execute("""
+        INSERT INTO kanji_stats (kanji, word_count, total_wrong, last_updated)
+        SELECT wk.kanji, COUNT(*), TOTAL(w.wrong_count), MAX(w.updated_at)
+        FROM word_kanji wk JOIN words w ON w.id = wk.word_id
+        GROUP BY wk.kanji
+    """)
+
+
+def _create_change_log(cursor):
+    """5: 단어 변경 로그(word_changes)와 삭제 표시(tombstone) 보관 범위"""
+    # 단어마다 마지막 변경 하나만 남긴다 - seq는 AUTOINCREMENT라 삭제 후에도 다시 쓰이지 않는다
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS word_changes (
+            seq INTEGER PRIMARY KEY AUTOINCREMENT,
+            word_id INTEGER NOT NULL UNIQUE,
+            deleted INTEGER NOT NULL DEFAULT 0,
+            changed_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+    """)
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_word_changes_tombstones ON word_changes (seq) WHERE deleted = 1")
+    # tombstone_horizon: 정리한 tombstone 중 가장 큰 seq (그 이전부터 동기화하려는 클라이언트는 전체를 다시 받아야 함)
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS sync_state (
+            name TEXT PRIMARY KEY,
+            value INTEGER NOT NULL
+        )
+    """)
+    cursor.execute("INSERT OR IGNORE INTO sync_state (name, value) VALUES ('tombstone_horizon', 0)")
+
+    # 바깥 문장의 충돌 처리(INSERT OR IGNORE 등)가 트리거 안까지 적용되므로 REPLACE 대신 DELETE 후 INSERT
+    record = """
+        DELETE FROM word_changes WHERE word_id = {word_id};
+        INSERT INTO word_changes (word_id, deleted) VALUES ({word_id}, {deleted});
+    """
+    triggers = [
+        ("word_changes_words_ai", "AFTER INSERT ON words", "", record.format(word_id="new.id", deleted=0)),
+        ("word_changes_words_au", "AFTER UPDATE ON words", "", record.format(word_id="new.id", deleted=0)),
+        ("word_changes_words_ad", "AFTER DELETE ON words", "", record.format(word_id="old.id", deleted=1)),
+        # 카테고리도 응답에 포함되므로 변경으로 기록 (단어 삭제로 연쇄 삭제될 때는 tombstone을 덮지 않도록)
+        (
+            "word_changes_categories_ai",
+            "AFTER INSERT ON word_categories",
+            "WHEN EXISTS (SELECT 1 FROM words WHERE id = new.word_id)",
+            record.format(word_id="new.word_id", deleted=0),
+        ),
+        (
+            "word_changes_categories_ad",
+            "AFTER DELETE ON word_categories",
+            "WHEN EXISTS (SELECT 1 FROM words WHERE id = old.word_id)",
+            record.format(word_id="old.word_id", deleted=0),
+        ),
+    ]
+    for name, event, when, body in triggers:
+        cursor.execute(f"CREATE TRIGGER IF NOT EXISTS {name} {event} {when} BEGIN {body} END")
+
+    # 기존 단어는 오래된 수정 순서대로 기록
+    cursor.execute("""
+        INSERT OR IGNORE INTO word_changes (word_id, deleted)
+        SELECT id, 0 FROM words ORDER BY updated_at, id
+    """)
+
+
+def _create_category_tree(cursor):
+    """6: 카테고리 계층 (categories.parent_id)과 조상-자손 closure 테이블"""
+    cursor.execute("ALTER TABLE categories ADD COLUMN parent_id INTEGER REFERENCES categories(id)")
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_categories_parent ON categories (parent_id, name)")
+    # 모든 (조상, 자손) 쌍 - 자기 자신도 depth 0으로 포함하므로 하위 트리 전체가 ancestor_id 하나로 조회된다
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS category_closure (
+            ancestor_id INTEGER NOT NULL,
+            descendant_id INTEGER NOT NULL,
+            depth INTEGER NOT NULL,
+            PRIMARY KEY (ancestor_id, descendant_id)
+        ) WITHOUT ROWID
+    """)
+    # 자손 -> 조상 (경로 조회, 이동할 때 옛 조상 찾기)
+    cursor.execute(
+        "CREATE INDEX IF NOT EXISTS idx_category_closure_descendant ON category_closure (descendant_id, depth)"
+    )
+
+    # 새 카테고리: 자기 자신 + 부모의 조상들
+    cursor.execute("""
+        CREATE TRIGGER IF NOT EXISTS category_closure_ai AFTER INSERT ON categories
+        BEGIN
+            INSERT INTO category_closure (ancestor_id, descendant_id, depth) VALUES (new.id, new.id, 0);
+            INSERT INTO category_closure (ancestor_id, descendant_id, depth)
+            SELECT ancestor_id, new.id, depth + 1 FROM category_closure WHERE descendant_id = new.parent_id;
+        END
+    """)
+    # 자기 하위 트리 아래로는 옮길 수 없다
+    cursor.execute("""
+        CREATE TRIGGER IF NOT EXISTS category_closure_cycle BEFORE UPDATE OF parent_id ON categories
+        WHEN new.parent_id IS NOT NULL AND EXISTS (
+            SELECT 1 FROM category_closure WHERE ancestor_id = new.id AND descendant_id = new.parent_id
+        )
+        BEGIN
+            SELECT RAISE(ABORT, 'category cycle');
+        END
+    """)
+    # 이동: 하위 트리와 옛 조상들 사이의 쌍만 지우고, 새 부모의 조상들과 하위 트리를 잇는다
+    cursor.execute("""
+        CREATE TRIGGER IF NOT EXISTS category_closure_move AFTER UPDATE OF parent_id ON categories
+        WHEN new.parent_id IS NOT old.parent_id
+        BEGIN
+            DELETE FROM category_closure
+            WHERE descendant_id IN (SELECT descendant_id FROM category_closure WHERE ancestor_id = new.id)
+              AND ancestor_id IN (
+                  SELECT ancestor_id FROM category_closure WHERE descendant_id = new.id AND ancestor_id != new.id
+              );
+            INSERT INTO category_closure (ancestor_id, descendant_id, depth)
+            SELECT up.ancestor_id, down.descendant_id, up.depth + down.depth + 1
+            FROM category_closure up, category_closure down
+            WHERE up.descendant_id = new.parent_id AND down.ancestor_id = new.id;
+        END
+    """)
+
+    # 기존 카테고리는 모두 최상위
+    cursor.execute("""
+        INSERT OR IGNORE INTO category_closure (ancestor_id, descendant_id, depth)
+        SELECT id, id, 0 FROM categories
+    """)
+
+
+def _create_sort_keys(cursor):
+    """7: 목록 정렬 키 컬럼과 정렬별 인덱스 (sort_keys.py, repository.SORTS)"""
+    # 정렬 키는 응답에 포함되지 않으므로 변경 로그에는 응답 컬럼이 바뀐 경우만 기록
+    cursor.execute("DROP TRIGGER IF EXISTS word_changes_words_au")
+    cursor.execute("""
+        CREATE TRIGGER IF NOT EXISTS word_changes_words_au
+        AFTER UPDATE OF word, hiragana, meaning, korean, wrong_count, created_at, updated_at ON words
+        BEGIN
+            DELETE FROM word_changes WHERE word_id = new.id;
+            INSERT INTO word_changes (word_id, deleted) VALUES (new.id, 0);
+        END
+    """)
+
+    cursor.execute("ALTER TABLE words ADD COLUMN reading_key TEXT NOT NULL DEFAULT ''")
+    cursor.execute("ALTER TABLE words ADD COLUMN meaning_key TEXT NOT NULL DEFAULT ''")
+    cursor.execute("ALTER TABLE word_kanji ADD COLUMN position INTEGER NOT NULL DEFAULT 0")
+    rebuild_sort_keys(cursor, commit=False)
+
+    # 정렬마다 (키, id) 순서로 읽어 정렬 없이 keyset 페이지네이션
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_words_word ON words (word, id)")
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_words_reading ON words (reading_key, id)")
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_words_meaning ON words (meaning_key, id)")
+    # 한자별 목록의 위치순 - idx_word_kanji_kanji (kanji, word_id)는 최신순/단어순 조회에 그대로 쓴다
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_word_kanji_position ON word_kanji (kanji, position, word_id)")
+    cursor.execute("ANALYZE")
+
+
+def _create_word_views(cursor):
+    """8: 단어별 조회 수 (view_counter.py가 모아서 기록)"""
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS word_views (
+            word_id INTEGER PRIMARY KEY REFERENCES words(id) ON DELETE CASCADE,
+            view_count INTEGER NOT NULL
+        )
+    """)
+    # 인기 단어 상위 N개 - 인덱스 순서로 N개만 읽는다
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_word_views_count ON word_views (view_count DESC, word_id)")
+
+
+def _create_review_state(cursor):
+    """9: 간격 반복 복습 상태 (review.py) - 새 단어는 추가되는 즉시 복습 대상"""
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS review_state (
+            word_id INTEGER PRIMARY KEY REFERENCES words(id) ON DELETE CASCADE,
+            ease REAL NOT NULL DEFAULT 2.5,
+            interval_days REAL NOT NULL DEFAULT 0,
+            repetitions INTEGER NOT NULL DEFAULT 0,
+            due_at INTEGER NOT NULL,
+            last_reviewed INTEGER
+        )
+    """)
+    # 기한이 지난 단어를 오래된 순서로 - 인덱스 앞부분 n개만 읽는다
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_review_state_due ON review_state (due_at, word_id)")
+    cursor.execute("""
+        CREATE TRIGGER IF NOT EXISTS review_state_words_ai AFTER INSERT ON words
+        BEGIN
+            INSERT INTO review_state (word_id, due_at) VALUES (new.id, CAST(strftime('%s', 'now') AS INTEGER));
+        END
+    """)
+    cursor.execute("""
+        INSERT OR IGNORE INTO review_state (word_id, due_at)
+        SELECT id, CAST(strftime('%s', 'now') AS INTEGER) FROM words
+    """)
+
+
+# 변경 로그(word_changes)에 남지 않는 변경 - 트리거와 재생성 스크립트가 함께 쓴다
+BUMP_DATA_VERSION_SQL = "UPDATE data_version SET version = version + 1"
+
+
+def _create_data_version(cursor):
+    """10: 데이터 버전 (cache.read_data_version) - 다른 프로세스가 커밋한 변경도 캐시가 알 수 있도록
+
+    단어 단위 변경은 word_changes의 seq로 알 수 있으므로 word_kanji 변경도 그 단어의 변경으로 기록하고,
+    단어에 속하지 않는 변경(카테고리 계층, 정렬 키, 한자 위치)만 version을 올린다.
+    epoch는 DB 파일마다 다른 값이라 파일을 바꿔 끼우면 (seq, version)이 겹쳐도 다른 버전이 된다.
+    """
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS data_version (
+            id INTEGER PRIMARY KEY CHECK (id = 1),
+            epoch TEXT NOT NULL,
+            version INTEGER NOT NULL
+        )
+    """)
+    cursor.execute("INSERT OR IGNORE INTO data_version (id, epoch, version) VALUES (1, lower(hex(randomblob(8))), 0)")
+
+    bump = f"{BUMP_DATA_VERSION_SQL};"
+    # 단어가 이미 마지막 변경이면 다시 기록하지 않는다 (단어 추가/수정 직후의 word_kanji 갱신)
+    record = """
+        DELETE FROM word_changes WHERE word_id = {word_id};
+        INSERT INTO word_changes (word_id, deleted) VALUES ({word_id}, 0);
+    """
+    record_when = """
+        WHEN EXISTS (SELECT 1 FROM words WHERE id = {word_id})
+         AND {word_id} IS NOT (SELECT word_id FROM word_changes ORDER BY seq DESC LIMIT 1)
+    """
+    triggers = [
+        ("data_version_categories_ai", "AFTER INSERT ON categories", "", bump),
+        ("data_version_categories_au", "AFTER UPDATE ON categories", "", bump),
+        # 이름이 바뀌면 그 카테고리의 단어 응답(category 배열)도 바뀐다
+        (
+            "word_changes_categories_rename",
+            "AFTER UPDATE OF name ON categories",
+            "WHEN new.name IS NOT old.name",
+            """
+                DELETE FROM word_changes
+                WHERE word_id IN (SELECT word_id FROM word_categories WHERE category_id = new.id);
+                INSERT INTO word_changes (word_id, deleted)
+                SELECT word_id, 0 FROM word_categories WHERE category_id = new.id;
+            """,
+        ),
+        ("data_version_categories_ad", "AFTER DELETE ON categories", "", bump),
+        ("data_version_words_sort_keys", "AFTER UPDATE OF reading_key, meaning_key ON words", "", bump),
+        ("data_version_word_kanji_position", "AFTER UPDATE OF position ON word_kanji", "", bump),
+        (
+            "word_changes_word_kanji_ai",
+            "AFTER INSERT ON word_kanji",
+            record_when.format(word_id="new.word_id"),
+            record.format(word_id="new.word_id"),
+        ),
+        (
+            "word_changes_word_kanji_ad",
+            "AFTER DELETE ON word_kanji",
+            record_when.format(word_id="old.word_id"),
+            record.format(word_id="old.word_id"),
+        ),
+    ]
+    for name, event, when, body in triggers:
+        cursor.execute(f"CREATE TRIGGER IF NOT EXISTS {name} {event} {when} BEGIN {body} END")
+
+
+MIGRATIONS: List[Callable] = [
+    _create_base_tables,
+    _create_search_index,
+    _create_secondary_indexes,
+    _create_kanji_stats,
+    _create_change_log,
+    _create_category_tree,
+    _create_sort_keys,
+    _create_word_views,
+    _create_review_state,
+    _create_data_version,
+]
+
+SCHEMA_VERSION = len(MIGRATIONS)
+
+
+def get_schema_version(conn: sqlite3.Connection) -> int:
+    return conn.execute("PRAGMA user_version").fetchone()[0]
+
+
+def apply_migrations(conn: sqlite3.Connection) -> int:
+    """적용되지 않은 마이그레이션을 단계별 트랜잭션으로 실행, 최종 버전 반환"""
+    current = get_schema_version(conn)
+    if current > SCHEMA_VERSION:
+        raise RuntimeError(f"DB 스키마 버전({current})이 코드가 아는 버전({SCHEMA_VERSION})보다 높습니다.")
+
+    for version in range(current + 1, SCHEMA_VERSION + 1):
+        cursor = conn.cursor()
+        cursor.execute("BEGIN IMMEDIATE")
+        try:
+            # 다른 프로세스가 먼저 올렸을 수 있으므로 잠금을 잡은 뒤 다시 확인
+            if get_schema_version(conn) >= version:
+                conn.rollback()
+                continue
+            MIGRATIONS[version - 1](cursor)
+            cursor.execute(f"PRAGMA user_version = {version}")
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+    return get_schema_version(conn)
@@ -1,4 +1,4 @@
-from pydantic import BaseModel, Field, field_validator
+from pydantic import BaseModel, Field, field_validator, model_validator
 from typing import List, Optional
 from datetime import datetime, timezone
 
@@ -45,6 +45,48 @@ class WordUpdate(WordBase):
     wrong_count: Optional[int] = None
 
 
+class WordPatch(WordBase):
+    """PATCH /kanji/{word_id} - 보낸 필드만 변경 (model_dump(exclude_unset=True))"""
+
+    word: Optional[str] = None
+    hiragana: Optional[str] = None
+    meaning: Optional[str] = None
+    korean: Optional[str] = None
+    category: Optional[List[str]] = None
+    updated_at: Optional[datetime] = None
+    wrong_count: Optional[int] = None
+    wrong_count_delta: Optional[int] = None  # wrong_count = wrong_count + delta (0 아래로는 내려가지 않음)
+
+    @model_validator(mode="after")
+    def check_fields(self):
+        for name in ("word", "hiragana", "meaning", "korean"):
+            if name in self.model_fields_set and getattr(self, name) is None:
+                raise ValueError(f"{name}은(는) null일 수 없습니다.")
+        if self.wrong_count is not None and self.wrong_count_delta is not None:
+            raise ValueError("wrong_count와 wrong_count_delta는 함께 보낼 수 없습니다.")
+        return self
+
+
+class CategoryMove(BaseModel):
+    """PUT /category/{category}/parent - 새 부모 카테고리 (null이면 최상위로)"""
+
+    parent: Optional[str] = None
+
+    @field_validator("parent", mode="before")
+    @classmethod
+    def clean_parent(cls, v):
+        if isinstance(v, str):
+            v = v.strip()
+        return v or None
+
+
+class ReviewAnswer(BaseModel):
+    """POST /review/answers - 단어 하나의 채점 (0: 전혀 모름 ~ 5: 바로 맞힘, 3 이상이면 맞힌 것)"""
+
+    word_id: int
+    grade: int = Field(ge=0, le=5)
+
+
 class WordResponse(Word):
     id: int
 
@@ -0,0 +1,141 @@
+"""
+노트북(사용자별 DB 파일) 관리
+
+노트북은 NOTEBOOK_DIR(기본 notebooks/, KANJI_NOTEBOOK_DIR)의 <이름>.db 파일이며,
+서버는 요청의 X-Notebook 헤더로 고른 노트북을 처음 열 때 만들고 마이그레이션한다. (database.py)
+유지보수 작업은 노트북마다 별도 프로세스에서 동시에 실행한다. (파일이 서로 독립이라 잠금을 다투지 않음)
+
+    python notebooks.py list
+    python notebooks.py maintain vacuum|analyze|reindex|migrate [--workers 4] [--include-default]
+                                 [--db kanji_vocab.db] [--dir notebooks] [notebook ...]
+
+- vacuum: 파일 재작성 (삭제로 생긴 빈 페이지 반환)
+- analyze: 쿼리 플래너 통계 갱신
+- reindex: 모든 인덱스와 FTS5 검색 테이블 재생성
+- migrate: 아직 열리지 않은 노트북까지 미리 마이그레이션 (배포 직후 첫 요청 지연 방지)
+
+실행 중인 서버와 함께 돌려도 되지만 vacuum / reindex는 그 노트북의 쓰기를 끝날 때까지 막는다.
+하나라도 실패하면 종료 코드 1
+"""
+
+import argparse
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Optional, Tuple
+
+import database
+from migrations import SEARCH_TABLES, apply_migrations, get_schema_version
+
+TASKS = ("vacuum", "analyze", "reindex", "migrate")
+
+
+def _file_size(path: str) -> int:
+    return os.path.getsize(path) if os.path.exists(path) else 0
+
+
+def run_task(notebook: Optional[str], task: str) -> Dict:
+    """노트북 하나에 유지보수 작업 실행 (None이면 기본 DB) - 작업자 프로세스에서 호출"""
+    path = database.notebook_path(notebook)
+    before = _file_size(path)
+    start = time.perf_counter()
+    with database.use_notebook(notebook):
+        conn = database.get_db_connection()
+    try:
+        # 노트북은 연결을 열 때 이미 마이그레이션되고 기본 DB는 여기서 (migrate 작업은 이것으로 끝)
+        apply_migrations(conn)
+        if task == "vacuum":
+            conn.execute("VACUUM")
+        elif task == "analyze":
+            conn.execute("ANALYZE")
+        elif task == "reindex":
+            conn.execute("REINDEX")
+            for table in SEARCH_TABLES:
+                conn.execute(f"INSERT INTO {table} ({table}) VALUES ('rebuild')")
+            conn.commit()
+        # WAL에 남은 내용을 파일에 반영해 크기를 비교할 수 있게
+        conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+        version = get_schema_version(conn)
+    finally:
+        conn.close()
+    return {
+        "notebook": notebook,
+        "seconds": time.perf_counter() - start,
+        "size_before": before,
+        "size_after": _file_size(path),
+        "schema_version": version,
+    }
+
+
+def _run_in_worker(args: Tuple[Optional[str], str, str, str]) -> Dict:
+    """작업자 프로세스 진입점 - 부모의 DB 설정을 적용한 뒤 run_task (실패하면 error 포함)"""
+    notebook, task, database_url, notebook_dir = args
+    database.configure_database(database_url, notebook_dir=notebook_dir)
+    try:
+        return run_task(notebook, task)
+    except Exception as e:
+        return {"notebook": notebook, "error": f"{type(e).__name__}: {e}"}
+
+
+def maintain(notebooks: List[Optional[str]], task: str, workers: Optional[int] = None) -> List[Dict]:
+    """노트북들에 작업을 프로세스 풀로 나눠 실행, 노트북 순서대로 결과 반환"""
+    jobs = [(notebook, task, database.DATABASE_URL, database.NOTEBOOK_DIR) for notebook in notebooks]
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        return list(pool.map(_run_in_worker, jobs))
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="노트북(사용자별 DB 파일) 관리")
+    parser.add_argument("command", choices=["list", "maintain"])
+    parser.add_argument("task", nargs="?", choices=TASKS, help="maintain에서 실행할 작업")
+    parser.add_argument("notebooks", nargs="*", help="대상 노트북 (생략하면 전부)")
+    parser.add_argument("--workers", type=int, help="작업자 프로세스 수 (기본: CPU 수)")
+    parser.add_argument("--include-default", action="store_true", help="기본 DB에도 실행")
+    parser.add_argument("--db", help="기본 DB 파일 (기본: database.DATABASE_URL)")
+    parser.add_argument("--dir", help="노트북 디렉터리 (기본: database.NOTEBOOK_DIR)")
+    args = parser.parse_args()
+
+    database.configure_database(args.db, notebook_dir=args.dir)
+    names = args.notebooks or database.list_notebooks()
+    invalid = [name for name in names if not database.NOTEBOOK_NAME.fullmatch(name)]
+    if invalid:
+        parser.error(f"잘못된 노트북 이름: {', '.join(invalid)}")
+
+    if args.command == "list":
+        for name in names:
+            size = _file_size(database.notebook_path(name))
+            print(f"  {name}  {size / 1024 / 1024:.1f} MB")
+        print(f"노트북 {len(names):,}개 ({database.NOTEBOOK_DIR})")
+        return 0
+
+    if args.task is None:
+        parser.error("maintain에는 작업(vacuum, analyze, reindex, migrate)이 필요합니다")
+    targets: List[Optional[str]] = ([None] if args.include_default else []) + names
+    if not targets:
+        print(f"대상 노트북이 없습니다. ({database.NOTEBOOK_DIR})")
+        return 0
+
+    start = time.perf_counter()
+    results = maintain(targets, args.task, args.workers)
+    failed = 0
+    for result in results:
+        name = result["notebook"] or "(기본 DB)"
+        if "error" in result:
+            failed += 1
+            print(f"  ❌ {name}: {result['error']}")
+            continue
+        print(
+            f"  {name}: {result['seconds']:.2f}s | {result['size_before'] / 1024 / 1024:.1f} MB"
+            f" -> {result['size_after'] / 1024 / 1024:.1f} MB | 스키마 {result['schema_version']}"
+        )
+    elapsed = time.perf_counter() - start
+    if failed:
+        print(f"❌ {args.task}: {len(results) - failed}/{len(results)}개 완료, {failed}개 실패 ({elapsed:.1f}s)")
+        return 1
+    print(f"✅ {args.task}: {len(results):,}개 완료 ({elapsed:.1f}s)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
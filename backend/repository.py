@@ -1,281 +1,1223 @@
+import itertools
+import json
 import sqlite3
+import time
+from collections import Counter
+from dataclasses import dataclass
+from functools import partial
 from datetime import datetime, timezone
-from typing import List, Optional
-from models import Word, WordUpdate, WordResponse
-from database import get_db_connection
+from typing import Callable, Iterable, Iterator, List, Literal, Optional, Tuple, Union
+from models import Word, WordPatch, WordUpdate, WordResponse
+from review import DAY_SECONDS, LEASE_SECONDS, PASS_GRADE, ReviewState, schedule, to_iso
+from cache import read_data_version
+from database import db_connection, db_exists, get_db_connection
+from fragments import dump_word, word_fragments
+from sampling import random_index
+from snapshot import Snapshot, serving_snapshot
+from sort_keys import kanji_position, meaning_key, reading_key
+from tokenizer import extract_kanji_bulk
 from utils import extract_kanji_from_word
+from view_counter import view_counter
 
+# 목록 조회 공통 컬럼 - 카테고리는 행마다 추가 쿼리 없이 JSON 배열로 함께 집계
+WORD_COLUMNS = """
+    w.id, w.word, w.hiragana, w.meaning, w.korean, w.wrong_count, w.created_at, w.updated_at,
+    (
+        SELECT json_group_array(c.name)
+        FROM word_categories wc2
+        JOIN categories c ON c.id = wc2.category_id
+        WHERE wc2.word_id = w.id
+    ) AS category
+"""
 
-class WordRepository:
-    """단어 데이터베이스 접근 계층"""
 
-    @staticmethod
-    def add_word(word: Word) -> dict:
-        """새로운 단어 추가"""
-        conn = get_db_connection()
+ALL_KANJI_SQL = "SELECT DISTINCT kanji FROM word_kanji ORDER BY kanji"
+ALL_CATEGORIES_SQL = "SELECT name FROM categories ORDER BY name"
+
+# GET /categories/tree - 카테고리마다 직접 속한 단어 수
+CATEGORY_TREE_SQL = """
+    SELECT c.id, c.name, c.parent_id,
+           (SELECT COUNT(*) FROM word_categories wc WHERE wc.category_id = c.id) AS word_count
+    FROM categories c
+    ORDER BY c.name
+"""
+
+# GET /category/{category}/children - 경로(최상위 -> 부모)와 바로 아래 하위 카테고리
+CATEGORY_ID_SQL = "SELECT id FROM categories WHERE name = ?"
+CATEGORY_PATH_SQL = """
+    SELECT c.name FROM category_closure cc JOIN categories c ON c.id = cc.ancestor_id
+    WHERE cc.descendant_id = ? AND cc.depth > 0
+    ORDER BY cc.depth DESC
+"""
+CATEGORY_CHILDREN_SQL = """
+    SELECT c.name,
+           (SELECT COUNT(DISTINCT wc.word_id)
+            FROM category_closure cc JOIN word_categories wc ON wc.category_id = cc.descendant_id
+            WHERE cc.ancestor_id = c.id) AS word_count,
+           (SELECT COUNT(*) FROM categories k WHERE k.parent_id = c.id) AS child_count
+    FROM categories c
+    WHERE c.parent_id = ?
+    ORDER BY c.name
+"""
+
+# 카테고리(이름)에 직접 속한 단어 ID
+CATEGORY_WORD_IDS_SQL = """
+    SELECT word_id FROM word_categories WHERE category_id = (SELECT id FROM categories WHERE name = ?)
+"""
+
+# 한자가 들어간 단어 ID
+KANJI_WORD_IDS_SQL = "SELECT word_id FROM word_kanji WHERE kanji = ?"
+
+# 카테고리(이름) 하위 트리 전체에 속한 단어 ID - closure 테이블 한 번의 조인 (재귀 없음)
+SUBTREE_WORD_IDS_SQL = """
+    SELECT wc.word_id
+    FROM categories cat
+    JOIN category_closure cc ON cc.ancestor_id = cat.id
+    JOIN word_categories wc ON wc.category_id = cc.descendant_id
+    WHERE cat.name = ?
+"""
+
+# GET /kanji/stats 정렬 - idx_kanji_stats_count / idx_kanji_stats_difficulty 순서와 같다
+KANJI_STATS_ORDERS = {
+    "count": "word_count DESC, kanji",
+    "difficulty": "difficulty DESC, kanji",
+}
+
+# JSON 조각 응답용 - 정렬된 id와 다음 커서용 정렬 키만 읽는다 (목록 쿼리는 정렬에 맞는 키 컬럼으로 바꾼다)
+KEY_COLUMNS = "w.id, w.updated_at"
+
+# keyset 페이지네이션 정렬 기준 - 커서는 마지막 행의 (updated_at, id)
+PAGE_ORDER = "w.updated_at DESC, w.id DESC"
+
+
+@dataclass(frozen=True)
+class SortSpec:
+    """목록 정렬 - keys 다음 id_column으로 동률을 가른다 (커서는 마지막 행의 (*keys, id))
+
+    keys는 migrations.py 7단계의 정렬 키 컬럼이며, (키, id) 인덱스 순서로 읽어 정렬 없이 페이지를 넘긴다.
+    """
+
+    keys: Tuple[str, ...]
+    descending: bool = False
+    id_column: str = "w.id"
+
+    @property
+    def order_by(self) -> str:
+        direction = " DESC" if self.descending else ""
+        return ", ".join(f"{column}{direction}" for column in (*self.keys, self.id_column))
+
+    @property
+    def key_columns(self) -> str:
+        return ", ".join(("w.id", *self.keys))
+
+    @property
+    def after_condition(self) -> str:
+        columns = ", ".join((*self.keys, self.id_column))
+        placeholders = ", ".join("?" * (len(self.keys) + 1))
+        return f"({columns}) {'<' if self.descending else '>'} ({placeholders})"
+
+
+# sort= 파라미터 - updated: 최신순, word: 단어순, reading: 읽는 법순, meaning: 뜻 가나다순
+SORTS = {
+    "updated": SortSpec(("w.updated_at",), descending=True),
+    "word": SortSpec(("w.word",)),
+    "reading": SortSpec(("w.reading_key",)),
+    "meaning": SortSpec(("w.meaning_key",)),
+}
+# 한자별 목록에서만 - 단어 안 한자 위치순 (idx_word_kanji_position 순서 그대로)
+KANJI_SORTS = {**SORTS, "position": SortSpec(("wk.position",), id_column="wk.word_id")}
+
+# 기한이 지난 복습 단어 (오래된 순서) - idx_review_state_due 앞부분만 읽는다
+DUE_REVIEWS_SQL = """
+    SELECT word_id, ease, interval_days, repetitions, due_at FROM review_state
+    WHERE due_at <= ?
+    ORDER BY due_at, word_id
+    LIMIT ?
+"""
+
+# 스트리밍 시 커서에서 한 번에 읽어 오는 행 수
+STREAM_BATCH_SIZE = 500
+
+# 마지막 행의 (*정렬 키, id) - 기본(최신순)은 (updated_at, id)
+Cursor = Tuple
+
+# JSON 조각 응답 - (JSON 배열 본문, 행 수, 마지막 행의 커서)
+WordsJson = Tuple[bytes, int, Optional[Cursor]]
+
+# 단어 목록 조회 결과 형태 (_run) - list: dict 목록, stream: dict 스트림, json: WordsJson, ndjson: NDJSON 청크
+ListMode = Literal["list", "stream", "json", "ndjson"]
+WordList = Union[List[dict], Iterator[dict], WordsJson, Iterator[bytes]]
+
+# 변경 로그(word_changes) tombstone 보관 범위 - 둘 중 하나라도 넘으면 오래된 것부터 정리
+TOMBSTONE_RETENTION_DAYS = 30
+MAX_TOMBSTONES = 10000
+
+
+def _row_to_word(row: sqlite3.Row) -> dict:
+    """WORD_COLUMNS로 조회한 행을 응답용 dict로 변환"""
+    word_dict = dict(row)
+    word_dict["category"] = json.loads(word_dict["category"])
+    return word_dict
+
+
+def _word_list_query(
+    joins: str,
+    where: List[str],
+    params: list,
+    default_order: str,
+    after: Optional[Cursor] = None,
+    limit: Optional[int] = None,
+    columns: str = WORD_COLUMNS,
+    sort: Optional[SortSpec] = None,
+) -> Tuple[str, list]:
+    """단어 목록 쿼리 생성
+
+    sort가 주어지면 그 정렬로, 아니면 after 또는 limit이 주어질 때 (updated_at, id) 기준으로
+    keyset 페이지네이션하며, 셋 다 없으면 기존 정렬(default_order)로 전체를 조회한다.
+    JSON 조각으로 응답할 때는 columns=KEY_COLUMNS로 정렬된 id와 커서용 정렬 키만 읽는다.
+    """
+    where = list(where)
+    params = list(params)
+    order_by = default_order
+
+    if sort is not None or after is not None or limit is not None:
+        sort = sort or SORTS["updated"]
+        order_by = sort.order_by
+        if after is not None:
+            where.append(sort.after_condition)
+            params.extend(after)
+    if columns == KEY_COLUMNS:
+        columns = (sort or SORTS["updated"]).key_columns
+
+    sql = f"SELECT {columns} FROM words w {joins}"
+    if where:
+        sql += " WHERE " + " AND ".join(where)
+    sql += f" ORDER BY {order_by}"
+    if limit is not None:
+        sql += " LIMIT ?"
+        params.append(limit)
+    return sql, params
+
+
+def _all_words_query(
+    after: Optional[Cursor], limit: Optional[int], columns: str = WORD_COLUMNS, sort: Optional[str] = None
+) -> Tuple[str, list]:
+    return _word_list_query(
+        "", [], [], "w.updated_at DESC", after, limit, columns, None if sort is None else SORTS[sort]
+    )
+
+
+def _kanji_words_query(
+    kanji: str, after: Optional[Cursor], limit: Optional[int], columns: str = WORD_COLUMNS, sort: Optional[str] = None
+) -> Tuple[str, list]:
+    return _word_list_query(
+        "JOIN word_kanji wk ON w.id = wk.word_id",
+        ["wk.kanji = ?"],
+        [kanji],
+        "w.word",
+        after,
+        limit,
+        columns,
+        None if sort is None else KANJI_SORTS[sort],
+    )
+
+
+def _category_words_query(
+    category: str,
+    after: Optional[Cursor],
+    limit: Optional[int],
+    columns: str = WORD_COLUMNS,
+    descendants: bool = False,
+    sort: Optional[str] = None,
+) -> Tuple[str, list]:
+    """카테고리의 단어 (descendants면 category_closure로 하위 카테고리의 단어까지, 중복 없이)"""
+    if descendants:
+        joins = ""
+        where = [f"w.id IN ({SUBTREE_WORD_IDS_SQL})"]
+    else:
+        joins = "JOIN word_categories wc ON w.id = wc.word_id JOIN categories cat ON cat.id = wc.category_id"
+        where = ["cat.name = ?"]
+    return _word_list_query(
+        joins,
+        where,
+        [category],
+        "w.updated_at DESC" if category == "예문" else "w.word ASC",
+        after,
+        limit,
+        columns,
+        None if sort is None else SORTS[sort],
+    )
+
+
+@dataclass(frozen=True)
+class WordFilter:
+    """GET /words 조건 - ((categories를 mode로 결합) ∩ kanji) − exclude"""
+
+    categories: Tuple[str, ...] = ()
+    mode: str = "and"  # "and": 모든 카테고리에 속한 단어, "or": 하나라도 속한 단어
+    exclude: Tuple[str, ...] = ()
+    kanji: Optional[str] = None
+    descendants: bool = False  # 카테고리마다 하위 카테고리까지 포함
+
+
+def _word_set_query(word_filter: WordFilter) -> Tuple[str, list]:
+    """조건을 만족하는 단어 ID 집합 (compound SELECT)
+
+    카테고리 / 한자마다 인덱스 범위 하나를 읽고 INTERSECT / UNION / EXCEPT로 결합한다.
+    compound SELECT는 왼쪽부터 차례로 계산되므로 포함 조건을 먼저, 제외 조건을 마지막에 둔다.
+    """
+    branch = SUBTREE_WORD_IDS_SQL if word_filter.descendants else CATEGORY_WORD_IDS_SQL
+    operator = " INTERSECT " if word_filter.mode == "and" else " UNION "
+    parts = []
+    params = []
+    if word_filter.categories:
+        parts.append(operator.join([branch] * len(word_filter.categories)))
+        params.extend(word_filter.categories)
+    if word_filter.kanji is not None:
+        parts.append(KANJI_WORD_IDS_SQL)
+        params.append(word_filter.kanji)
+    sql = " INTERSECT ".join(parts) if parts else "SELECT id FROM words"
+    for name in word_filter.exclude:
+        sql += " EXCEPT " + branch
+        params.append(name)
+    return sql, params
+
+
+def _filtered_words_query(
+    word_filter: WordFilter,
+    after: Optional[Cursor],
+    limit: Optional[int],
+    columns: str = WORD_COLUMNS,
+    sort: Optional[str] = None,
+) -> Tuple[str, list]:
+    set_sql, params = _word_set_query(word_filter)
+    # 새 엔드포인트이므로 전체 조회도 페이지와 같은 (updated_at, id) 순서로
+    return _word_list_query(
+        "", [f"w.id IN ({set_sql})"], params, PAGE_ORDER, after, limit, columns, None if sort is None else SORTS[sort]
+    )
+
+
+def _filtered_count_query(word_filter: WordFilter) -> Tuple[str, list]:
+    """조건에 맞는 단어 수 - ID 집합만 세므로 words 행은 읽지 않는다"""
+    set_sql, params = _word_set_query(word_filter)
+    return f"SELECT COUNT(*) FROM ({set_sql})", params
+
+
+def _search_query(query: str, limit: int, offset: int, columns: str = WORD_COLUMNS) -> Optional[Tuple[str, list]]:
+    """검색어를 FTS5 쿼리로 변환 (검색어가 비어 있으면 None)
+
+    공백으로 나눈 단어를 모두 포함(AND)하는 행을 찾는다. 모든 단어가 3글자 이상이면 trigram
+    테이블에서 부분 문자열로, 아니면 unicode61 테이블에서 접두사로 검색한다.
+    """
+    terms = query.split()
+    if not terms:
+        return None
+    quoted = ['"' + term.replace('"', '""') + '"' for term in terms]
+    if all(len(term) >= 3 for term in terms):
+        table, match = "words_fts_trigram", " ".join(quoted)
+    else:
+        table, match = "words_fts", " ".join(term + "*" for term in quoted)
+
+    sql = f"""
+        SELECT {columns}
+        FROM {table}
+        JOIN words w ON w.id = {table}.rowid
+        WHERE {table} MATCH ?
+        ORDER BY {table}.rank
+        LIMIT ? OFFSET ?
+    """
+    return sql, [match, limit, offset]
+
+
+def _kanji_stats_query(sort: str, limit: Optional[int], offset: int) -> Tuple[str, list]:
+    sql = f"""
+        SELECT kanji, word_count, total_wrong, difficulty, last_updated
+        FROM kanji_stats
+        ORDER BY {KANJI_STATS_ORDERS[sort]}
+        LIMIT ? OFFSET ?
+    """
+    return sql, [-1 if limit is None else limit, offset]
+
+
+def _words_by_ids_query(word_ids: List[int]) -> Tuple[str, list]:
+    placeholders = ",".join("?" * len(word_ids))
+    return f"SELECT {WORD_COLUMNS} FROM words w WHERE w.id IN ({placeholders})", list(word_ids)
+
+
+def _changes_query(since: int, limit: int) -> Tuple[str, list]:
+    """since 이후 변경 (seq순, 다음 페이지 확인용으로 limit + 1개)"""
+    sql = f"""
+        SELECT c.seq, c.word_id, c.deleted, {WORD_COLUMNS}
+        FROM word_changes c
+        LEFT JOIN words w ON w.id = c.word_id
+        WHERE c.seq > ?
+        ORDER BY c.seq
+        LIMIT ?
+    """
+    return sql, [since, limit + 1]
+
+
+def _fetch_words(sql: str, params: list) -> List[dict]:
+    """단어 목록 쿼리를 실행해 전체 결과를 반환"""
+    with db_connection(readonly=True) as conn:
+        cursor = conn.execute(sql, params)
+        return [_row_to_word(row) for row in cursor.fetchall()]
+
+
+def _stream_words(sql: str, params: list) -> Iterator[dict]:
+    """단어 목록 쿼리를 실행해 STREAM_BATCH_SIZE 단위로 읽으며 한 행씩 반환"""
+    # StreamingResponse는 매 청크를 스레드풀의 임의 스레드에서 읽어 간다
+    conn = get_db_connection(check_same_thread=False)
+    try:
         cursor = conn.cursor()
+        cursor.execute(sql, params)
+        while True:
+            rows = cursor.fetchmany(STREAM_BATCH_SIZE)
+            if not rows:
+                break
+            for row in rows:
+                yield _row_to_word(row)
+    finally:
+        conn.close()
 
+
+def _fetch_words_json(sql: str, params: list) -> WordsJson:
+    """id 목록 쿼리(id, 정렬 키...)를 실행해 단어 JSON 조각을 이어 붙인 배열 본문을 반환"""
+    with db_connection(readonly=True) as conn:
+        # id 목록과 새로 만드는 조각이 같은 시점의 데이터를 보도록 읽기 트랜잭션 하나로
+        conn.execute("BEGIN")
         try:
-            # 단어 추가
-            cursor.execute(
-                """
-                INSERT INTO words (word, hiragana, meaning, korean, wrong_count, created_at, updated_at)
-                VALUES (?, ?, ?, ?, ?, ?, ?)
-                """,
-                (
-                    word.word,
-                    word.hiragana,
-                    word.meaning,
-                    word.korean,
-                    word.wrong_count,
-                    word.created_at,
-                    word.updated_at,
-                ),
-            )
-            word_id = cursor.lastrowid
+            keys = conn.execute(sql, params).fetchall()
+            fragments = word_fragments.fragments(conn, [row[0] for row in keys])
+        finally:
+            conn.rollback()
+    last = (*keys[-1][1:], keys[-1][0]) if keys else None
+    return ("[" + ",".join(fragments) + "]").encode("utf-8"), len(keys), last
 
-            # 카테고리 추가
-            WordRepository._add_categories_to_word(cursor, word_id, word.category)
 
-            # 한자 인덱스 추가
-            kanji_list = extract_kanji_from_word(word.word)
-            for kanji in kanji_list:
-                cursor.execute(
-                    "INSERT INTO word_kanji (word_id, kanji) VALUES (?, ?)",
-                    (word_id, kanji),
-                )
+def _stream_words_json(sql: str, params: list) -> Iterator[bytes]:
+    """id 목록 쿼리(id, 정렬 키...)를 STREAM_BATCH_SIZE 단위로 읽으며 배치마다 NDJSON 청크 하나를 반환"""
+    conn = get_db_connection(check_same_thread=False)
+    try:
+        conn.execute("BEGIN")
+        cursor = conn.execute(sql, params)
+        while True:
+            rows = cursor.fetchmany(STREAM_BATCH_SIZE)
+            if not rows:
+                break
+            fragments = word_fragments.fragments(conn, [row[0] for row in rows])
+            yield ("\n".join(fragments) + "\n").encode("utf-8")
+    finally:
+        conn.close()
 
-            conn.commit()
-            return {"status": "success"}
 
-        except sqlite3.IntegrityError:
-            conn.rollback()
-            return {"status": "error", "message": "이미 존재하는 단어입니다."}
-        finally:
-            conn.close()
+# 스냅샷 모드의 sort= - 스냅샷에는 정렬 키 컬럼이 없으므로 저장할 때와 같은 sort_keys 함수로 계산
+_SNAPSHOT_SORT_KEYS = {
+    "updated": lambda word, kanji: (word["updated_at"] or "",),
+    "word": lambda word, kanji: (word["word"],),
+    "reading": lambda word, kanji: (reading_key(word["hiragana"]),),
+    "meaning": lambda word, kanji: (meaning_key(word["meaning"]),),
+    "position": lambda word, kanji: (kanji_position(word["word"], kanji),),
+}
+
+
+def _snapshot_cursor(sort: Optional[str], kanji: Optional[str] = None) -> Callable[[dict], Cursor]:
+    """스냅샷 단어 dict -> 커서 (SQLite 경로의 (*정렬 키, id)와 같은 값)"""
+    if sort is None:
+        return lambda word: (word["updated_at"], word["id"])
+    key_of = _SNAPSHOT_SORT_KEYS[sort]
+    return lambda word: (*key_of(word, kanji), word["id"])
+
+
+def _snapshot_words(
+    iterate: Callable[[Optional[Cursor], Optional[int]], Iterator[dict]],
+    after: Optional[Cursor],
+    limit: Optional[int],
+    sort: Optional[str],
+    kanji: Optional[str] = None,
+) -> Iterator[dict]:
+    """스냅샷 목록 - 기본 순서는 스냅샷 행 순서 그대로, sort=면 대상 전체의 정렬 키를 계산해 정렬
+
+    스냅샷에는 정렬별 인덱스가 없으므로 매번 정렬한다. (결과는 응답 캐시가 보관)
+    """
+    if sort is None:
+        return iterate(after, limit)
+    cursor_of = _snapshot_cursor(sort, kanji)
+    descending = KANJI_SORTS[sort].descending
+    keyed = sorted(
+        ((cursor_of(word), word) for word in iterate(None, None)), key=lambda item: item[0], reverse=descending
+    )
+    if after is not None:
+        after = tuple(after)
+        keyed = [item for item in keyed if (item[0] < after if descending else item[0] > after)]
+    return (word for _, word in keyed[:limit])
+
+
+def _words_to_json(words: Iterable[dict], cursor_of: Callable[[dict], Cursor] = _snapshot_cursor(None)) -> WordsJson:
+    """dict 단어 목록(스냅샷 모드)을 _fetch_words_json과 같은 형태로"""
+    words = list(words)
+    last = cursor_of(words[-1]) if words else None
+    return ("[" + ",".join(map(dump_word, words)) + "]").encode("utf-8"), len(words), last
+
+
+def _words_to_ndjson(words: Iterator[dict]) -> Iterator[bytes]:
+    """dict 단어 스트림(스냅샷 모드)을 STREAM_BATCH_SIZE개씩 NDJSON 청크로"""
+    while True:
+        batch = list(itertools.islice(words, STREAM_BATCH_SIZE))
+        if not batch:
+            break
+        yield ("\n".join(map(dump_word, batch)) + "\n").encode("utf-8")
+
+
+# mode -> (SQLite에서 읽을 컬럼, 실행 함수) - 조각 응답(json, ndjson)은 정렬된 id와 커서용 키만 읽는다
+_SQL_OUTPUTS = {
+    "list": (WORD_COLUMNS, _fetch_words),
+    "stream": (WORD_COLUMNS, _stream_words),
+    "json": (KEY_COLUMNS, _fetch_words_json),
+    "ndjson": (KEY_COLUMNS, _stream_words_json),
+}
+
+
+def _run(
+    mode: ListMode,
+    query: Callable[[str], Optional[Tuple[str, list]]],
+    snapshot_words: Optional[Callable[[Snapshot], Iterator[dict]]] = None,
+    cursor_of: Callable[[dict], Cursor] = _snapshot_cursor(None),
+) -> WordList:
+    """단어 목록 조회 하나를 mode 형태로 실행
+
+    - query(columns): 읽을 컬럼에 맞춘 SQLite 쿼리 (sql, params), None이면 빈 결과 (빈 검색어 등)
+    - snapshot_words(snap): 스냅샷 서빙 모드에서 같은 목록의 dict 단어 (None이면 그 모드에서도 SQLite에서)
+    - cursor_of: json 모드에서 스냅샷 단어의 다음 페이지 커서
+    """
+    snap = serving_snapshot() if snapshot_words is not None else None
+    if snap is not None:
+        words = snapshot_words(snap)
+    else:
+        columns, execute = _SQL_OUTPUTS[mode]
+        built = query(columns)
+        if built is not None:
+            return execute(*built)
+        words = iter(())
+    if mode == "list":
+        return list(words)
+    if mode == "json":
+        return _words_to_json(words, cursor_of)
+    if mode == "ndjson":
+        return _words_to_ndjson(words)
+    return words
+
+
+class WordRepository:
+    """단어 데이터베이스 접근 계층"""
 
     @staticmethod
-    def get_all_words() -> List[dict]:
-        """모든 단어 조회 (최신순)"""
-        conn = get_db_connection()
-        cursor = conn.cursor()
+    def add_word(word: Word) -> dict:
+        """새로운 단어 추가"""
+        with db_connection() as conn:
+            cursor = conn.cursor()
 
-        cursor.execute(
-            """
-            SELECT id, word, hiragana, meaning, korean, wrong_count, created_at, updated_at
-            FROM words
-            ORDER BY updated_at DESC
-            """
-        )
+            try:
+                # 단어 추가
+                cursor.execute(
+                    """
+                    INSERT INTO words (
+                        word, hiragana, meaning, korean, wrong_count, created_at, updated_at, reading_key, meaning_key
+                    )
+                    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+                    """,
+                    (
+                        word.word,
+                        word.hiragana,
+                        word.meaning,
+                        word.korean,
+                        word.wrong_count,
+                        word.created_at,
+                        word.updated_at,
+                        reading_key(word.hiragana),
+                        meaning_key(word.meaning),
+                    ),
+                )
+                word_id = cursor.lastrowid
 
-        rows = cursor.fetchall()
-        result = []
+                # 카테고리 추가
+                WordRepository._add_categories_to_word(cursor, word_id, word.category)
 
-        for row in rows:
-            word_dict = dict(row)
-            # 카테고리 조회
-            cursor.execute(
-                """
-                SELECT c.name FROM categories c
-                JOIN word_categories wc ON c.id = wc.category_id
-                WHERE wc.word_id = ?
-                """,
-                (row["id"],),
-            )
-            categories = [cat_row["name"] for cat_row in cursor.fetchall()]
-            word_dict["category"] = categories
-            result.append(word_dict)
+                # 한자 인덱스 추가
+                kanji_list = extract_kanji_from_word(word.word)
+                for kanji in kanji_list:
+                    cursor.execute(
+                        "INSERT INTO word_kanji (word_id, kanji, position) VALUES (?, ?, ?)",
+                        (word_id, kanji, kanji_position(word.word, kanji)),
+                    )
 
-        conn.close()
-        return result
+                conn.commit()
+                return {"status": "success"}
+
+            except sqlite3.IntegrityError:
+                conn.rollback()
+                return {"status": "error", "message": "이미 존재하는 단어입니다."}
 
     @staticmethod
-    def get_words_by_kanji(kanji: str) -> List[dict]:
-        """한자로 단어 검색"""
-        conn = get_db_connection()
-        cursor = conn.cursor()
+    def all_words(
+        after: Optional[Cursor] = None, limit: Optional[int] = None, sort: Optional[str] = None, mode: ListMode = "list"
+    ) -> WordList:
+        """모든 단어 조회 (기본 최신순, sort는 SORTS의 키)"""
+        return _run(
+            mode,
+            lambda columns: _all_words_query(after, limit, columns, sort),
+            lambda snap: _snapshot_words(snap.iter_all_words, after, limit, sort),
+            _snapshot_cursor(sort),
+        )
 
-        cursor.execute(
-            """
-            SELECT DISTINCT w.id, w.word, w.hiragana, w.meaning, w.korean, w.wrong_count, w.created_at, w.updated_at
-            FROM words w
-            JOIN word_kanji wk ON w.id = wk.word_id
-            WHERE wk.kanji = ?
-            ORDER BY w.word
-            """,
-            (kanji,),
+    @staticmethod
+    def words_by_kanji(
+        kanji: str,
+        after: Optional[Cursor] = None,
+        limit: Optional[int] = None,
+        sort: Optional[str] = None,
+        mode: ListMode = "list",
+    ) -> WordList:
+        """한자로 단어 검색 (sort는 KANJI_SORTS의 키)"""
+        return _run(
+            mode,
+            lambda columns: _kanji_words_query(kanji, after, limit, columns, sort),
+            lambda snap: _snapshot_words(partial(snap.iter_words_by_kanji, kanji), after, limit, sort, kanji),
+            _snapshot_cursor(sort, kanji),
         )
 
-        rows = cursor.fetchall()
-        result = []
+    @staticmethod
+    def search_words(query: str, limit: int = 50, offset: int = 0, mode: ListMode = "list") -> WordList:
+        """단어/히라가나/뜻/한국어 발음 전문 검색 (관련도순)"""
+        return _run(mode, lambda columns: _search_query(query, limit, offset, columns))
 
-        for row in rows:
-            word_dict = dict(row)
-            cursor.execute(
-                """
-                SELECT c.name FROM categories c
-                JOIN word_categories wc ON c.id = wc.category_id
-                WHERE wc.word_id = ?
-                """,
-                (row["id"],),
-            )
-            categories = [cat_row["name"] for cat_row in cursor.fetchall()]
-            word_dict["category"] = categories
-            result.append(word_dict)
+    @staticmethod
+    def get_data_version() -> str:
+        """응답 캐시 / ETag용 데이터 버전 (다른 프로세스가 커밋한 변경도 반영)
 
-        conn.close()
-        return result
+        스냅샷 서빙 모드에서는 스냅샷 버전에, 함께 조회하는 DB(검색 등)가 있으면 그 버전을 덧붙인다.
+        """
+        snap = serving_snapshot()
+        if snap is not None and not db_exists():
+            return snap.version
+        with db_connection(readonly=True) as conn:
+            token = read_data_version(conn).token
+        return token if snap is None else f"{snap.version}-{token}"
 
     @staticmethod
     def get_all_kanji() -> List[str]:
         """모든 한자 리스트 조회"""
-        conn = get_db_connection()
-        cursor = conn.cursor()
+        snap = serving_snapshot()
+        if snap is not None:
+            return snap.all_kanji()
+        with db_connection(readonly=True) as conn:
+            cursor = conn.execute(ALL_KANJI_SQL)
+            return [row["kanji"] for row in cursor.fetchall()]
 
-        cursor.execute("SELECT DISTINCT kanji FROM word_kanji ORDER BY kanji")
-        result = [row["kanji"] for row in cursor.fetchall()]
-        conn.close()
-        return result
+    @staticmethod
+    def get_kanji_stats(sort: str = "count", limit: Optional[int] = None, offset: int = 0) -> List[dict]:
+        """한자별 단어 수 / 오답 수 합계 / 난이도(단어당 평균 오답 수) / 마지막 수정 시각 조회"""
+        with db_connection(readonly=True) as conn:
+            cursor = conn.execute(*_kanji_stats_query(sort, limit, offset))
+            return [dict(row) for row in cursor.fetchall()]
+
+    @staticmethod
+    def get_random_kanji(weighted: bool = False, category: Optional[str] = None) -> Optional[str]:
+        """랜덤 한자 하나 (weighted면 오답이 많은 단어의 한자일수록 자주, 없으면 None)"""
+        with db_connection(readonly=True) as conn:
+            random_index.sync(conn)
+        return random_index.sample_kanji(weighted, category)
+
+    @staticmethod
+    def get_random_words(n: int = 1, weighted: bool = False, category: Optional[str] = None) -> List[dict]:
+        """서로 다른 랜덤 단어 최대 n개 (weighted면 wrong_count + 1에 비례)"""
+        with db_connection(readonly=True) as conn:
+            random_index.sync(conn)
+        word_ids = random_index.sample_words(n, weighted, category)
+        if not word_ids:
+            return []
+        words = {word["id"]: word for word in _fetch_words(*_words_by_ids_query(word_ids))}
+        # 뽑힌 순서 유지 (그 사이 삭제된 단어는 제외)
+        return [words[word_id] for word_id in word_ids if word_id in words]
+
+    @staticmethod
+    def get_hot_words(limit: int = 20) -> List[dict]:
+        """조회 수가 많은 단어 (기록된 조회 수 + 아직 기록하지 않은 버퍼) - 단어마다 view_count 포함"""
+        with db_connection(readonly=True) as conn:
+            counts = view_counter.hot_words(conn, limit)
+        if not counts:
+            return []
+        words = {word["id"]: word for word in _fetch_words(*_words_by_ids_query([word_id for word_id, _ in counts]))}
+        # 조회 수 순서 유지 (그 사이 삭제된 단어는 제외)
+        return [{**words[word_id], "view_count": count} for word_id, count in counts if word_id in words]
+
+    @staticmethod
+    def flush_view_counts() -> int:
+        """버퍼에 모인 조회 수를 word_views에 기록, 기록한 단어 수 반환"""
+        with db_connection() as conn:
+            return view_counter.flush(conn)
 
     @staticmethod
     def get_all_categories() -> List[str]:
         """모든 카테고리 조회"""
-        conn = get_db_connection()
-        cursor = conn.cursor()
+        snap = serving_snapshot()
+        if snap is not None:
+            return snap.all_categories()
+        with db_connection(readonly=True) as conn:
+            cursor = conn.execute(ALL_CATEGORIES_SQL)
+            return [row["name"] for row in cursor.fetchall()]
 
-        cursor.execute("SELECT name FROM categories ORDER BY name")
-        result = [row["name"] for row in cursor.fetchall()]
-        conn.close()
-        return result
+    @staticmethod
+    def get_category_tree() -> List[dict]:
+        """카테고리 계층 전체 (최상위부터 이름순) - 노드마다 {"name", "word_count"(직접 속한 단어 수), "children"}"""
+        with db_connection(readonly=True) as conn:
+            rows = conn.execute(CATEGORY_TREE_SQL).fetchall()
+        nodes = {row["id"]: {"name": row["name"], "word_count": row["word_count"], "children": []} for row in rows}
+        roots = []
+        for row in rows:
+            parent = nodes.get(row["parent_id"])
+            (roots if parent is None else parent["children"]).append(nodes[row["id"]])
+        return roots
 
     @staticmethod
-    def get_words_by_category(category: str) -> List[dict]:
-        """카테고리로 단어 검색"""
-        conn = get_db_connection()
-        cursor = conn.cursor()
+    def get_category_children(category: str) -> Optional[dict]:
+        """카테고리의 경로(최상위 -> 부모)와 바로 아래 하위 카테고리 (없는 카테고리면 None)
 
-        # 카테고리 ID 조회
-        cursor.execute("SELECT id FROM categories WHERE name = ?", (category,))
-        cat_row = cursor.fetchone()
+        하위 카테고리마다 그 하위 트리 전체의 단어 수(중복 없이)와 하위 카테고리 수를 함께 반환한다.
+        """
+        with db_connection(readonly=True) as conn:
+            row = conn.execute(CATEGORY_ID_SQL, (category,)).fetchone()
+            if row is None:
+                return None
+            path = conn.execute(CATEGORY_PATH_SQL, (row["id"],)).fetchall()
+            children = conn.execute(CATEGORY_CHILDREN_SQL, (row["id"],)).fetchall()
+        return {"category": category, "path": [r["name"] for r in path], "children": [dict(r) for r in children]}
 
-        if not cat_row:
-            conn.close()
-            return []
+    @staticmethod
+    def words_by_category(
+        category: str,
+        after: Optional[Cursor] = None,
+        limit: Optional[int] = None,
+        descendants: bool = False,
+        sort: Optional[str] = None,
+        mode: ListMode = "list",
+    ) -> WordList:
+        """카테고리로 단어 검색 (descendants면 하위 카테고리의 단어 포함)"""
+        # 스냅샷에는 카테고리 계층이 없으므로 하위 트리 조회는 SQLite에서
+        return _run(
+            mode,
+            lambda columns: _category_words_query(category, after, limit, columns, descendants, sort),
+            None if descendants else lambda snap: _snapshot_words(
+                partial(snap.iter_words_by_category, category), after, limit, sort
+            ),
+            _snapshot_cursor(sort),
+        )
 
-        category_id = cat_row["id"]
+    @staticmethod
+    def filtered_words(
+        word_filter: WordFilter,
+        after: Optional[Cursor] = None,
+        limit: Optional[int] = None,
+        sort: Optional[str] = None,
+        mode: ListMode = "list",
+    ) -> WordList:
+        """카테고리 집합 연산 / 한자 조건으로 단어 검색 (기본 최신순)"""
+        return _run(mode, lambda columns: _filtered_words_query(word_filter, after, limit, columns, sort))
 
-        # 해당 카테고리의 단어 조회
-        sort_key = "updated_at DESC" if category == "예문" else "word ASC"
-        cursor.execute(
-            f"""
-            SELECT w.id, w.word, w.hiragana, w.meaning, w.korean, w.wrong_count, w.created_at, w.updated_at
-            FROM words w
-            JOIN word_categories wc ON w.id = wc.word_id
-            WHERE wc.category_id = ?
-            ORDER BY {sort_key}
-            """,
-            (category_id,),
-        )
+    @staticmethod
+    def count_filtered_words(word_filter: WordFilter) -> int:
+        """조건에 맞는 단어 수"""
+        with db_connection(readonly=True) as conn:
+            return conn.execute(*_filtered_count_query(word_filter)).fetchone()[0]
 
-        rows = cursor.fetchall()
-        result = []
+    @staticmethod
+    def get_changes(since: Optional[int] = None, limit: int = 1000) -> dict:
+        """since(seq) 이후 추가/수정된 단어와 삭제된 단어 ID
 
-        for row in rows:
-            word_dict = dict(row)
-            # 카테고리 조회
+        - seq: 다음 요청에 since로 넘길 값 (has_more면 이번 페이지의 마지막 seq)
+        - reset: since 이후의 tombstone이 이미 정리되어 증분 동기화가 불가능 - 전체를 다시 받아야 함
+        since를 생략하면 변경 목록 없이 현재 seq만 반환한다.
+        """
+        with db_connection(readonly=True) as conn:
+            # 현재 seq, 정리 기준, 변경 목록을 같은 시점에서 읽도록 읽기 트랜잭션 하나로
+            conn.execute("BEGIN")
+            row = conn.execute("SELECT seq FROM sqlite_sequence WHERE name = 'word_changes'").fetchone()
+            latest = row["seq"] if row else 0
+            row = conn.execute("SELECT value FROM sync_state WHERE name = 'tombstone_horizon'").fetchone()
+            horizon = row["value"] if row else 0
+
+            result = {"seq": latest, "reset": False, "has_more": False, "upserts": [], "deleted": []}
+            if since is None:
+                return result
+            if since < horizon:
+                result["reset"] = True
+                return result
+
+            rows = conn.execute(*_changes_query(since, limit)).fetchall()
+            if len(rows) > limit:
+                rows = rows[:limit]
+                result["has_more"] = True
+                result["seq"] = rows[-1]["seq"]
+            for row in rows:
+                if row["deleted"] or row["id"] is None:
+                    result["deleted"].append(row["word_id"])
+                else:
+                    word = _row_to_word(row)
+                    del word["seq"], word["word_id"], word["deleted"]
+                    result["upserts"].append(word)
+            return result
+
+    @staticmethod
+    def update_word(word_id: int, updated_word: WordUpdate) -> dict:
+        """단어 정보 수정 (전체 필드, 실제로 바뀐 컬럼 / 카테고리 / 한자만 기록)"""
+        fields = {
+            "word": updated_word.word,
+            "hiragana": updated_word.hiragana,
+            "meaning": updated_word.meaning,
+            "korean": updated_word.korean,
+            "wrong_count": updated_word.wrong_count or 0,
+            "category": updated_word.category,
+        }
+        with db_connection() as conn:
+            cursor = conn.cursor()
+
+            try:
+                changed = WordRepository._apply_word_changes(
+                    cursor, word_id, fields, updated_at=datetime.now(timezone.utc)
+                )
+                if changed is None:
+                    return {"status": "error", "message": "해당 단어를 찾을 수 없습니다."}
+
+                conn.commit()
+                return {"status": "success", "message": f"'{updated_word.word}' 단어 정보가 수정되었습니다."}
+
+            except sqlite3.IntegrityError:
+                conn.rollback()
+                return {"status": "error", "message": "중복된 단어입니다."}
+
+    @staticmethod
+    def patch_word(word_id: int, patch: WordPatch) -> dict:
+        """보낸 필드만 수정 (wrong_count_delta는 wrong_count = wrong_count + ?로 원자적으로 증감)
+
+        단어 / 히라가나 / 뜻 / 한국어 발음 / 카테고리가 바뀐 경우에만 updated_at을 갱신한다.
+        (퀴즈에서 오답 수만 바꿀 때는 최신순 목록 순서와 updated_at 인덱스를 건드리지 않음)
+        실패하면 reason이 "not_found" 또는 "duplicate"
+        """
+        fields = patch.model_dump(exclude_unset=True)
+        delta = fields.pop("wrong_count_delta", None)
+        updated_at = fields.pop("updated_at", None)
+        with db_connection() as conn:
+            cursor = conn.cursor()
+
+            try:
+                changed = WordRepository._apply_word_changes(
+                    cursor, word_id, fields, delta, updated_at, touch_on_count=False
+                )
+                if changed is None:
+                    return {"status": "error", "reason": "not_found", "message": "해당 단어를 찾을 수 없습니다."}
+
+                if changed:
+                    conn.commit()
+                cursor.execute(f"SELECT {WORD_COLUMNS} FROM words w WHERE w.id = ?", (word_id,))
+                return {"status": "success", "changed": changed, "word": _row_to_word(cursor.fetchone())}
+
+            except sqlite3.IntegrityError:
+                conn.rollback()
+                return {"status": "error", "reason": "duplicate", "message": "중복된 단어입니다."}
+
+    @staticmethod
+    def delete_word(word_id: int) -> dict:
+        """단어 삭제"""
+        with db_connection() as conn:
+            cursor = conn.cursor()
+
+            cursor.execute("SELECT word FROM words WHERE id = ?", (word_id,))
+            row = cursor.fetchone()
+
+            if not row:
+                return {"status": "error", "message": "해당 단어를 찾을 수 없습니다."}
+
+            word_name = row["word"]
+
+            # 카스케이드 삭제 (연결마다 foreign_keys = ON 이므로 자동 삭제됨)
+            cursor.execute("DELETE FROM words WHERE id = ?", (word_id,))
+            WordRepository._compact_changes(cursor)
+            conn.commit()
+
+        return {"status": "success", "message": f"'{word_name}' 단어가 삭제되었습니다."}
+
+    @staticmethod
+    def move_category(category: str, parent: Optional[str]) -> dict:
+        """카테고리를 parent 아래로 이동 (None이면 최상위로), 없는 parent는 새로 만든다
+
+        category_closure는 트리거가 옮긴 하위 트리만큼만 갱신한다. (migrations.py 6단계)
+        실패하면 reason이 "not_found" 또는 "cycle"
+        """
+        with db_connection() as conn:
+            cursor = conn.cursor()
+
+            cursor.execute("SELECT id, parent_id FROM categories WHERE name = ?", (category,))
+            row = cursor.fetchone()
+            if row is None:
+                return {"status": "error", "reason": "not_found", "message": "해당 카테고리를 찾을 수 없습니다."}
+
+            parent_id = None
+            if parent is not None:
+                cursor.execute("SELECT id FROM categories WHERE name = ?", (parent,))
+                parent_row = cursor.fetchone()
+                if parent_row is None:
+                    cursor.execute("INSERT INTO categories (name) VALUES (?)", (parent,))
+                    parent_id = cursor.lastrowid
+                else:
+                    parent_id = parent_row["id"]
+                # 자기 자신 또는 자기 하위 카테고리 아래로는 옮길 수 없다
+                cursor.execute(
+                    "SELECT 1 FROM category_closure WHERE ancestor_id = ? AND descendant_id = ?",
+                    (row["id"], parent_id),
+                )
+                if cursor.fetchone():
+                    conn.rollback()
+                    return {
+                        "status": "error",
+                        "reason": "cycle",
+                        "message": f"'{parent}'은(는) '{category}'의 하위 카테고리입니다.",
+                    }
+
+            if parent_id != row["parent_id"]:
+                cursor.execute("UPDATE categories SET parent_id = ? WHERE id = ?", (parent_id, row["id"]))
+            conn.commit()
+
+        target = "최상위" if parent is None else f"'{parent}' 아래"
+        return {"status": "success", "message": f"'{category}' 카테고리를 {target}로 옮겼습니다."}
+
+    @staticmethod
+    def get_due_reviews(n: int = 20) -> List[dict]:
+        """기한이 지난 단어를 오래된 순서로 최대 n개 꺼내 LEASE_SECONDS 동안 임대 (review.py)
+
+        단어마다 복습 상태(review: ease, interval_days, repetitions, due_at, leased_until)를 함께 반환한다.
+        """
+        now = int(time.time())
+        leased_until = now + LEASE_SECONDS
+        with db_connection() as conn:
+            cursor = conn.cursor()
+            # 다른 프로세스가 같은 단어를 꺼내지 않도록 읽기부터 쓰기 잠금 안에서
+            cursor.execute("BEGIN IMMEDIATE")
+            cursor.execute(DUE_REVIEWS_SQL, (now, n))
+            states = cursor.fetchall()
+            if not states:
+                conn.rollback()
+                return []
+            word_ids = [row["word_id"] for row in states]
+            cursor.executemany(
+                "UPDATE review_state SET due_at = ? WHERE word_id = ?",
+                [(leased_until, word_id) for word_id in word_ids],
+            )
+            cursor.execute(*_words_by_ids_query(word_ids))
+            words = {row["id"]: _row_to_word(row) for row in cursor.fetchall()}
+            conn.commit()
+
+        return [
+            {
+                **words[row["word_id"]],
+                "review": {
+                    "ease": row["ease"],
+                    "interval_days": row["interval_days"],
+                    "repetitions": row["repetitions"],
+                    "due_at": to_iso(row["due_at"]),
+                    "leased_until": to_iso(leased_until),
+                },
+            }
+            for row in states
+        ]
+
+    @staticmethod
+    def answer_reviews(answers: List[Tuple[int, int]]) -> dict:
+        """(단어 ID, 점수 0~5) 목록을 한 트랜잭션으로 채점 - SM-2로 다음 복습 시각을 정한다 (review.py)
+
+        같은 단어가 여러 번 있으면 순서대로 반영하고, PASS_GRADE 미만이면 wrong_count를 1씩 올린다.
+        (오답 수만 바뀌므로 updated_at은 그대로)
+        없는 단어가 하나라도 있으면 아무것도 반영하지 않으며 reason이 "not_found"
+        """
+        now = int(time.time())
+        word_ids = list(dict.fromkeys(word_id for word_id, _ in answers))
+        if not word_ids:
+            return {"status": "success", "reviewed": 0, "results": []}
+        with db_connection() as conn:
+            cursor = conn.cursor()
+            placeholders = ",".join("?" * len(word_ids))
             cursor.execute(
+                f"SELECT word_id, ease, interval_days, repetitions FROM review_state WHERE word_id IN ({placeholders})",
+                word_ids,
+            )
+            states = {
+                row["word_id"]: ReviewState(row["ease"], row["interval_days"], row["repetitions"])
+                for row in cursor.fetchall()
+            }
+            missing = [word_id for word_id in word_ids if word_id not in states]
+            if missing:
+                return {
+                    "status": "error",
+                    "reason": "not_found",
+                    "message": f"해당 단어를 찾을 수 없습니다: {', '.join(map(str, missing))}",
+                }
+
+            wrong = Counter()
+            for word_id, grade in answers:
+                states[word_id] = schedule(states[word_id], grade)
+                if grade < PASS_GRADE:
+                    wrong[word_id] += 1
+            due = {word_id: now + round(state.interval_days * DAY_SECONDS) for word_id, state in states.items()}
+
+            cursor.executemany(
                 """
-                SELECT c.name FROM categories c
-                JOIN word_categories wc ON c.id = wc.category_id
-                WHERE wc.word_id = ?
+                UPDATE review_state SET ease = ?, interval_days = ?, repetitions = ?, due_at = ?, last_reviewed = ?
+                WHERE word_id = ?
                 """,
-                (row["id"],),
+                [
+                    (state.ease, state.interval_days, state.repetitions, due[word_id], now, word_id)
+                    for word_id, state in states.items()
+                ],
             )
-            categories = [cat_row["name"] for cat_row in cursor.fetchall()]
-            word_dict["category"] = categories
-            result.append(word_dict)
+            if wrong:
+                cursor.executemany(
+                    "UPDATE words SET wrong_count = COALESCE(wrong_count, 0) + ? WHERE id = ?",
+                    [(count, word_id) for word_id, count in wrong.items()],
+                )
+            conn.commit()
 
-        conn.close()
-        return result
+        return {
+            "status": "success",
+            "reviewed": len(answers),
+            "results": [
+                {
+                    "word_id": word_id,
+                    "ease": state.ease,
+                    "interval_days": state.interval_days,
+                    "repetitions": state.repetitions,
+                    "due_at": to_iso(due[word_id]),
+                }
+                for word_id, state in states.items()
+            ],
+        }
 
     @staticmethod
-    def update_word(word_id: int, updated_word: WordUpdate) -> dict:
-        """단어 정보 수정"""
-        conn = get_db_connection()
-        cursor = conn.cursor()
+    def add_words_bulk(words: List[Word]) -> List[Optional[int]]:
+        """여러 단어를 하나의 트랜잭션으로 추가
 
-        try:
-            # 단어 존재 여부 확인
-            cursor.execute("SELECT id FROM words WHERE id = ?", (word_id,))
-            if not cursor.fetchone():
-                return {"status": "error", "message": "해당 단어를 찾을 수 없습니다."}
+        입력 순서대로 새 단어 ID를 반환하며, 이미 존재하는(또는 입력 안에서 중복된) 단어는 None
+        """
+        with db_connection() as conn:
+            cursor = conn.cursor()
+            word_ids = WordRepository._insert_words(
+                cursor,
+                [
+                    (w.word, w.hiragana, w.meaning, w.korean, w.wrong_count, w.created_at, w.updated_at, w.category)
+                    for w in words
+                ],
+                WordRepository._load_category_ids(cursor),
+            )
+            conn.commit()
+            return word_ids
+
+    @staticmethod
+    def _insert_words(cursor, rows: List[tuple], category_cache: dict) -> List[Optional[int]]:
+        """단어 일괄 삽입 (헬퍼 메서드, 커밋은 호출하는 쪽에서)
+
+        rows: (word, hiragana, meaning, korean, wrong_count, created_at, updated_at, categories) 튜플 목록
+        category_cache: 카테고리 이름 -> ID, 새로 만든 카테고리도 여기에 추가된다
+        정렬 키(sort_keys.py)도 함께 저장한다.
+        """
+        word_ids = []
+        category_rows = []
+        kanji_rows = []
+        kanji_lists = extract_kanji_bulk(row[0] for row in rows)
 
-            # 단어 정보 수정
-            update_time = datetime.now(timezone.utc)
+        for (*columns, categories), kanji_list in zip(rows, kanji_lists):
             cursor.execute(
                 """
-                UPDATE words
-                SET word = ?, hiragana = ?, meaning = ?, korean = ?, wrong_count = ?, updated_at = ?
-                WHERE id = ?
+                INSERT OR IGNORE INTO words (
+                    word, hiragana, meaning, korean, wrong_count, created_at, updated_at, reading_key, meaning_key
+                )
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
                 """,
-                (
-                    updated_word.word,
-                    updated_word.hiragana,
-                    updated_word.meaning,
-                    updated_word.korean,
-                    updated_word.wrong_count or 0,
-                    update_time,
-                    word_id,
-                ),
+                (*columns, reading_key(columns[1]), meaning_key(columns[2])),
             )
+            if cursor.rowcount == 0:
+                word_ids.append(None)
+                continue
 
-            # 기존 카테고리 제거
-            cursor.execute("DELETE FROM word_categories WHERE word_id = ?", (word_id,))
+            word_id = cursor.lastrowid
+            word_ids.append(word_id)
+            for category_id in WordRepository._resolve_category_ids(cursor, categories, category_cache):
+                category_rows.append((word_id, category_id))
+            for kanji in kanji_list:
+                kanji_rows.append((word_id, kanji, kanji_position(columns[0], kanji)))
 
-            # 새로운 카테고리 추가
-            WordRepository._add_categories_to_word(cursor, word_id, updated_word.category)
+        cursor.executemany(
+            "INSERT OR IGNORE INTO word_categories (word_id, category_id) VALUES (?, ?)",
+            category_rows,
+        )
+        cursor.executemany(
+            "INSERT OR IGNORE INTO word_kanji (word_id, kanji, position) VALUES (?, ?, ?)",
+            kanji_rows,
+        )
+        return word_ids
 
-            # 기존 한자 인덱스 제거
-            cursor.execute("DELETE FROM word_kanji WHERE word_id = ?", (word_id,))
+    @staticmethod
+    def _apply_word_changes(
+        cursor,
+        word_id: int,
+        fields: dict,
+        wrong_count_delta: Optional[int] = None,
+        updated_at: Optional[datetime] = None,
+        touch_on_count: bool = True,
+    ) -> Optional[List[str]]:
+        """현재 값과 비교해 바뀐 것만 수정 (헬퍼 메서드, 커밋은 호출하는 쪽에서)
 
-            # 새로운 한자 인덱스 추가
-            kanji_list = extract_kanji_from_word(updated_word.word)
-            for kanji in kanji_list:
-                cursor.execute(
-                    "INSERT INTO word_kanji (word_id, kanji) VALUES (?, ?)",
-                    (word_id, kanji),
-                )
+        fields: words 컬럼(word, hiragana, meaning, korean, wrong_count)과 category 중 바꿀 값
+        카테고리와 한자 인덱스는 집합 차이만 추가/삭제한다.
+        바뀐 필드 이름 목록을 반환 (단어가 없으면 None)
+        """
+        cursor.execute(
+            "SELECT word, hiragana, meaning, korean, wrong_count FROM words WHERE id = ?",
+            (word_id,),
+        )
+        current = cursor.fetchone()
+        if current is None:
+            return None
 
-            conn.commit()
-            return {"status": "success", "message": f"'{updated_word.word}' 단어 정보가 수정되었습니다."}
+        assignments = []
+        params = []
+        changed = []
+        for column in ("word", "hiragana", "meaning", "korean", "wrong_count"):
+            if column in fields and fields[column] != current[column]:
+                assignments.append(f"{column} = ?")
+                params.append(fields[column])
+                changed.append(column)
+        # 정렬 키는 응답 필드가 아니므로 changed에는 넣지 않는다
+        if "hiragana" in changed:
+            assignments.append("reading_key = ?")
+            params.append(reading_key(fields["hiragana"]))
+        if "meaning" in changed:
+            assignments.append("meaning_key = ?")
+            params.append(meaning_key(fields["meaning"]))
+        if wrong_count_delta:
+            assignments.append("wrong_count = MAX(COALESCE(wrong_count, 0) + ?, 0)")
+            params.append(wrong_count_delta)
+            changed.append("wrong_count")
 
-        except sqlite3.IntegrityError:
-            conn.rollback()
-            return {"status": "error", "message": "중복된 단어입니다."}
-        finally:
-            conn.close()
+        if "category" in fields and WordRepository._sync_word_categories(cursor, word_id, fields["category"]):
+            changed.append("category")
+
+        content_changed = any(name != "wrong_count" for name in changed)
+        if changed and (content_changed or touch_on_count):
+            assignments.append("updated_at = ?")
+            params.append(updated_at or datetime.now(timezone.utc))
+        if assignments:
+            cursor.execute(f"UPDATE words SET {', '.join(assignments)} WHERE id = ?", (*params, word_id))
+        if "word" in changed:
+            WordRepository._sync_word_kanji(cursor, word_id, fields["word"])
+        return changed
 
     @staticmethod
-    def delete_word(word_id: int) -> dict:
-        """단어 삭제"""
-        conn = get_db_connection()
-        cursor = conn.cursor()
+    def _sync_word_categories(cursor, word_id: int, categories: List[str]) -> bool:
+        """단어의 카테고리를 categories로 맞춤 - 빠진 것만 삭제, 새것만 추가 (헬퍼 메서드), 바뀌었으면 True"""
+        cursor.execute(
+            """
+            SELECT c.id, c.name FROM word_categories wc JOIN categories c ON c.id = wc.category_id
+            WHERE wc.word_id = ?
+            """,
+            (word_id,),
+        )
+        current = {row["name"]: row["id"] for row in cursor.fetchall()}
+        removed = [current[name] for name in current if name not in categories]
+        added = [name for name in categories if name not in current]
+
+        if removed:
+            cursor.executemany(
+                "DELETE FROM word_categories WHERE word_id = ? AND category_id = ?",
+                [(word_id, category_id) for category_id in removed],
+            )
+        if added:
+            placeholders = ",".join("?" * len(added))
+            cursor.execute(f"SELECT id, name FROM categories WHERE name IN ({placeholders})", added)
+            category_cache = {row["name"]: row["id"] for row in cursor.fetchall()}
+            cursor.executemany(
+                "INSERT OR IGNORE INTO word_categories (word_id, category_id) VALUES (?, ?)",
+                [
+                    (word_id, category_id)
+                    for category_id in WordRepository._resolve_category_ids(cursor, added, category_cache)
+                ],
+            )
+        return bool(removed or added)
 
-        cursor.execute("SELECT word FROM words WHERE id = ?", (word_id,))
-        row = cursor.fetchone()
+    @staticmethod
+    def _sync_word_kanji(cursor, word_id: int, word: str):
+        """한자 인덱스를 word의 한자로 맞춤 - 빠진 것만 삭제, 새것만 추가, 남은 한자는 위치만 갱신 (헬퍼 메서드)"""
+        cursor.execute("SELECT kanji, position FROM word_kanji WHERE word_id = ?", (word_id,))
+        current = {row["kanji"]: row["position"] for row in cursor.fetchall()}
+        kanji_list = extract_kanji_from_word(word)
+        positions = {kanji: kanji_position(word, kanji) for kanji in kanji_list}
+        cursor.executemany(
+            "DELETE FROM word_kanji WHERE word_id = ? AND kanji = ?",
+            [(word_id, kanji) for kanji in current if kanji not in positions],
+        )
+        cursor.executemany(
+            "UPDATE word_kanji SET position = ? WHERE word_id = ? AND kanji = ?",
+            [
+                (position, word_id, kanji)
+                for kanji, position in positions.items()
+                if kanji in current and current[kanji] != position
+            ],
+        )
+        cursor.executemany(
+            "INSERT OR IGNORE INTO word_kanji (word_id, kanji, position) VALUES (?, ?, ?)",
+            [(word_id, kanji, position) for kanji, position in positions.items() if kanji not in current],
+        )
 
-        if not row:
-            conn.close()
-            return {"status": "error", "message": "해당 단어를 찾을 수 없습니다."}
+    @staticmethod
+    def _compact_changes(cursor):
+        """보관 범위를 넘은 tombstone 정리 (헬퍼 메서드, 커밋은 호출하는 쪽에서)
 
-        word_name = row["word"]
+        정리한 가장 큰 seq를 tombstone_horizon으로 남겨, 그 이전부터 동기화하려는 클라이언트에 reset을 알린다.
+        살아 있는 단어는 단어마다 마지막 변경 하나만 남으므로(트리거) 로그 크기는 단어 수 + MAX_TOMBSTONES 이하
+        """
+        cursor.execute(
+            """
+            SELECT MAX(seq) AS seq FROM word_changes
+            WHERE deleted = 1 AND (
+                changed_at < datetime('now', ?)
+                OR seq <= (SELECT seq FROM word_changes WHERE deleted = 1 ORDER BY seq DESC LIMIT 1 OFFSET ?)
+            )
+            """,
+            (f"-{TOMBSTONE_RETENTION_DAYS} days", MAX_TOMBSTONES),
+        )
+        horizon = cursor.fetchone()["seq"]
+        if horizon is None:
+            return
+        cursor.execute("DELETE FROM word_changes WHERE deleted = 1 AND seq <= ?", (horizon,))
+        cursor.execute(
+            "UPDATE sync_state SET value = MAX(value, ?) WHERE name = 'tombstone_horizon'",
+            (horizon,),
+        )
 
-        # 카스케이드 삭제 (외래키 제약으로 자동 삭제됨)
-        cursor.execute("DELETE FROM words WHERE id = ?", (word_id,))
-        conn.commit()
-        conn.close()
+    @staticmethod
+    def _load_category_ids(cursor) -> dict:
+        """카테고리 이름 -> ID 캐시 생성 (헬퍼 메서드)"""
+        cursor.execute("SELECT id, name FROM categories")
+        return {row["name"]: row["id"] for row in cursor.fetchall()}
 
-        return {"status": "success", "message": f"'{word_name}' 단어가 삭제되었습니다."}
+    @staticmethod
+    def _resolve_category_ids(cursor, categories: List[str], category_cache: dict) -> List[int]:
+        """카테고리 이름들을 ID로 변환, 캐시에 없는 카테고리는 생성 (헬퍼 메서드)"""
+        category_ids = []
+        for category in categories:
+            category_id = category_cache.get(category)
+            if category_id is None:
+                cursor.execute("INSERT INTO categories (name) VALUES (?)", (category,))
+                category_id = category_cache[category] = cursor.lastrowid
+            category_ids.append(category_id)
+        return category_ids
 
     @staticmethod
     def _add_categories_to_word(cursor, word_id: int, categories: List[str]):
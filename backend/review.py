@@ -0,0 +1,56 @@
+"""
+간격 반복(SM-2) 복습 일정
+
+review_state(migrations.py 9단계)에 단어마다 (ease, interval_days, repetitions, due_at)를 두고
+(due_at, word_id) 인덱스 순서로 복습할 단어를 꺼낸다. 새 단어는 추가되는 즉시 복습 대상이다.
+
+- GET /review/next: 기한이 지난 단어를 오래된 순서로 n개 꺼내고, 그동안 다른 요청에 다시 나오지 않도록
+  due_at을 LEASE_SECONDS 뒤로 미룬다(임대). 답하지 않으면 임대가 끝난 뒤 다시 나온다.
+- POST /review/answers: 채점(0~5)을 schedule()로 반영해 다음 due_at을 정한다. 한 번에 보낸 답은 한 트랜잭션.
+  PASS_GRADE 미만은 틀린 것으로 보고 wrong_count도 1 올린다.
+
+due_at은 정수 Unix 시각(초)이며 응답에서는 ISO 문자열로 바꾼다.
+"""
+
+from dataclasses import dataclass
+from datetime import datetime, timezone
+
+# 꺼낸 단어가 다시 나오기까지의 시간
+LEASE_SECONDS = 10 * 60
+DAY_SECONDS = 24 * 60 * 60
+
+INITIAL_EASE = 2.5
+MIN_EASE = 1.3
+# 이 점수 이상이면 맞힌 것
+PASS_GRADE = 3
+MAX_GRADE = 5
+
+
+@dataclass(frozen=True)
+class ReviewState:
+    ease: float = INITIAL_EASE
+    interval_days: float = 0
+    repetitions: int = 0
+
+
+def schedule(state: ReviewState, grade: int) -> ReviewState:
+    """SM-2 - 채점 후 다음 상태 (맞히면 1일, 6일, 이후 간격 x ease / 틀리면 처음부터 1일)"""
+    if grade >= PASS_GRADE:
+        if state.repetitions == 0:
+            interval = 1
+        elif state.repetitions == 1:
+            interval = 6
+        else:
+            interval = round(state.interval_days * state.ease)
+        repetitions = state.repetitions + 1
+    else:
+        interval = 1
+        repetitions = 0
+    miss = MAX_GRADE - grade
+    ease = max(MIN_EASE, state.ease + 0.1 - miss * (0.08 + miss * 0.02))
+    return ReviewState(round(ease, 4), interval, repetitions)
+
+
+def to_iso(epoch: int) -> str:
+    """due_at(Unix 시각) -> ISO 문자열 (UTC)"""
+    return datetime.fromtimestamp(epoch, timezone.utc).isoformat()
@@ -1,60 +1,453 @@
-from fastapi import APIRouter, HTTPException, Path, Body
-from models import Word, WordUpdate
-from repository import WordRepository
+import json
+from typing import Any, Awaitable, Callable, Hashable, Iterator, List, Literal, Optional, Tuple
+
+from fastapi import APIRouter, Depends, HTTPException, Path, Body, Query, Request, Response
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import PlainTextResponse, StreamingResponse
+from pydantic import ValidationError
+from cache import CacheEntry, etag_for, etag_matches, response_cache
+from compression import COMPRESS_MIN_SIZE, compress, compress_stream, negotiate
+from database import db_exists
+from fragments import word_ids_in
+from metrics import registry
+from models import CategoryMove, ReviewAnswer, Word, WordPatch, WordUpdate
+from async_repository import AsyncWordRepository
+from repository import Cursor, WordFilter, WordRepository, WordsJson
+from snapshot import serving_snapshot
+from utils import encode_cursor, decode_cursor
+from view_counter import view_counter
 
 router = APIRouter()
 
+# 페이지네이션 응답에서 다음 페이지 커서를 담는 헤더
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+
+def _decode_page_cursor(cursor: Optional[str], sort: Optional[str] = None) -> Optional[Cursor]:
+    """쿼리 파라미터 cursor를 (*정렬 키, id)로 변환 (기본 정렬은 (updated_at, id), position은 정수 키)"""
+    if cursor is None:
+        return None
+    try:
+        values = decode_cursor(cursor)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    key_type = int if sort == "position" else str
+    *keys, word_id = values or (None,)
+    if len(keys) != 1 or not isinstance(keys[0], key_type) or not isinstance(word_id, int):
+        raise HTTPException(status_code=400, detail=f"잘못된 커서입니다: {cursor}")
+    return values
+
+
+def _next_cursor_headers(count: int, last: Optional[Cursor], limit: Optional[int]) -> dict:
+    """페이지가 가득 찼으면 마지막 행 기준 다음 커서 헤더"""
+    if limit is None or count < limit:
+        return {}
+    return {NEXT_CURSOR_HEADER: encode_cursor(last)}
+
+
+def _render_json(content: Any) -> bytes:
+    """FastAPI JSONResponse와 같은 형식으로 직렬화"""
+    return json.dumps(content, ensure_ascii=False, allow_nan=False, separators=(",", ":")).encode("utf-8")
+
+
+async def _cached_json(request: Request, key: Hashable, fetch: Callable[[], Awaitable[Any]]) -> Response:
+    """캐시를 거치는 JSON 응답 (캐시에 없으면 fetch()로 조회해 직렬화)"""
+
+    async def render():
+        return _render_json(await fetch()), {}
+
+    return await _cached_response(request, key, render)
+
+
+async def _cached_words(
+    request: Request,
+    key: Hashable,
+    fetch: Callable[[], Awaitable[WordsJson]],
+    limit: Optional[int] = None,
+    count_views: bool = False,
+) -> Response:
+    """캐시를 거치는 단어 목록 응답 - repository가 JSON 조각으로 만든 본문을 그대로 쓴다"""
+
+    async def render():
+        body, count, last = await fetch()
+        return body, _next_cursor_headers(count, last, limit)
+
+    return await _cached_response(request, key, render, count_views)
+
+
+async def _cached_response(
+    request: Request,
+    key: Hashable,
+    render: Callable[[], Awaitable[Tuple[bytes, dict]]],
+    count_views: bool = False,
+) -> Response:
+    """캐시를 거치는 JSON 응답
+
+    캐시에 없으면 render()로 (본문, 헤더)를 만들어 함께 저장한다.
+    클라이언트의 ETag가 현재 데이터 버전과 같으면 조회도 직렬화도 하지 않고 304를 반환한다.
+    count_views면 응답에 들어간 단어의 조회 수를 버퍼에 더한다. (304도 캐시에 남아 있으면 포함)
+    """
+    version = await AsyncWordRepository.get_data_version()
+    etag = etag_for(version)
+    cache_headers = {"ETag": etag, "Cache-Control": "no-cache"}
+    if etag_matches(request.headers.get("if-none-match"), etag):
+        entry = response_cache.get(key, version) if count_views else None
+        if entry is not None:
+            view_counter.record(entry.word_ids)
+        return Response(status_code=304, headers={**cache_headers, "Vary": "Accept-Encoding"})
+
+    entry = response_cache.get(key, version)
+    if entry is None:
+        # 조회 중에 쓰기가 일어나면 조회 전 버전으로 저장되어 바로 무효 처리된다
+        body, headers = await render()
+        word_ids = word_ids_in(body) if count_views else ()
+        entry = response_cache.put(key, CacheEntry(version, body, headers, word_ids=word_ids))
+    if count_views:
+        view_counter.record(entry.word_ids)
+
+    headers = {**cache_headers, "ETag": entry.etag, **entry.headers}
+    body = entry.body
+    encoding = negotiate(request.headers.get("accept-encoding")) if len(body) >= COMPRESS_MIN_SIZE else None
+    if encoding is not None:
+        body = entry.encoded.get(encoding)
+        if body is None:
+            body = await run_in_threadpool(compress, entry.body, encoding)
+            response_cache.add_encoding(key, entry, encoding, body)
+        # 압축본은 바이트가 다르므로 약한 ETag (같은 버전이면 304 판단은 그대로)
+        # 압축하지 않은 응답의 Vary는 GZipMiddleware가 붙인다
+        headers.update({"Content-Encoding": encoding, "ETag": f"W/{entry.etag}", "Vary": "Accept-Encoding"})
+    return Response(body, media_type="application/json", headers=headers)
+
+
+def _ndjson_response(request: Request, chunks: Iterator[bytes]) -> StreamingResponse:
+    """단어를 한 줄에 하나씩 NDJSON으로 스트리밍 (repository가 배치 단위로 만든 청크)
+
+    압축은 청크마다 flush해서 직접 한다. (GZipMiddleware는 스트림 끝까지 버퍼에 모아 스트리밍이 되지 않음,
+    Content-Encoding이 있는 응답은 그대로 통과시킨다)
+    """
+    encoding = negotiate(request.headers.get("accept-encoding"))
+    if encoding is None:
+        return StreamingResponse(chunks, media_type="application/x-ndjson")
+    return StreamingResponse(
+        compress_stream(chunks, encoding),
+        media_type="application/x-ndjson",
+        headers={"Content-Encoding": encoding, "Vary": "Accept-Encoding"},
+    )
+
+
+def require_writable():
+    """스냅샷 서빙 모드(KANJI_SNAPSHOT)에서는 쓰기 요청을 받지 않는다"""
+    if serving_snapshot() is not None:
+        raise HTTPException(status_code=405, detail="읽기 전용 스냅샷 모드에서는 단어를 수정할 수 없습니다.")
+
+
+def require_database():
+    """스냅샷에 없는 데이터(검색, 카테고리 계층, 통계, 랜덤, 변경 로그)는 SQLite에서 읽으므로 원본 DB가 필요하다
+
+    스냅샷 서빙 모드에서 원본 DB가 없으면 503 (스냅샷으로 응답할 수 있는 조회는 그대로 동작)
+    """
+    if serving_snapshot() is not None and not db_exists():
+        raise HTTPException(status_code=503, detail="원본 DB가 없는 스냅샷 모드에서는 이 조회를 지원하지 않습니다.")
+
+
+CURSOR_QUERY = Query(None, description="이전 응답의 X-Next-Cursor 헤더 값")
+LIMIT_QUERY = Query(None, ge=1, le=1000, description="페이지 크기 (지정 시 keyset 페이지네이션, 기본 최신순)")
+STREAM_QUERY = Query(False, description="true면 NDJSON으로 한 행씩 스트리밍")
+SORT_QUERY = Query(
+    None,
+    description="정렬 (updated: 최신순, word: 단어순, reading: 읽는 법순, meaning: 뜻 가나다순), 지정 시 이 순서로 페이지네이션",
+)
+
+# repository.SORTS / KANJI_SORTS의 키
+SortName = Literal["updated", "word", "reading", "meaning"]
+KanjiSortName = Literal["updated", "word", "reading", "meaning", "position"]
+
 
 @router.get("/kanji")
-def get_all_kanji():
+async def get_all_kanji(request: Request):
     """모든 한자 조회"""
-    return WordRepository.get_all_kanji()
+    return await _cached_json(request, ("kanji",), AsyncWordRepository.get_all_kanji)
+
+
+@router.get("/kanji/stats", dependencies=[Depends(require_database)])
+async def get_kanji_stats(
+    request: Request,
+    sort: Literal["count", "difficulty"] = Query("count", description="count: 단어 수순, difficulty: 단어당 평균 오답 수순"),
+    limit: Optional[int] = Query(None, ge=1, le=10000),
+    offset: int = Query(0, ge=0),
+):
+    """한자별 통계 (단어 수, 오답 수 합계, 난이도, 마지막 수정 시각)"""
+    return await _cached_json(
+        request,
+        ("kanji_stats", sort, limit, offset),
+        lambda: AsyncWordRepository.get_kanji_stats(sort, limit, offset),
+    )
 
 
 @router.get("/words_list")
-def get_all_words():
-    """모든 단어 리스트 조회 (최신순)"""
-    return WordRepository.get_all_words()
+async def get_all_words(
+    request: Request,
+    cursor: Optional[str] = CURSOR_QUERY,
+    limit: Optional[int] = LIMIT_QUERY,
+    stream: bool = STREAM_QUERY,
+    sort: Optional[SortName] = SORT_QUERY,
+):
+    """모든 단어 리스트 조회 (기본 최신순)"""
+    after = _decode_page_cursor(cursor, sort)
+    if stream:
+        return _ndjson_response(request, WordRepository.all_words(after, limit, sort, mode="ndjson"))
+    return await _cached_words(
+        request,
+        ("words_list", after, limit, sort),
+        lambda: AsyncWordRepository.all_words(after, limit, sort, mode="json"),
+        limit,
+    )
 
 
 @router.get("/kanji/{kanji}")
-def get_words_by_kanji(
+async def get_words_by_kanji(
+    request: Request,
     kanji: str = Path(
         ...,
         description="검색할 한자 (예: 日, 月, 水 등)",
         example="行",
-    )
+    ),
+    cursor: Optional[str] = CURSOR_QUERY,
+    limit: Optional[int] = LIMIT_QUERY,
+    stream: bool = STREAM_QUERY,
+    sort: Optional[KanjiSortName] = Query(None, description="정렬 (/words_list의 sort + position: 단어 안 한자 위치순)"),
 ):
-    """특정 한자로 단어 검색"""
-    words = WordRepository.get_words_by_kanji(kanji)
-    if not words:
-        return []
-    return words
+    """특정 한자로 단어 검색 (응답에 들어간 단어의 조회 수 집계, 스트리밍 제외)"""
+    after = _decode_page_cursor(cursor, sort)
+    if stream:
+        return _ndjson_response(request, WordRepository.words_by_kanji(kanji, after, limit, sort, mode="ndjson"))
+    return await _cached_words(
+        request,
+        ("kanji", kanji, after, limit, sort),
+        lambda: AsyncWordRepository.words_by_kanji(kanji, after, limit, sort, mode="json"),
+        limit,
+        # 스냅샷 모드는 읽기 전용이므로 조회 수를 세지 않는다
+        count_views=serving_snapshot() is None,
+    )
 
 
 @router.get("/categories")
-def get_all_categories():
+async def get_all_categories(request: Request):
     """모든 카테고리 조회"""
-    return WordRepository.get_all_categories()
+    return await _cached_json(request, ("categories",), AsyncWordRepository.get_all_categories)
+
+
+@router.get("/categories/tree", dependencies=[Depends(require_database)])
+async def get_category_tree(request: Request):
+    """카테고리 계층 전체 (노드마다 name, word_count, children)"""
+    return await _cached_json(request, ("category_tree",), AsyncWordRepository.get_category_tree)
 
 
 @router.get("/category/{category}")
-def get_words_by_category(
+async def get_words_by_category(
+    request: Request,
     category: str = Path(
         ...,
         description="카테고리 (예: 자연물, 방향, 시간 등)",
         example="방향",
-    )
+    ),
+    cursor: Optional[str] = CURSOR_QUERY,
+    limit: Optional[int] = LIMIT_QUERY,
+    stream: bool = STREAM_QUERY,
+    descendants: bool = Query(False, description="true면 하위 카테고리의 단어까지 (중복 없이)"),
+    sort: Optional[SortName] = SORT_QUERY,
 ):
     """특정 카테고리로 단어 검색"""
-    words = WordRepository.get_words_by_category(category)
-    if not words:
-        return []
-    return words
+    if descendants:
+        # 스냅샷에는 카테고리 계층이 없다
+        require_database()
+    after = _decode_page_cursor(cursor, sort)
+    if stream:
+        return _ndjson_response(
+            request, WordRepository.words_by_category(category, after, limit, descendants, sort, mode="ndjson")
+        )
+    return await _cached_words(
+        request,
+        ("category", category, after, limit, descendants, sort),
+        lambda: AsyncWordRepository.words_by_category(category, after, limit, descendants, sort, mode="json"),
+        limit,
+    )
+
+
+@router.get("/category/{category}/children", dependencies=[Depends(require_database)])
+async def get_category_children(request: Request, category: str = Path(..., description="카테고리")):
+    """카테고리의 경로(path: 최상위 -> 부모)와 바로 아래 하위 카테고리 (하위 트리 단어 수 포함)"""
+
+    async def fetch():
+        result = await AsyncWordRepository.get_category_children(category)
+        if result is None:
+            raise HTTPException(status_code=404, detail="해당 카테고리를 찾을 수 없습니다.")
+        return result
+
+    return await _cached_json(request, ("category_children", category), fetch)
+
+
+# move_category 실패 사유 -> 상태 코드
+MOVE_ERROR_STATUS = {"not_found": 404, "cycle": 409}
+
+
+@router.put("/category/{category}/parent", dependencies=[Depends(require_writable)])
+async def move_category(
+    category: str = Path(..., description="옮길 카테고리"),
+    move: CategoryMove = Body(examples=[{"parent": "경어"}, {"parent": None}]),
+):
+    """카테고리를 다른 카테고리 아래로 옮깁니다. (parent가 null이면 최상위로, 없는 parent는 새로 만듦)"""
+    result = await AsyncWordRepository.move_category(category, move.parent)
+    if result.get("status") == "error":
+        raise HTTPException(status_code=MOVE_ERROR_STATUS[result["reason"]], detail=result.get("message"))
+    return result
 
 
-@router.post("/kanji")
-def add_word(
+# GET /words 전체 결과 수를 담는 헤더
+TOTAL_COUNT_HEADER = "X-Total-Count"
+# 포함 + 제외 카테고리 수 상한 (compound SELECT 항목 수)
+MAX_FILTER_CATEGORIES = 20
+
+
+def _clean_names(names: List[str]) -> Tuple[str, ...]:
+    """카테고리 이름 공백 제거 / 중복 제거 (순서 유지)"""
+    return tuple(dict.fromkeys(name.strip() for name in names if name.strip()))
+
+
+@router.get("/words", dependencies=[Depends(require_database)])
+async def get_filtered_words(
+    request: Request,
+    category: List[str] = Query([], description="카테고리 (여러 번 지정 가능)"),
+    mode: Literal["and", "or"] = Query("and", description="and: 모든 카테고리에 속한 단어, or: 하나라도 속한 단어"),
+    exclude: List[str] = Query([], description="제외할 카테고리 (여러 번 지정 가능)"),
+    kanji: Optional[str] = Query(None, description="이 한자가 들어간 단어만"),
+    descendants: bool = Query(False, description="true면 카테고리마다 하위 카테고리까지 포함"),
+    cursor: Optional[str] = CURSOR_QUERY,
+    limit: Optional[int] = LIMIT_QUERY,
+    stream: bool = STREAM_QUERY,
+    sort: Optional[SortName] = SORT_QUERY,
+):
+    """여러 카테고리의 교집합(and) / 합집합(or)에서 제외 카테고리를 뺀 단어 (기본 최신순)
+
+    전체 결과 수는 X-Total-Count 헤더로 반환합니다. (스트리밍 제외)
+    """
+    word_filter = WordFilter(_clean_names(category), mode, _clean_names(exclude), kanji, descendants)
+    if len(word_filter.categories) + len(word_filter.exclude) > MAX_FILTER_CATEGORIES:
+        raise HTTPException(status_code=400, detail=f"카테고리는 최대 {MAX_FILTER_CATEGORIES}개까지 지정할 수 있습니다.")
+    after = _decode_page_cursor(cursor, sort)
+    if stream:
+        return _ndjson_response(request, WordRepository.filtered_words(word_filter, after, limit, sort, mode="ndjson"))
+
+    async def render():
+        body, count, last = await AsyncWordRepository.filtered_words(word_filter, after, limit, sort, mode="json")
+        total = await AsyncWordRepository.count_filtered_words(word_filter)
+        return body, {**_next_cursor_headers(count, last, limit), TOTAL_COUNT_HEADER: str(total)}
+
+    return await _cached_response(request, ("words", word_filter, after, limit, sort), render)
+
+
+@router.get("/search", dependencies=[Depends(require_database)])
+async def search_words(
+    request: Request,
+    q: str = Query(..., min_length=1, description="검색어 (단어, 히라가나, 뜻, 한국어 발음)", example="학"),
+    limit: int = Query(50, ge=1, le=200),
+    offset: int = Query(0, ge=0),
+):
+    """단어 전문 검색 (관련도순, 1~2글자는 접두사 / 3글자 이상은 부분 문자열 일치)"""
+    return await _cached_words(
+        request,
+        ("search", q, limit, offset),
+        lambda: AsyncWordRepository.search_words(q, limit, offset, mode="json"),
+    )
+
+
+@router.get("/changes", dependencies=[Depends(require_database)])
+async def get_changes(
+    request: Request,
+    since: Optional[int] = Query(None, ge=0, description="이전 응답의 seq (생략하면 현재 seq만 반환)"),
+    limit: int = Query(1000, ge=1, le=5000),
+):
+    """since 이후 추가/수정된 단어(upserts)와 삭제된 단어 ID(deleted)
+
+    reset이 true면 그 사이 삭제 기록이 정리되어 증분 동기화를 할 수 없으므로 목록 전체를 다시 받아야 합니다.
+    has_more가 true면 응답의 seq로 다시 요청합니다.
+    """
+    return await _cached_json(
+        request,
+        ("changes", since, limit),
+        lambda: AsyncWordRepository.get_changes(since, limit),
+    )
+
+
+WEIGHTED_QUERY = Query(False, description="true면 오답 수(wrong_count)가 많을수록 자주 뽑힘")
+CATEGORY_QUERY = Query(None, description="이 카테고리의 단어에서만 뽑기")
+# 랜덤 응답은 캐시하지 않는다
+NO_STORE_HEADERS = {"Cache-Control": "no-store"}
+
+
+@router.get("/stats/hot-words", dependencies=[Depends(require_database)])
+async def get_hot_words(limit: int = Query(20, ge=1, le=100)):
+    """조회 수가 많은 단어 (아직 기록하지 않은 조회 수 포함, 단어마다 view_count)
+
+    조회 수는 데이터 버전과 무관하게 바뀌므로 응답 캐시를 거치지 않습니다.
+    """
+    return await AsyncWordRepository.get_hot_words(limit)
+
+
+# POST /review/answers 한 번에 채점할 수 있는 답 수
+MAX_REVIEW_BATCH = 500
+
+
+@router.get("/review/next", dependencies=[Depends(require_writable)])
+async def get_next_reviews(n: int = Query(20, ge=1, le=100, description="꺼낼 단어 수")):
+    """기한이 지난 복습 단어를 오래된 순서로 n개 (꺼낸 단어는 답하지 않아도 10분 동안 다시 나오지 않음)
+
+    복습 상태는 캐시하지 않습니다. (꺼낼 때마다 바뀜)
+    """
+    return await AsyncWordRepository.get_due_reviews(n)
+
+
+@router.post("/review/answers", dependencies=[Depends(require_writable)])
+async def answer_reviews(
+    answers: List[ReviewAnswer] = Body(examples=[[{"word_id": 1, "grade": 4}, {"word_id": 2, "grade": 1}]]),
+):
+    """복습 답을 한 번에 채점 (SM-2, 3점 미만은 wrong_count 증가) - 없는 단어가 있으면 전체를 반영하지 않음"""
+    if len(answers) > MAX_REVIEW_BATCH:
+        raise HTTPException(status_code=400, detail=f"답은 한 번에 최대 {MAX_REVIEW_BATCH}개까지 보낼 수 있습니다.")
+    result = await AsyncWordRepository.answer_reviews([(answer.word_id, answer.grade) for answer in answers])
+    if result.get("status") == "error":
+        raise HTTPException(status_code=404, detail=result.get("message"))
+    return result
+
+
+@router.get("/random/kanji", dependencies=[Depends(require_database)])
+async def get_random_kanji(
+    response: Response,
+    weighted: bool = WEIGHTED_QUERY,
+    category: Optional[str] = CATEGORY_QUERY,
+):
+    """랜덤 한자 하나"""
+    kanji = await AsyncWordRepository.get_random_kanji(weighted, category)
+    if kanji is None:
+        raise HTTPException(status_code=404, detail="뽑을 수 있는 한자가 없습니다.")
+    response.headers.update(NO_STORE_HEADERS)
+    return {"kanji": kanji}
+
+
+@router.get("/random/words", dependencies=[Depends(require_database)])
+async def get_random_words(
+    response: Response,
+    n: int = Query(1, ge=1, le=100, description="뽑을 단어 수 (중복 없음)"),
+    weighted: bool = WEIGHTED_QUERY,
+    category: Optional[str] = CATEGORY_QUERY,
+):
+    """서로 다른 랜덤 단어 최대 n개 (복습용)"""
+    response.headers.update(NO_STORE_HEADERS)
+    return await AsyncWordRepository.get_random_words(n, weighted, category)
+
+
+@router.post("/kanji", dependencies=[Depends(require_writable)])
+async def add_word(
     input_word: Word = Body(
         description="추가할 단어의 정보를 입력합니다.",
         example={
@@ -66,14 +459,59 @@ def add_word(
     )
 ):
     """새로운 단어를 추가합니다. 이미 존재하는 단어는 중복 추가되지 않습니다."""
-    result = WordRepository.add_word(input_word)
+    result = await AsyncWordRepository.add_word(input_word)
     if result.get("status") == "error":
         raise HTTPException(status_code=400, detail=result.get("message"))
     return result
 
 
-@router.put("/kanji/{word_id}")
-def update_word(
+@router.post("/kanji/bulk", dependencies=[Depends(require_writable)])
+async def add_words_bulk(request: Request):
+    """여러 단어를 한 번에 추가합니다.
+
+    본문은 단어 객체의 JSON 배열, 또는 Content-Type이 application/x-ndjson인 경우 한 줄에 하나씩.
+    모든 단어는 하나의 트랜잭션으로 저장되며, 항목별 결과(inserted / duplicate / invalid)를 반환합니다.
+    """
+    try:
+        body = (await request.body()).decode("utf-8")
+    except UnicodeDecodeError as e:
+        raise HTTPException(status_code=400, detail=f"본문이 UTF-8이 아닙니다: {e.start + 1}번째 바이트")
+    try:
+        if request.headers.get("content-type", "").startswith("application/x-ndjson"):
+            items = [json.loads(line) for line in body.splitlines() if line.strip()]
+        else:
+            items = json.loads(body)
+    except json.JSONDecodeError as e:
+        raise HTTPException(status_code=400, detail=f"JSON 형식 오류: {e}")
+    if not isinstance(items, list):
+        raise HTTPException(status_code=400, detail="단어 객체의 배열이 필요합니다.")
+
+    report = [None] * len(items)
+    valid_indexes = []
+    valid_words = []
+    for index, item in enumerate(items):
+        try:
+            valid_words.append(Word.model_validate(item))
+            valid_indexes.append(index)
+        except ValidationError as e:
+            errors = [f"{'.'.join(map(str, err['loc']))}: {err['msg']}" for err in e.errors()]
+            report[index] = {"index": index, "status": "invalid", "errors": errors}
+
+    word_ids = await AsyncWordRepository.add_words_bulk(valid_words)
+    for index, word, word_id in zip(valid_indexes, valid_words, word_ids):
+        if word_id is None:
+            report[index] = {"index": index, "status": "duplicate", "word": word.word}
+        else:
+            report[index] = {"index": index, "status": "inserted", "id": word_id, "word": word.word}
+
+    counts = {"inserted": 0, "duplicate": 0, "invalid": 0}
+    for item in report:
+        counts[item["status"]] += 1
+    return {"status": "success", **counts, "items": report}
+
+
+@router.put("/kanji/{word_id}", dependencies=[Depends(require_writable)])
+async def update_word(
     word_id: int = Path(..., description="수정할 단어의 ID"),
     updated_word: WordUpdate = Body(
         example={
@@ -86,16 +524,43 @@ def update_word(
     ),
 ):
     """이미 존재하는 단어 정보를 수정합니다."""
-    result = WordRepository.update_word(word_id, updated_word)
+    result = await AsyncWordRepository.update_word(word_id, updated_word)
     if result.get("status") == "error":
         raise HTTPException(status_code=404, detail=result.get("message"))
     return result
 
 
-@router.delete("/kanji/{word_id}")
-def delete_word(word_id: int = Path(..., description="삭제할 단어의 ID")):
+# patch_word 실패 사유 -> 상태 코드
+PATCH_ERROR_STATUS = {"not_found": 404, "duplicate": 409}
+
+
+@router.patch("/kanji/{word_id}", dependencies=[Depends(require_writable)])
+async def patch_word(
+    word_id: int = Path(..., description="수정할 단어의 ID"),
+    patch: WordPatch = Body(
+        examples=[
+            {"meaning": "기자", "category": ["직업", "언론"]},
+            {"wrong_count_delta": 1},
+        ]
+    ),
+):
+    """보낸 필드만 수정합니다. 오답 수는 wrong_count_delta로 증감할 수 있습니다. (수정된 단어를 함께 반환)"""
+    result = await AsyncWordRepository.patch_word(word_id, patch)
+    if result.get("status") == "error":
+        raise HTTPException(status_code=PATCH_ERROR_STATUS[result["reason"]], detail=result.get("message"))
+    return result
+
+
+@router.delete("/kanji/{word_id}", dependencies=[Depends(require_writable)])
+async def delete_word(word_id: int = Path(..., description="삭제할 단어의 ID")):
     """단어를 삭제합니다."""
-    result = WordRepository.delete_word(word_id)
+    result = await AsyncWordRepository.delete_word(word_id)
     if result.get("status") == "error":
         raise HTTPException(status_code=404, detail=result.get("message"))
     return result
+
+
+@router.get("/metrics", response_class=PlainTextResponse)
+async def get_metrics():
+    """라우트별 지연 시간, 요청당 SQL 실행 수/행 수 (Prometheus 텍스트 형식)"""
+    return PlainTextResponse(registry.render(), media_type="text/plain; version=0.0.4")
@@ -0,0 +1,294 @@
+"""
+랜덤 단어 / 한자 추출용 가중치 인덱스
+
+- WeightedSampler: 키마다 정수 가중치를 두고 펜윅 트리(누적 가중치)로 O(log n) 추출 / 갱신
+- RandomIndex: 단어별 (오답 수, 카테고리, 한자)를 메모리에 두고 범위(전체 또는 카테고리)마다
+  단어 / 한자 추출기를 유지한다.
+  - 단어: 균등(가중치 1) 또는 오답 가중(wrong_count + 1)
+  - 한자: 균등(단어가 하나라도 있으면 1) 또는 오답 가중(그 한자가 들어간 단어들의 wrong_count + 1 합)
+
+추출할 때마다 sync(conn)로 DB의 데이터 버전(cache.read_data_version)과 맞춘다.
+처음이거나 DB 파일이 바뀌었으면(epoch) 전체를 읽어 만들고, 그 뒤로는 변경 로그(word_changes)에서
+마지막으로 맞춘 seq 이후 바뀐 단어만 다시 읽어 반영하므로 다른 프로세스(uvicorn 워커, migrate.py,
+tokenizer.py backfill 등)가 커밋한 변경도 다음 추출부터 보인다. 카테고리 범위는 처음 요청될 때 만든다.
+
+노트북마다 따로 만들고(random_index는 현재 노트북의 인덱스로 넘겨주는 NotebookLocal),
+노트북이 연결 LRU에서 빠지면 버렸다가 다시 쓸 때 새로 만든다.
+"""
+
+import json
+import random
+import sqlite3
+import sys
+import threading
+from dataclasses import dataclass
+from typing import Dict, Hashable, Iterable, List, Optional, Tuple
+
+from cache import DataVersion, changed_word_ids, read_data_version
+from database import NotebookLocal
+
+
+class WeightedSampler:
+    """키별 정수 가중치에 비례해 키를 뽑는 펜윅 트리"""
+
+    def __init__(self):
+        self._tree = [0]  # 1부터 시작하는 펜윅 트리
+        self._weights: List[int] = []
+        self._keys: List[Optional[Hashable]] = []
+        self._slots: Dict[Hashable, int] = {}
+        self._free: List[int] = []
+        self.total = 0
+
+    def __len__(self) -> int:
+        return len(self._slots)
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._slots
+
+    def weight(self, key: Hashable) -> int:
+        slot = self._slots.get(key)
+        return 0 if slot is None else self._weights[slot]
+
+    def set(self, key: Hashable, weight: int):
+        """키의 가중치 변경 (0 이하면 제거)"""
+        slot = self._slots.get(key)
+        if weight <= 0:
+            if slot is not None:
+                self._add(slot, -self._weights[slot])
+                self._weights[slot] = 0
+                self._keys[slot] = None
+                del self._slots[key]
+                self._free.append(slot)
+            return
+        if slot is None:
+            slot = self._allocate(key)
+        self._add(slot, weight - self._weights[slot])
+        self._weights[slot] = weight
+
+    def _allocate(self, key: Hashable) -> int:
+        if self._free:
+            slot = self._free.pop()
+            self._keys[slot] = key
+        else:
+            # 끝에 0 가중치 칸 추가 - 새 노드는 자신이 덮는 구간의 합으로 시작
+            slot = len(self._weights)
+            self._weights.append(0)
+            self._keys.append(key)
+            index = slot + 1
+            value = 0
+            child = index - 1
+            stop = index - (index & -index)
+            while child > stop:
+                value += self._tree[child]
+                child -= child & -child
+            self._tree.append(value)
+        self._slots[key] = slot
+        return slot
+
+    def _add(self, slot: int, delta: int):
+        if not delta:
+            return
+        self.total += delta
+        index = slot + 1
+        while index < len(self._tree):
+            self._tree[index] += delta
+            index += index & -index
+
+    def _find(self, target: int) -> int:
+        """누적 가중치가 target을 처음 넘는 칸 (0 <= target < total)"""
+        index = 0
+        step = 1 << (len(self._tree) - 1).bit_length()
+        while step:
+            next_index = index + step
+            if next_index < len(self._tree) and self._tree[next_index] <= target:
+                index = next_index
+                target -= self._tree[next_index]
+            step >>= 1
+        return index
+
+    def sample(self, rnd: random.Random = random) -> Optional[Hashable]:
+        """가중치에 비례해 키 하나 (비어 있으면 None)"""
+        if self.total <= 0:
+            return None
+        return self._keys[self._find(rnd.randrange(self.total))]
+
+    def sample_distinct(self, n: int, rnd: random.Random = random) -> list:
+        """서로 다른 키를 최대 n개 (비복원 추출 - 뽑힌 키는 잠시 가중치를 0으로 두었다가 되돌린다)"""
+        picked = []
+        removed = []
+        try:
+            while len(picked) < n and self.total > 0:
+                slot = self._find(rnd.randrange(self.total))
+                picked.append(self._keys[slot])
+                removed.append((slot, self._weights[slot]))
+                self._add(slot, -self._weights[slot])
+        finally:
+            for slot, weight in removed:
+                self._add(slot, weight)
+        return picked
+
+
+def _word_weight(wrong_count: int) -> int:
+    """오답 가중 추출에서 단어의 가중치 (오답이 없어도 뽑힐 수 있도록 +1)"""
+    return max(wrong_count, 0) + 1
+
+
+@dataclass
+class _WordState:
+    wrong_count: int
+    categories: Tuple[str, ...]
+    kanji: Tuple[str, ...]
+
+
+class _Scope:
+    """전체 또는 카테고리 하나에 속한 단어 / 한자 추출기"""
+
+    def __init__(self):
+        self.words = WeightedSampler()
+        self.weighted_words = WeightedSampler()
+        self.kanji = WeightedSampler()
+        self.weighted_kanji = WeightedSampler()
+
+    def add(self, word_id: int, state: _WordState, sign: int = 1):
+        """단어를 범위에 추가 (sign=-1이면 제거)"""
+        weight = _word_weight(state.wrong_count)
+        self.words.set(word_id, 1 if sign > 0 else 0)
+        self.weighted_words.set(word_id, weight if sign > 0 else 0)
+        for kanji in state.kanji:
+            total = self.weighted_kanji.weight(kanji) + sign * weight
+            self.weighted_kanji.set(kanji, total)
+            self.kanji.set(kanji, 1 if total > 0 else 0)
+
+    def remove(self, word_id: int, state: _WordState):
+        self.add(word_id, state, sign=-1)
+
+
+# 단어 하나의 오답 수 / 카테고리 / 한자 (refresh에서 id 목록으로 조회)
+_WORD_STATE_SQL = """
+    SELECT w.id, w.wrong_count,
+        (SELECT json_group_array(c.name) FROM word_categories wc JOIN categories c ON c.id = wc.category_id
+         WHERE wc.word_id = w.id) AS categories,
+        (SELECT json_group_array(kanji) FROM word_kanji wk WHERE wk.word_id = w.id) AS kanji
+    FROM words w
+"""
+
+
+class RandomIndex:
+    """단어 / 한자 랜덤 추출 인덱스 (노트북마다 하나, random_index)"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        # 마지막으로 맞춘 데이터 버전 (None이면 아직 만들지 않음)
+        self._version: Optional[DataVersion] = None
+        self._words: Dict[int, _WordState] = {}
+        self._all = _Scope()
+        self._categories: Dict[str, _Scope] = {}
+
+    @property
+    def built(self) -> bool:
+        return self._version is not None
+
+    def sync(self, conn: sqlite3.Connection):
+        """DB의 현재 데이터 버전에 맞춤 - 처음이면 전체를 읽어 만들고, 이후에는 바뀐 단어만 반영"""
+        with self._lock:
+            # 버전과 읽는 데이터가 같은 시점이도록 읽기 트랜잭션 하나로
+            conn.execute("BEGIN")
+            try:
+                version = read_data_version(conn)
+                if self._version == version:
+                    return
+                changed = None
+                if self._version is not None and self._version.epoch == version.epoch:
+                    changed = changed_word_ids(conn, self._version.seq)
+                if changed is None:
+                    self._build(conn)
+                else:
+                    self._refresh(conn, changed)
+            finally:
+                conn.rollback()
+            # 빈 인덱스는 기준으로 삼지 않는다 (단어가 생기면 다음 추출에서 처음부터 다시 만든다)
+            self._version = version if self._words else None
+
+    def _build(self, conn: sqlite3.Connection):
+        """DB 전체를 읽어 인덱스를 새로 만든다 (sync의 읽기 트랜잭션 안에서 호출)"""
+        words = {row[0]: [row[1] or 0, [], []] for row in conn.execute("SELECT id, wrong_count FROM words")}
+        for word_id, name in conn.execute(
+            "SELECT wc.word_id, c.name FROM word_categories wc JOIN categories c ON c.id = wc.category_id"
+        ):
+            if word_id in words:
+                words[word_id][1].append(sys.intern(name))
+        for word_id, kanji in conn.execute("SELECT word_id, kanji FROM word_kanji"):
+            if word_id in words:
+                words[word_id][2].append(sys.intern(kanji))
+
+        self._words = {}
+        self._all = _Scope()
+        self._categories = {}
+        for word_id, (wrong_count, categories, kanji) in words.items():
+            state = _WordState(wrong_count, tuple(categories), tuple(kanji))
+            self._words[word_id] = state
+            self._all.add(word_id, state)
+
+    def _refresh(self, conn: sqlite3.Connection, word_ids: List[int]):
+        """바뀐(추가/수정/삭제된) 단어만 다시 읽어 반영 (sync의 읽기 트랜잭션 안에서 호출)"""
+        current = {}
+        # SQLite 변수 개수 제한(기본 999 이상)을 넘지 않도록 나눠서 조회
+        for start in range(0, len(word_ids), 500):
+            chunk = word_ids[start:start + 500]
+            placeholders = ",".join("?" * len(chunk))
+            for row in conn.execute(f"{_WORD_STATE_SQL} WHERE w.id IN ({placeholders})", chunk):
+                current[row[0]] = _WordState(
+                    row[1] or 0,
+                    tuple(sys.intern(name) for name in _json_list(row[2])),
+                    tuple(sys.intern(kanji) for kanji in _json_list(row[3])),
+                )
+        for word_id in word_ids:
+            self._replace(word_id, current.get(word_id))
+
+    def _replace(self, word_id: int, state: Optional[_WordState]):
+        old = self._words.pop(word_id, None)
+        if old is not None:
+            self._all.remove(word_id, old)
+            for category in old.categories:
+                scope = self._categories.get(category)
+                if scope is not None:
+                    scope.remove(word_id, old)
+        if state is not None:
+            self._words[word_id] = state
+            self._all.add(word_id, state)
+            for category in state.categories:
+                scope = self._categories.get(category)
+                if scope is not None:
+                    scope.add(word_id, state)
+
+    def _scope(self, category: Optional[str]) -> _Scope:
+        """범위 추출기 (카테고리 범위는 처음 요청될 때 메모리의 단어 상태로 생성, 잠금 안에서 호출)"""
+        if category is None:
+            return self._all
+        scope = self._categories.get(category)
+        if scope is None:
+            scope = _Scope()
+            for word_id, state in self._words.items():
+                if category in state.categories:
+                    scope.add(word_id, state)
+            # 단어가 없는 카테고리 이름은 보관하지 않는다 (임의의 이름으로 메모리가 늘지 않도록)
+            if len(scope.words):
+                self._categories[category] = scope
+        return scope
+
+    def sample_kanji(self, weighted: bool = False, category: Optional[str] = None) -> Optional[str]:
+        with self._lock:
+            scope = self._scope(category)
+            return (scope.weighted_kanji if weighted else scope.kanji).sample()
+
+    def sample_words(self, n: int, weighted: bool = False, category: Optional[str] = None) -> List[int]:
+        with self._lock:
+            scope = self._scope(category)
+            return (scope.weighted_words if weighted else scope.words).sample_distinct(n)
+
+
+def _json_list(value: Optional[str]) -> list:
+    return json.loads(value) if value else []
+
+
+random_index = NotebookLocal(RandomIndex, discard_on_evict=True)
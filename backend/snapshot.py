@@ -0,0 +1,485 @@
+"""
+읽기 전용 바이너리 스냅샷
+
+kanji_vocab.db의 단어 / 한자 / 카테고리 조회에 필요한 데이터만 하나의 파일로 컴파일하고,
+서버는 이 파일을 mmap으로 열어 그대로(복사 없이) 조회한다.
+- 파일을 여는 데 드는 시간은 헤더를 읽는 것뿐이라 시작이 빠르고
+- 페이지 캐시를 공유하므로 uvicorn 워커가 여러 개여도 메모리를 한 번만 쓴다
+
+    python snapshot.py export [--db kanji_vocab.db] [--out kanji_vocab.snap]
+    python snapshot.py verify [--db kanji_vocab.db] [--snapshot kanji_vocab.snap]   # 불일치가 있으면 종료 코드 1
+    KANJI_SNAPSHOT=kanji_vocab.snap uvicorn main:app                                  # 읽기 전용 서빙
+
+파일 형식 (리틀 엔디언)
+    헤더    MAGIC(8) | 버전 u32 | 섹션 수 u32
+    목차    섹션마다 이름(32, NUL 채움) | 오프셋 u64 | 길이 u64
+    섹션    8바이트 정렬, 배열은 u32('I') / i64('q')
+      strings.data / strings.offsets    모든 문자열을 UTF-8로 이어 붙인 것과 시작 위치 (n+1개)
+      words.*                           행마다 한 칸 (행 순서 = 최신순 updated_at DESC, id DESC)
+        id, wrong_count(i64), word/hiragana/meaning/korean/created_at/updated_at(문자열 번호),
+        word_rank(단어순 정렬에서의 순위), cat_offsets(n+1) / cat_ids(카테고리 번호)
+      ids.sorted / ids.rows             id 오름차순과 그 행 번호 (id -> 행)
+      kanji.keys / kanji.offsets / kanji.postings            한자(코드 포인트순) -> 행 번호 오름차순
+      categories.keys / categories.offsets / categories.postings  카테고리(이름순) -> 행 번호 오름차순
+      meta                              JSON (원본 경로, 생성 시각, 개수, 스키마 버전)
+"""
+
+import argparse
+import bisect
+import json
+import mmap
+import os
+import sqlite3
+import struct
+import sys
+import zlib
+from array import array
+from datetime import datetime, timezone
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from database import current_notebook
+
+MAGIC = b"KVSNAP01"
+FORMAT_VERSION = 1
+SNAPSHOT_FILE = "kanji_vocab.snap"
+
+# 읽기 전용 서빙 모드 - 지정하면 repository가 단어 / 한자 / 카테고리 조회를 스냅샷에서 처리
+SNAPSHOT_ENV = "KANJI_SNAPSHOT"
+
+_HEADER = struct.Struct("<8sII")
+_SECTION = struct.Struct("<32sQQ")
+_NULL_STRING = 0xFFFFFFFF
+_NULL_INT = -(2 ** 63)
+
+WORD_STRING_COLUMNS = ("word", "hiragana", "meaning", "korean", "created_at", "updated_at")
+
+Cursor = Tuple[str, int]
+
+if sys.byteorder != "little":  # pragma: no cover - 배열 섹션을 그대로 캐스팅하므로
+    raise ImportError("스냅샷은 리틀 엔디언 플랫폼에서만 사용할 수 있습니다.")
+
+
+class _StringTable:
+    """내보내기용 문자열 표 (같은 문자열은 한 번만 저장)"""
+
+    def __init__(self):
+        self.ids: Dict[str, int] = {}
+        self.data = bytearray()
+        self.offsets = array("I", [0])
+
+    def add(self, value: Optional[str]) -> int:
+        if value is None:
+            return _NULL_STRING
+        value = str(value)
+        string_id = self.ids.get(value)
+        if string_id is None:
+            string_id = self.ids[value] = len(self.offsets) - 1
+            self.data += value.encode("utf-8")
+            self.offsets.append(len(self.data))
+        return string_id
+
+
+def _postings(groups: Dict[str, List[int]], strings: _StringTable) -> Tuple[array, array, array]:
+    """키(코드 포인트순) -> 행 번호 목록을 keys / offsets / postings 배열로"""
+    keys, offsets, postings = array("I"), array("I", [0]), array("I")
+    for key in sorted(groups):
+        keys.append(strings.add(key))
+        postings.extend(sorted(groups[key]))
+        offsets.append(len(postings))
+    return keys, offsets, postings
+
+
+def export_snapshot(conn: sqlite3.Connection, out_path: str, source: str = "") -> dict:
+    """conn의 데이터로 스냅샷 파일 생성 (임시 파일에 쓴 뒤 교체), meta 반환"""
+    strings = _StringTable()
+    columns = {name: array("I") for name in WORD_STRING_COLUMNS}
+    word_ids, wrong_counts = array("q"), array("q")
+    cat_offsets, cat_ids = array("I", [0]), array("I")
+
+    conn.execute("BEGIN")
+    try:
+        # 카테고리 번호 = 이름순 위치
+        category_names = [row[0] for row in conn.execute("SELECT name FROM categories ORDER BY name")]
+        category_index = {name: index for index, name in enumerate(category_names)}
+        word_categories: Dict[int, List[int]] = {}
+        for word_id, name in conn.execute(
+            """
+            SELECT wc.word_id, c.name FROM word_categories wc JOIN categories c ON c.id = wc.category_id
+            ORDER BY wc.word_id, wc.category_id
+            """
+        ):
+            word_categories.setdefault(word_id, []).append(category_index[name])
+
+        row_of: Dict[int, int] = {}
+        for row in conn.execute(
+            f"""
+            SELECT id, wrong_count, {", ".join(WORD_STRING_COLUMNS)} FROM words
+            ORDER BY updated_at DESC, id DESC
+            """
+        ):
+            row_of[row[0]] = len(word_ids)
+            word_ids.append(row[0])
+            wrong_counts.append(_NULL_INT if row[1] is None else row[1])
+            for name, value in zip(WORD_STRING_COLUMNS, row[2:]):
+                columns[name].append(strings.add(value))
+            categories = word_categories.get(row[0], [])
+            cat_ids.extend(categories)
+            cat_offsets.append(len(cat_ids))
+
+        word_rank = array("I", bytes(4 * len(word_ids)))
+        for rank, (word_id,) in enumerate(conn.execute("SELECT id FROM words ORDER BY word, id")):
+            word_rank[row_of[word_id]] = rank
+
+        kanji_groups: Dict[str, List[int]] = {}
+        for word_id, kanji in conn.execute("SELECT word_id, kanji FROM word_kanji"):
+            if word_id in row_of:
+                kanji_groups.setdefault(kanji, []).append(row_of[word_id])
+        schema_version = conn.execute("PRAGMA user_version").fetchone()[0]
+    finally:
+        conn.rollback()
+
+    category_groups: Dict[str, List[int]] = {name: [] for name in category_names}
+    for row in range(len(word_ids)):
+        for index in cat_ids[cat_offsets[row]:cat_offsets[row + 1]]:
+            category_groups[category_names[index]].append(row)
+
+    kanji_keys, kanji_offsets, kanji_postings = _postings(kanji_groups, strings)
+    category_keys = array("I", (strings.add(name) for name in category_names))
+    _, category_offsets, category_postings = _postings(category_groups, strings)
+
+    order = sorted(range(len(word_ids)), key=lambda row: word_ids[row])
+    meta = {
+        "source": source,
+        "created_at": datetime.now(timezone.utc).isoformat(),
+        "schema_version": schema_version,
+        "words": len(word_ids),
+        "kanji": len(kanji_keys),
+        "categories": len(category_keys),
+    }
+
+    sections = [
+        ("strings.data", bytes(strings.data)),
+        ("strings.offsets", strings.offsets),
+        ("words.id", word_ids),
+        ("words.wrong_count", wrong_counts),
+        *((f"words.{name}", columns[name]) for name in WORD_STRING_COLUMNS),
+        ("words.word_rank", word_rank),
+        ("words.cat_offsets", cat_offsets),
+        ("words.cat_ids", cat_ids),
+        ("ids.sorted", array("q", (word_ids[row] for row in order))),
+        ("ids.rows", array("I", order)),
+        ("kanji.keys", kanji_keys),
+        ("kanji.offsets", kanji_offsets),
+        ("kanji.postings", kanji_postings),
+        ("categories.keys", category_keys),
+        ("categories.offsets", category_offsets),
+        ("categories.postings", category_postings),
+        ("meta", json.dumps(meta, ensure_ascii=False).encode("utf-8")),
+    ]
+    _write_sections(out_path, sections)
+    return meta
+
+
+def _write_sections(out_path: str, sections: list):
+    directory_size = _HEADER.size + _SECTION.size * len(sections)
+    offset = (directory_size + 7) & ~7
+    entries = []
+    for name, data in sections:
+        if len(name) > 32:
+            raise ValueError(f"섹션 이름이 너무 깁니다: {name}")
+        payload = data.tobytes() if isinstance(data, array) else data
+        entries.append((name, offset, payload))
+        offset = (offset + len(payload) + 7) & ~7
+
+    tmp_path = out_path + ".tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(_HEADER.pack(MAGIC, FORMAT_VERSION, len(entries)))
+        for name, section_offset, payload in entries:
+            f.write(_SECTION.pack(name.encode("ascii"), section_offset, len(payload)))
+        for _, section_offset, payload in entries:
+            f.write(b"\0" * (section_offset - f.tell()))
+            f.write(payload)
+    os.replace(tmp_path, out_path)
+
+
+class Snapshot:
+    """mmap으로 연 스냅샷 - WordRepository의 조회 메서드와 같은 형태의 결과를 반환"""
+
+    def __init__(self, path: str):
+        self.path = path
+        with open(path, "rb") as f:
+            self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        self._buffer = buffer = memoryview(self._mmap)
+        self._views: List[memoryview] = []
+        magic, version, count = _HEADER.unpack_from(buffer, 0)
+        if magic != MAGIC or version != FORMAT_VERSION:
+            raise ValueError(f"지원하지 않는 스냅샷 파일입니다: {path}")
+
+        self._sections: Dict[str, memoryview] = {}
+        for index in range(count):
+            name, offset, length = _SECTION.unpack_from(buffer, _HEADER.size + index * _SECTION.size)
+            self._sections[name.rstrip(b"\0").decode("ascii")] = buffer[offset:offset + length]
+
+        self.meta = json.loads(bytes(self._sections["meta"]))
+        # 응답 캐시 / ETag용 - 다시 내보내면 생성 시각이 달라지므로 meta로 구분
+        self.version = f"snap{zlib.crc32(self._sections['meta']):08x}"
+        self._strings = self._sections["strings.data"]
+        self._string_offsets = self._array("strings.offsets", "I")
+        self._ids = self._array("words.id", "q")
+        self._wrong_counts = self._array("words.wrong_count", "q")
+        self._columns = {name: self._array(f"words.{name}", "I") for name in WORD_STRING_COLUMNS}
+        self._word_rank = self._array("words.word_rank", "I")
+        self._cat_offsets = self._array("words.cat_offsets", "I")
+        self._cat_ids = self._array("words.cat_ids", "I")
+        self._sorted_ids = self._array("ids.sorted", "q")
+        self._id_rows = self._array("ids.rows", "I")
+        self._kanji = [self._array(f"kanji.{name}", "I") for name in ("keys", "offsets", "postings")]
+        self._categories = [self._array(f"categories.{name}", "I") for name in ("keys", "offsets", "postings")]
+
+    def _array(self, name: str, fmt: str) -> memoryview:
+        view = self._sections[name].cast(fmt)
+        self._views.append(view)
+        return view
+
+    def close(self):
+        # 내보낸 memoryview가 남아 있으면 mmap을 닫을 수 없으므로 먼저 해제
+        for view in [*self._views, *self._sections.values(), self._buffer]:
+            view.release()
+        self._views.clear()
+        self._sections.clear()
+        self._mmap.close()
+
+    def __len__(self) -> int:
+        return len(self._ids)
+
+    # --- 기본 조회 ---
+
+    def string(self, string_id: int) -> Optional[str]:
+        if string_id == _NULL_STRING:
+            return None
+        offsets = self._string_offsets
+        return str(self._strings[offsets[string_id]:offsets[string_id + 1]], "utf-8")
+
+    def word(self, row: int) -> dict:
+        """행 하나를 WordRepository 응답과 같은 dict로"""
+        string = self.string
+        columns = self._columns
+        wrong_count = self._wrong_counts[row]
+        category_keys = self._categories[0]
+        return {
+            "id": self._ids[row],
+            "word": string(columns["word"][row]),
+            "hiragana": string(columns["hiragana"][row]),
+            "meaning": string(columns["meaning"][row]),
+            "korean": string(columns["korean"][row]),
+            "wrong_count": None if wrong_count == _NULL_INT else wrong_count,
+            "created_at": string(columns["created_at"][row]),
+            "updated_at": string(columns["updated_at"][row]),
+            "category": [
+                string(category_keys[index])
+                for index in self._cat_ids[self._cat_offsets[row]:self._cat_offsets[row + 1]]
+            ],
+        }
+
+    def row_of(self, word_id: int) -> Optional[int]:
+        index = bisect.bisect_left(self._sorted_ids, word_id)
+        if index < len(self._sorted_ids) and self._sorted_ids[index] == word_id:
+            return self._id_rows[index]
+        return None
+
+    def _find_key(self, index: list, key: str) -> Optional[memoryview]:
+        """키(코드 포인트순 정렬)의 행 번호 목록 (없으면 None)"""
+        keys, offsets, postings = index
+        low, high = 0, len(keys)
+        while low < high:
+            middle = (low + high) // 2
+            if self.string(keys[middle]) < key:
+                low = middle + 1
+            else:
+                high = middle
+        if low < len(keys) and self.string(keys[low]) == key:
+            return postings[offsets[low]:offsets[low + 1]]
+        return None
+
+    def _cursor_row(self, after: Cursor) -> int:
+        """(updated_at, id) < after 를 만족하는 첫 행 (행은 updated_at DESC, id DESC 순)"""
+        updated_at_column = self._columns["updated_at"]
+        low, high = 0, len(self._ids)
+        while low < high:
+            middle = (low + high) // 2
+            updated_at = self.string(updated_at_column[middle])
+            # NULL은 DESC에서 맨 뒤이고 비교 결과도 NULL(거짓)이므로 항상 '이후가 아님'으로 취급하지 않는다
+            if updated_at is not None and (updated_at, self._ids[middle]) < tuple(after):
+                high = middle
+            else:
+                low = middle + 1
+        return low
+
+    def _select(
+        self, rows, after: Optional[Cursor], limit: Optional[int], word_order: bool
+    ) -> Iterator[int]:
+        """행 번호 목록(오름차순 = 최신순)에 정렬 / keyset 페이지네이션 적용"""
+        if after is None and limit is None:
+            if word_order:
+                return iter(sorted(rows, key=self._word_rank.__getitem__))
+            return iter(rows)
+        start = 0
+        if after is not None:
+            start = bisect.bisect_left(rows, self._cursor_row(after))
+        end = len(rows) if limit is None else min(len(rows), start + limit)
+        updated_at_column = self._columns["updated_at"]
+        # NULL updated_at 행은 커서 비교에서 제외된다 (SQLite와 동일)
+        return (
+            rows[index]
+            for index in range(start, end)
+            if after is None or updated_at_column[rows[index]] != _NULL_STRING
+        )
+
+    # --- WordRepository와 같은 조회 ---
+
+    def iter_all_words(self, after: Optional[Cursor] = None, limit: Optional[int] = None) -> Iterator[dict]:
+        return map(self.word, self._select(range(len(self._ids)), after, limit, word_order=False))
+
+    def iter_words_by_kanji(
+        self, kanji: str, after: Optional[Cursor] = None, limit: Optional[int] = None
+    ) -> Iterator[dict]:
+        rows = self._find_key(self._kanji, kanji)
+        if rows is None:
+            return iter(())
+        return map(self.word, self._select(rows, after, limit, word_order=True))
+
+    def iter_words_by_category(
+        self, category: str, after: Optional[Cursor] = None, limit: Optional[int] = None
+    ) -> Iterator[dict]:
+        rows = self._find_key(self._categories, category)
+        if rows is None:
+            return iter(())
+        return map(self.word, self._select(rows, after, limit, word_order=category != "예문"))
+
+    def all_kanji(self) -> List[str]:
+        return [self.string(key) for key in self._kanji[0]]
+
+    def all_categories(self) -> List[str]:
+        return [self.string(key) for key in self._categories[0]]
+
+
+def verify_snapshot(snap: Snapshot, conn: sqlite3.Connection) -> List[str]:
+    """스냅샷과 SQLite 원본 비교, 다른 점 목록 (없으면 빈 목록)"""
+    # repository가 스냅샷 모드여도 항상 SQLite 쿼리로 비교하도록 쿼리 생성기만 사용
+    from repository import (
+        ALL_CATEGORIES_SQL,
+        ALL_KANJI_SQL,
+        _all_words_query,
+        _category_words_query,
+        _kanji_words_query,
+        _row_to_word,
+    )
+
+    problems = []
+
+    def compare(name: str, expected: list, actual: list):
+        if expected != actual:
+            first = next(
+                (i for i, (e, a) in enumerate(zip(expected, actual)) if e != a),
+                min(len(expected), len(actual)),
+            )
+            problems.append(f"{name}: {len(expected)}개 중 {first}번째부터 다름 (스냅샷 {len(actual)}개)")
+
+    def words(query) -> list:
+        return [_row_to_word(row) for row in conn.execute(*query)]
+
+    def ids(items) -> list:
+        return [item["id"] for item in items]
+
+    kanji = [row[0] for row in conn.execute(ALL_KANJI_SQL)]
+    categories = [row[0] for row in conn.execute(ALL_CATEGORIES_SQL)]
+    compare("한자 목록", kanji, snap.all_kanji())
+    compare("카테고리 목록", categories, snap.all_categories())
+
+    expected = {word["id"]: word for word in words(_all_words_query(None, None))}
+    actual = {word["id"]: word for word in snap.iter_all_words()}
+    compare("단어 id", sorted(expected), sorted(actual))
+    for word_id in sorted(expected.keys() & actual.keys()):
+        if expected[word_id] != actual[word_id]:
+            problems.append(f"단어 {word_id}: {expected[word_id]!r} != {actual[word_id]!r}")
+    compare("최신순 목록", ids(words(_all_words_query(None, 100))), ids(snap.iter_all_words(None, 100)))
+
+    # 같은 단어(word)끼리의 순서는 SQLite도 정하지 않으므로 단어순 목록은 (word, id) 집합 순서로 비교
+    def by_word(items) -> list:
+        return [(item["word"], item["id"]) for item in items]
+
+    for key in kanji:
+        compare(f"한자 {key}", sorted(by_word(words(_kanji_words_query(key, None, None)))), by_word(snap.iter_words_by_kanji(key)))
+        compare(f"한자 {key} (페이지)", ids(words(_kanji_words_query(key, None, 50))), ids(snap.iter_words_by_kanji(key, None, 50)))
+    for key in categories:
+        query_words = words(_category_words_query(key, None, None))
+        snap_words = list(snap.iter_words_by_category(key))
+        if key == "예문":
+            compare(f"카테고리 {key}", sorted(ids(query_words)), sorted(ids(snap_words)))
+        else:
+            compare(f"카테고리 {key}", sorted(by_word(query_words)), by_word(snap_words))
+        compare(
+            f"카테고리 {key} (페이지)",
+            ids(words(_category_words_query(key, None, 50))),
+            ids(snap.iter_words_by_category(key, None, 50)),
+        )
+    return problems
+
+
+_serving: Optional[Snapshot] = None
+
+
+def serving_snapshot() -> Optional[Snapshot]:
+    """읽기 전용 서빙 모드의 스냅샷 (KANJI_SNAPSHOT 환경 변수가 없으면 None)
+
+    스냅샷은 기본 DB를 대신하므로 노트북(X-Notebook) 요청에서는 None - 노트북은 SQLite로 읽고 쓴다.
+    """
+    global _serving
+    if current_notebook() is not None:
+        return None
+    if _serving is None and os.environ.get(SNAPSHOT_ENV):
+        _serving = Snapshot(os.environ[SNAPSHOT_ENV])
+    return _serving
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="읽기 전용 스냅샷 내보내기 / 검증")
+    parser.add_argument("command", choices=["export", "verify"])
+    parser.add_argument("--db", help="원본 DB 파일 (기본: database.DATABASE_URL)")
+    parser.add_argument("--out", "--snapshot", dest="snapshot", default=SNAPSHOT_FILE, help="스냅샷 파일")
+    args = parser.parse_args()
+
+    import database
+
+    if args.db:
+        database.configure_database(args.db)
+    database.init_db()
+    conn = database.get_db_connection()
+    try:
+        if args.command == "export":
+            meta = export_snapshot(conn, args.snapshot, os.path.abspath(database.DATABASE_URL))
+            size = os.path.getsize(args.snapshot)
+            print(
+                f"✅ {args.snapshot}: 단어 {meta['words']:,}개, 한자 {meta['kanji']:,}개,"
+                f" 카테고리 {meta['categories']:,}개 ({size / 1024 / 1024:.1f} MB)"
+            )
+            return 0
+
+        snap = Snapshot(args.snapshot)
+        try:
+            problems = verify_snapshot(snap, conn)
+        finally:
+            snap.close()
+        if not problems:
+            print(f"✅ {args.snapshot}가 원본과 일치합니다. (생성 {snap.meta['created_at']})")
+            return 0
+        for problem in problems[:50]:
+            print(f"  {problem}")
+        print(f"❌ 불일치 {len(problems)}건 - python snapshot.py export 로 다시 만드세요.")
+        return 1
+    finally:
+        conn.close()
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,116 @@
+"""
+목록 정렬 키 - 정렬마다 미리 계산해 저장한 컬럼과 그 순서의 인덱스를 둔다 (migrations.py 7단계)
+
+- words.reading_key: 읽는 법 순 (히라가나 기준, 가타카나는 히라가나로, 전각/반각 통일)
+- words.meaning_key: 뜻의 가나다순 (앞쪽 괄호 / 기호 무시, 한글 음절은 코드 포인트 순서가 가나다순)
+- word_kanji.position: 단어 안에서 그 한자가 처음 나오는 위치 (한자별 목록을 위치별로 모으기)
+
+repository의 쓰기 메서드가 단어를 추가/수정할 때 함께 저장한다.
+키 계산 방식이 바뀌었거나 repository를 거치지 않고 DB를 고친 경우 다시 계산한다.
+
+    python sort_keys.py rebuild [--db kanji_vocab.db] [--batch-size 5000]
+"""
+
+import argparse
+import re
+import sqlite3
+import sys
+import unicodedata
+from typing import Dict, Union
+
+# 가타카나 ァ(U+30A1)~ヶ(U+30F6) -> 히라가나 ぁ(U+3041)~ゖ(U+3096)
+_KATAKANA_TO_HIRAGANA = {code: code - 0x60 for code in range(0x30A1, 0x30F7)}
+
+# 뜻 앞쪽의 괄호 묶음 / 기호 / 공백 - 예: "(~을) 보다", "~에 대해"
+_MEANING_PREFIX = re.compile(r"^(?:\([^)]*\)|[^\w]|_)+")
+
+
+def reading_key(hiragana: str) -> str:
+    """읽는 법 정렬 키"""
+    return unicodedata.normalize("NFKC", hiragana or "").translate(_KATAKANA_TO_HIRAGANA).strip().lower()
+
+
+def meaning_key(meaning: str) -> str:
+    """뜻 가나다순 정렬 키 (앞쪽 괄호 / 기호를 지운 뒤 남는 것이 없으면 원문 그대로)"""
+    normalized = unicodedata.normalize("NFKC", meaning or "").strip().lower()
+    return _MEANING_PREFIX.sub("", normalized) or normalized
+
+
+def kanji_position(word: str, kanji: str) -> int:
+    """단어 안에서 한자가 처음 나오는 위치 (한자가 없는 단어의 색인 키는 0)"""
+    return max(word.find(kanji), 0)
+
+
+def rebuild_sort_keys(
+    db: Union[sqlite3.Connection, sqlite3.Cursor], batch_size: int = 5000, commit: bool = True
+) -> Dict[str, int]:
+    """모든 단어의 정렬 키를 다시 계산해 바뀐 것만 저장 (id 순서로 batch_size개씩)
+
+    commit=True면 배치마다 커밋 (db는 연결), 마이그레이션처럼 바깥 트랜잭션 안에서 부를 때는 False.
+    정렬 키는 응답에 포함되지 않으므로 updated_at / 변경 로그(word_changes)는 바뀌지 않는다.
+    """
+    counts = {"words": 0, "words_updated": 0, "positions_updated": 0}
+    last_id = 0
+    while True:
+        rows = db.execute(
+            "SELECT id, word, hiragana, meaning, reading_key, meaning_key FROM words WHERE id > ? ORDER BY id LIMIT ?",
+            (last_id, batch_size),
+        ).fetchall()
+        if not rows:
+            break
+        last_id = rows[-1][0]
+        words = {row[0]: row[1] for row in rows}
+
+        word_updates = [
+            (reading, meaning, row[0])
+            for row in rows
+            for reading, meaning in [(reading_key(row[2]), meaning_key(row[3]))]
+            if (reading, meaning) != (row[4], row[5])
+        ]
+        placeholders = ",".join("?" * len(words))
+        position_updates = [
+            (position, word_id, kanji)
+            for word_id, kanji, stored in db.execute(
+                f"SELECT word_id, kanji, position FROM word_kanji WHERE word_id IN ({placeholders})", list(words)
+            )
+            for position in [kanji_position(words[word_id], kanji)]
+            if position != stored
+        ]
+
+        db.executemany("UPDATE words SET reading_key = ?, meaning_key = ? WHERE id = ?", word_updates)
+        db.executemany("UPDATE word_kanji SET position = ? WHERE word_id = ? AND kanji = ?", position_updates)
+        if commit:
+            db.commit()
+        counts["words"] += len(rows)
+        counts["words_updated"] += len(word_updates)
+        counts["positions_updated"] += len(position_updates)
+    return counts
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="목록 정렬 키 관리")
+    parser.add_argument("command", choices=["rebuild"])
+    parser.add_argument("--db", help="DB 파일 (기본: database.DATABASE_URL)")
+    parser.add_argument("--batch-size", type=int, default=5000, help="트랜잭션당 단어 수")
+    args = parser.parse_args()
+
+    # migrations가 이 모듈을 쓰므로 DB 모듈은 명령을 실행할 때만 불러온다
+    import database
+
+    if args.db:
+        database.configure_database(args.db)
+    database.init_db()
+    conn = database.get_db_connection()
+    try:
+        counts = rebuild_sort_keys(conn, args.batch_size)
+    finally:
+        conn.close()
+    print(
+        f"✅ 단어 {counts['words']:,}개 확인 | 정렬 키 갱신 {counts['words_updated']:,}개"
+        f" | 한자 위치 갱신 {counts['positions_updated']:,}행"
+    )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,202 @@
+"""
+한자 토크나이저 - 단어에서 word_kanji에 넣을 한자를 뽑는다
+
+- KANJI_RANGES: 한자로 보는 코드 포인트 범위 (CJK 통합 한자 + 확장 A~I, 호환 한자, 々)
+- 범위 표를 미리 하나의 정규식 문자 클래스로 컴파일해 문자마다 비교하지 않고 한 번에 찾는다
+  (맞닿은 범위는 합쳐서 - 문자 클래스의 범위가 적을수록 빠르다)
+- 같은 한자가 여러 번 나와도 처음 나온 순서대로 한 번만 (word_kanji의 PRIMARY KEY (word_id, kanji))
+- 성능: python -m benchmarks.tokenizer (이전 방식과 비교)
+
+    python tokenizer.py backfill [--db kanji_vocab.db] [--batch-size 5000] [--dry-run]
+        # 기존 단어의 word_kanji를 현재 토크나이저 기준으로 다시 색인
+        # (word_kanji 변경이 word_changes에 기록되므로 실행 중인 서버의 캐시도 바로 갱신된다)
+"""
+
+import argparse
+import re
+import sqlite3
+import sys
+from bisect import bisect_right
+from typing import Dict, Iterable, List
+
+from sort_keys import kanji_position
+
+# (시작, 끝) 코드 포인트, 끝 포함
+KANJI_RANGES = (
+    (0x3005, 0x3005),  # 々 (반복 부호)
+    (0x3400, 0x4DBF),  # CJK 통합 한자 확장 A
+    (0x4E00, 0x9FFF),  # CJK 통합 한자
+    (0xF900, 0xFAFF),  # CJK 호환 한자
+    (0x20000, 0x2A6DF),  # 확장 B
+    (0x2A700, 0x2B73F),  # 확장 C
+    (0x2B740, 0x2B81F),  # 확장 D
+    (0x2B820, 0x2CEAF),  # 확장 E
+    (0x2CEB0, 0x2EBEF),  # 확장 F
+    (0x2EBF0, 0x2EE5F),  # 확장 I
+    (0x2F800, 0x2FA1F),  # CJK 호환 한자 보충
+    (0x30000, 0x3134F),  # 확장 G
+    (0x31350, 0x323AF),  # 확장 H
+)
+
+# 한자가 없는 단어(히라가나만 있는 단어, 예문 등)의 색인 키
+NO_KANJI_KEY = "＿"
+
+
+def _merge_ranges(ranges) -> List[tuple]:
+    """맞닿거나 겹치는 범위를 합침"""
+    merged: List[list] = []
+    for start, end in sorted(ranges):
+        if merged and start <= merged[-1][1] + 1:
+            merged[-1][1] = max(merged[-1][1], end)
+        else:
+            merged.append([start, end])
+    return [tuple(r) for r in merged]
+
+
+_MERGED_RANGES = _merge_ranges(KANJI_RANGES)
+# is_kanji용 - BMP 한자는 집합으로 바로 찾고 (약 2만 8천 자) 확장 B 이후는 범위 시작점을 이진 탐색
+_BMP_KANJI = frozenset(
+    chr(code) for start, end in _MERGED_RANGES if end < 0x10000 for code in range(start, end + 1)
+)
+_ASTRAL_STARTS = [start for start, _ in _MERGED_RANGES if start >= 0x10000]
+_ASTRAL_ENDS = [end for start, end in _MERGED_RANGES if start >= 0x10000]
+
+_KANJI_CLASS = "".join(f"{chr(start)}-{chr(end)}" if start != end else chr(start) for start, end in _MERGED_RANGES)
+_KANJI_PATTERN = re.compile(f"[{_KANJI_CLASS}]")
+_find_kanji = _KANJI_PATTERN.findall
+
+# 일괄 처리용 - 단어를 구분 문자로 이어 붙인 뒤 한자와 구분 문자가 아닌 부분을 한 번에 지운다
+_BULK_SEPARATOR = "\x00"
+_NON_KANJI_RUN = re.compile(f"[^{_KANJI_CLASS}{_BULK_SEPARATOR}]+")
+# 뒤집은 문자열에서 같은 단어 안에 뒤에 다시 나오는 문자 = 원래 순서로 처음이 아닌 중복
+_REPEATED_IN_WORD = re.compile(f"([^{_BULK_SEPARATOR}])(?=[^{_BULK_SEPARATOR}]*\\1)")
+_EMPTY_WORD = _BULK_SEPARATOR * 2
+_EMPTY_WORD_KEY = f"{_BULK_SEPARATOR}{NO_KANJI_KEY}{_BULK_SEPARATOR}"
+
+
+def is_kanji(char: str) -> bool:
+    """문자(한 글자)가 한자인지 확인"""
+    return char in _BMP_KANJI or (char >= "\U00010000" and _is_astral_kanji(char))
+
+
+def _is_astral_kanji(char: str) -> bool:
+    code = ord(char)
+    index = bisect_right(_ASTRAL_STARTS, code) - 1
+    return index >= 0 and code <= _ASTRAL_ENDS[index]
+
+
+def tokenize(word: str) -> List[str]:
+    """단어의 한자를 처음 나온 순서대로 중복 없이 (없으면 빈 목록)"""
+    return list(dict.fromkeys(_find_kanji(word)))
+
+
+def extract_kanji(word: str) -> List[str]:
+    """word_kanji 색인용 한자 목록 (한자가 없으면 [NO_KANJI_KEY])"""
+    # 단어마다 불리므로 tokenize를 거치지 않고 직접 (함수 호출 한 번이 전체 시간의 상당 부분)
+    # 한자가 두 개 이하인 단어가 대부분이라 그때는 dict를 만들지 않는다
+    kanji = _find_kanji(word)
+    count = len(kanji)
+    if count < 2:
+        return kanji or [NO_KANJI_KEY]
+    if count == 2:
+        return kanji if kanji[0] != kanji[1] else kanji[:1]
+    return list(dict.fromkeys(kanji))
+
+
+def extract_kanji_bulk(words: Iterable[str]) -> List[List[str]]:
+    """여러 단어를 한 번에 색인 (가져오기/일괄 추가용), 입력 순서대로 extract_kanji 결과
+
+    단어마다 정규식을 호출하지 않고 이어 붙인 문자열 하나를 치환 두 번으로 처리한다.
+    (한자만 남기기 -> 뒤집어서 단어 안의 중복 제거, 한자가 없는 단어는 NO_KANJI_KEY로 채움)
+    """
+    words = list(words)
+    kanji = _NON_KANJI_RUN.sub("", _BULK_SEPARATOR.join(words))
+    kanji = _REPEATED_IN_WORD.sub("", kanji[::-1])[::-1]
+    # 빈 단어가 연달아 있으면 한 번의 replace로는 하나 건너 하나만 채워지므로 두 번
+    marked = f"{_BULK_SEPARATOR}{kanji}{_BULK_SEPARATOR}"
+    marked = marked.replace(_EMPTY_WORD, _EMPTY_WORD_KEY).replace(_EMPTY_WORD, _EMPTY_WORD_KEY)
+    parts = marked[1:-1].split(_BULK_SEPARATOR)
+    if len(parts) != len(words):
+        # 단어 안에 구분 문자가 들어 있었거나 단어가 없는 경우
+        return [extract_kanji(word) for word in words]
+    return list(map(list, parts))
+
+
+def backfill_word_kanji(conn: sqlite3.Connection, batch_size: int = 5000, dry_run: bool = False) -> Dict[str, int]:
+    """모든 단어의 word_kanji를 extract_kanji 기준으로 맞춤 - 빠진 행만 추가, 남는 행만 삭제
+
+    id 순서로 batch_size개씩 읽어 배치마다 커밋하므로 중간에 멈춰도 다시 실행하면 된다.
+    (kanji_stats는 word_kanji 트리거가 함께 갱신)
+    """
+    counts = {"words": 0, "changed_words": 0, "inserted": 0, "deleted": 0}
+    last_id = 0
+    while True:
+        rows = conn.execute(
+            "SELECT id, word FROM words WHERE id > ? ORDER BY id LIMIT ?",
+            (last_id, batch_size),
+        ).fetchall()
+        if not rows:
+            break
+        last_id = rows[-1][0]
+        word_ids = [row[0] for row in rows]
+
+        current: Dict[int, set] = {word_id: set() for word_id in word_ids}
+        placeholders = ",".join("?" * len(word_ids))
+        for word_id, kanji in conn.execute(
+            f"SELECT word_id, kanji FROM word_kanji WHERE word_id IN ({placeholders})", word_ids
+        ):
+            current[word_id].add(kanji)
+
+        inserts = []
+        deletes = []
+        for (word_id, word), kanji_list in zip(rows, extract_kanji_bulk(row[1] for row in rows)):
+            have = current[word_id]
+            missing = [(word_id, kanji, kanji_position(word, kanji)) for kanji in kanji_list if kanji not in have]
+            extra = [(word_id, kanji) for kanji in have - set(kanji_list)]
+            if missing or extra:
+                counts["changed_words"] += 1
+            inserts.extend(missing)
+            deletes.extend(extra)
+
+        counts["words"] += len(rows)
+        counts["inserted"] += len(inserts)
+        counts["deleted"] += len(deletes)
+        if not dry_run and (inserts or deletes):
+            conn.executemany("DELETE FROM word_kanji WHERE word_id = ? AND kanji = ?", deletes)
+            conn.executemany(
+                "INSERT OR IGNORE INTO word_kanji (word_id, kanji, position) VALUES (?, ?, ?)", inserts
+            )
+            conn.commit()
+    return counts
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="한자 토크나이저 도구")
+    parser.add_argument("command", choices=["backfill"])
+    parser.add_argument("--db", help="DB 파일 (기본: database.DATABASE_URL)")
+    parser.add_argument("--batch-size", type=int, default=5000, help="트랜잭션당 단어 수")
+    parser.add_argument("--dry-run", action="store_true", help="바뀔 행 수만 세고 저장하지 않음")
+    args = parser.parse_args()
+
+    # utils가 이 모듈을 쓰므로 DB 모듈은 명령을 실행할 때만 불러온다
+    import database
+
+    if args.db:
+        database.configure_database(args.db)
+    database.init_db()
+    conn = database.get_db_connection()
+    try:
+        counts = backfill_word_kanji(conn, args.batch_size, args.dry_run)
+    finally:
+        conn.close()
+
+    action = "바뀔" if args.dry_run else "바뀐"
+    print(
+        f"✅ 단어 {counts['words']:,}개 확인 | {action} 단어 {counts['changed_words']:,}개"
+        f" | 추가 {counts['inserted']:,}행 | 삭제 {counts['deleted']:,}행"
+    )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,11 +1,32 @@
+import base64
+import json
+
+import tokenizer
+
+
 def is_kanji(char: str) -> bool:
-    """문자가 한자인지 확인"""
-    return '\u4e00' <= char <= '\u9fff'
+    """문자가 한자인지 확인 (범위는 tokenizer.KANJI_RANGES)"""
+    return tokenizer.is_kanji(char)
 
 
 def extract_kanji_from_word(word: str) -> list[str]:
-    """단어에서 한자만 추출 (없으면 전각 언더바로 대체)"""
-    kanji_list = [char for char in word if is_kanji(char)]
-    if not kanji_list:
-        kanji_list = ['＿']
-    return kanji_list
+    """단어에서 한자만 중복 없이 추출 (없으면 전각 언더바로 대체)"""
+    return tokenizer.extract_kanji(word)
+
+
+def encode_cursor(values: tuple) -> str:
+    """페이지네이션 커서 값을 URL-safe 문자열로 인코딩"""
+    raw = json.dumps(list(values), ensure_ascii=False, separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode("utf-8")).decode("ascii").rstrip("=")
+
+
+def decode_cursor(token: str) -> tuple:
+    """encode_cursor로 만든 문자열을 다시 커서 값으로 디코딩 (형식 오류 시 ValueError)"""
+    try:
+        padded = token + "=" * (-len(token) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+    except (ValueError, UnicodeError) as e:
+        raise ValueError(f"잘못된 커서입니다: {token}") from e
+    if not isinstance(values, list):
+        raise ValueError(f"잘못된 커서입니다: {token}")
+    return tuple(values)
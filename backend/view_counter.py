@@ -0,0 +1,131 @@
+"""
+단어 조회 수 (write-behind)
+
+GET /kanji/{kanji} 응답에 들어간 단어마다 조회 수를 메모리 버퍼에 단어 id별로 합산해 두었다가,
+주기적으로(FLUSH_INTERVAL초, main.py) 쓰기 큐에서 한 트랜잭션으로 word_views에 더한다.
+조회 요청은 DB에 쓰지 않으므로 읽기가 SQLite의 단일 쓰기 잠금을 두고 다투지 않는다.
+
+- 서버를 종료할 때 남은 버퍼를 기록한다 (main.py shutdown)
+- 비정상 종료하면 마지막 기록 이후의 조회 수는 잃는다 (최대 FLUSH_INTERVAL초 분량)
+- 인기 단어(hot_words)는 기록된 합계와 아직 버퍼에 있는 조회 수를 합쳐 계산한다
+
+버퍼는 노트북마다 따로 두고(view_counter는 현재 노트북의 버퍼로 넘겨주는 NotebookLocal),
+주기 기록은 버퍼가 빈 노트북을 건너뛴다. 노트북이 연결 LRU에서 빠져도 버퍼는 버리지 않는다.
+
+응답 캐시와 마찬가지로 버퍼는 프로세스 안에서만 유지된다. (워커마다 따로 모아 각자 DB에 더한다)
+"""
+
+import os
+import sqlite3
+import threading
+from collections import Counter
+from typing import Dict, Iterable, List, Tuple
+
+from database import NotebookLocal
+
+FLUSH_INTERVAL = float(os.environ.get("KANJI_VIEW_FLUSH_SECONDS", "30"))
+
+# SQLite 변수 개수 제한(기본 999 이상)을 넘지 않도록 나눠서 조회
+_CHUNK_SIZE = 500
+
+# 인기 단어 계산 도중 기록이 시작되면 다시 읽는 횟수
+_HOT_WORDS_ATTEMPTS = 3
+
+# 그 사이 삭제된 단어는 건너뛴다 (word_views는 words 삭제 시 함께 삭제)
+_ADD_VIEWS_SQL = """
+    INSERT INTO word_views (word_id, view_count)
+    SELECT id, ? FROM words WHERE id = ?
+    ON CONFLICT (word_id) DO UPDATE SET view_count = view_count + excluded.view_count
+"""
+
+# 기록된 조회 수 상위 limit개 (idx_word_views_count 순서)
+HOT_WORDS_SQL = "SELECT word_id, view_count FROM word_views ORDER BY view_count DESC, word_id LIMIT ?"
+
+
+def view_counts_query(word_ids: List[int]) -> Tuple[str, list]:
+    """단어들의 기록된 조회 수"""
+    placeholders = ",".join("?" * len(word_ids))
+    return f"SELECT word_id, view_count FROM word_views WHERE word_id IN ({placeholders})", list(word_ids)
+
+
+class ViewCounter:
+    """단어 id -> 아직 기록하지 않은 조회 수"""
+
+    def __init__(self):
+        self._pending: Counter = Counter()
+        # record()는 이벤트 루프에서 불리므로 버퍼만 잠깐 잠근다
+        self._lock = threading.Lock()
+        # 버퍼에서 꺼낸 조회 수를 기록하는 중인지 (끝나면 _flushed로 알린다)
+        self._flushing = False
+        self._flushed = threading.Condition(self._lock)
+        # 기록을 시작할 때마다 증가 (인기 단어 계산 도중 기록이 있었는지 확인용)
+        self._flushes = 0
+        # 기록끼리만 직렬화 (주기 기록과 종료 시 기록)
+        self._flush_lock = threading.Lock()
+
+    def pending_count(self) -> int:
+        """아직 기록하지 않은 단어 수"""
+        return len(self._pending)
+
+    def record(self, word_ids: Iterable[int]):
+        """조회된 단어마다 1 증가"""
+        with self._lock:
+            self._pending.update(word_ids)
+
+    def flush(self, conn: sqlite3.Connection) -> int:
+        """버퍼의 조회 수를 한 트랜잭션으로 더하고 버퍼에서 꺼낸 단어 수를 반환 (실패하면 버퍼로 되돌림)"""
+        with self._flush_lock:
+            with self._lock:
+                pending, self._pending = self._pending, Counter()
+                if not pending:
+                    return 0
+                self._flushing = True
+                self._flushes += 1
+            try:
+                conn.executemany(_ADD_VIEWS_SQL, [(count, word_id) for word_id, count in pending.items()])
+                conn.commit()
+            except Exception:
+                conn.rollback()
+                with self._lock:
+                    self._pending.update(pending)
+                raise
+            finally:
+                with self._lock:
+                    self._flushing = False
+                    self._flushed.notify_all()
+            return len(pending)
+
+    def hot_words(self, conn: sqlite3.Connection, limit: int) -> List[Tuple[int, int]]:
+        """조회 수가 많은 단어 [(단어 id, 조회 수)] - 기록된 합계 + 버퍼 (같으면 id순)
+
+        버퍼에 없는 단어는 기록된 합계 상위 limit개 안에 있어야 전체 상위 limit개에 들 수 있으므로
+        상위 limit개와 버퍼에 있는 단어의 기록된 합계만 읽는다.
+        버퍼는 잠깐 잠가 복사만 하고 DB는 기록(flush)과 잠금을 다투지 않고 읽는다.
+        - 기록이 커밋 중이면 그 조회 수가 DB에 들어갔는지 알 수 없으므로 끝날 때까지 기다렸다가 복사한다
+        - 읽는 사이 새 기록이 시작되었으면 같은 조회 수를 두 번 셀 수 있으므로 다시 계산한다
+          (_HOT_WORDS_ATTEMPTS번까지, 계속 겹치면 마지막 결과를 그대로 쓴다)
+        """
+        for _ in range(_HOT_WORDS_ATTEMPTS):
+            with self._lock:
+                while self._flushing:
+                    self._flushed.wait()
+                flushes = self._flushes
+                pending = Counter(self._pending)
+            # 상위 목록과 버퍼 단어의 합계를 같은 시점에서 읽도록 읽기 트랜잭션 하나로
+            conn.execute("BEGIN")
+            try:
+                totals: Dict[int, int] = dict(conn.execute(HOT_WORDS_SQL, (limit,)).fetchall())
+                word_ids = list(pending)
+                for start in range(0, len(word_ids), _CHUNK_SIZE):
+                    totals.update(conn.execute(*view_counts_query(word_ids[start:start + _CHUNK_SIZE])).fetchall())
+            finally:
+                conn.rollback()
+            with self._lock:
+                if self._flushes == flushes:
+                    break
+        for word_id, count in pending.items():
+            totals[word_id] = totals.get(word_id, 0) + count
+        return sorted(totals.items(), key=lambda item: (-item[1], item[0]))[:limit]
+
+
+view_counter = NotebookLocal(ViewCounter)
@@ -0,0 +1,101 @@
+// api.js
+import { API_URL } from "./constants";
+
+// NDJSON 스트리밍 응답을 읽으면서, 새로 도착한 행만 onRows로 전달한다. (호출하는 쪽에서 이어 붙임)
+// 청크마다 렌더링하지 않도록 화면 갱신(animation frame)당 한 번으로 모아서 전달하고, 끝나면 남은 행을 전달한다.
+// 응답이 실패(4xx/5xx)하거나 JSON이 아닌 줄이 오면 Error를 던진다.
+export async function fetchWordStream(path, onRows) {
+  const separator = path.includes("?") ? "&" : "?";
+  const res = await fetch(`${API_URL}${path}${separator}stream=true`);
+  if (!res.ok) {
+    const message = await res.text();
+    throw new Error(`목록 스트리밍 실패 (${res.status}): ${message}`);
+  }
+
+  const reader = res.body.getReader();
+  const decoder = new TextDecoder();
+  let pending = [];
+  let frame = null;
+  let total = 0;
+  let buffer = "";
+
+  const flush = () => {
+    frame = null;
+    if (pending.length === 0) return;
+    const rows = pending;
+    pending = [];
+    onRows(rows);
+  };
+
+  const parse = (line) => {
+    try {
+      pending.push(JSON.parse(line));
+      total += 1;
+    } catch (err) {
+      throw new Error(`목록 스트리밍 실패: JSON이 아닌 줄 (${line.slice(0, 100)})`);
+    }
+  };
+
+  try {
+    while (true) {
+      const { done, value } = await reader.read();
+      if (done) break;
+
+      buffer += decoder.decode(value, { stream: true });
+      const lines = buffer.split("\n");
+      buffer = lines.pop(); // 마지막 줄은 아직 덜 받았을 수 있음
+
+      for (const line of lines) {
+        if (line) parse(line);
+      }
+      if (pending.length > 0 && frame === null) frame = requestAnimationFrame(flush);
+    }
+    buffer += decoder.decode();
+    if (buffer) parse(buffer);
+  } finally {
+    if (frame !== null) cancelAnimationFrame(frame);
+    reader.releaseLock();
+  }
+  flush();
+  return total;
+}
+
+// 현재 변경 seq - 목록을 처음 받기 전에 호출해 두면 이후 변경을 fetchChanges로 받을 수 있다.
+export async function fetchChangeSeq() {
+  const res = await fetch(`${API_URL}/changes`);
+  const { seq } = await res.json();
+  return seq;
+}
+
+// since 이후의 변경을 모두 받아 하나로 합친다. (reset이면 목록 전체를 다시 받아야 함)
+export async function fetchChanges(since) {
+  const merged = { seq: since, reset: false, upserts: [], deleted: [] };
+  let hasMore = true;
+  while (hasMore) {
+    const res = await fetch(`${API_URL}/changes?since=${merged.seq}`);
+    const page = await res.json();
+    if (page.reset) return { ...merged, seq: page.seq, reset: true };
+    merged.seq = page.seq;
+    merged.upserts.push(...page.upserts);
+    merged.deleted.push(...page.deleted);
+    hasMore = page.has_more;
+  }
+  return merged;
+}
+
+// 변경을 목록에 반영 - 수정된 단어는 제자리에서 교체, belongs(word)가 false가 되면 제거,
+// 목록에 없던 단어는 belongs면 맨 앞에 추가, 삭제된 단어는 제거
+export function applyChanges(words, changes, belongs = () => true) {
+  const upserts = new Map(changes.upserts.map((word) => [word.id, word]));
+  const deleted = new Set(changes.deleted);
+  const result = [];
+  for (const word of words) {
+    if (deleted.has(word.id)) continue;
+    const updated = upserts.get(word.id);
+    upserts.delete(word.id);
+    if (!updated) result.push(word);
+    else if (belongs(updated)) result.push(updated);
+  }
+  const added = [...upserts.values()].filter(belongs);
+  return [...added, ...result];
+}
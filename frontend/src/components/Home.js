@@ -1,16 +1,30 @@
-import { useState, useEffect } from "react";
+import { useState, useEffect, useRef } from "react";
 import WordTable from "./WordTable";
 import "../App.css";
-import { API_URL } from "../constants";
+import { applyChanges, fetchChanges, fetchChangeSeq, fetchWordStream } from "../api";
 
 
 function Home() {
   const [words, setWords] = useState([]);
+  const seqRef = useRef(null);
 
+  // ✅ 스트리밍으로 받아서 첫 행부터 바로 테이블에 표시 (새로 받은 행만 이어 붙임)
   const fetchAllWords = async () => {
-    const res = await fetch(`${API_URL}/words_list`);
-    const data = await res.json();
-    setWords(data);
+    try {
+      seqRef.current = await fetchChangeSeq();
+      setWords([]);
+      await fetchWordStream("/words_list", (rows) => setWords((prev) => prev.concat(rows)));
+    } catch (error) {
+      console.error(error);
+    }
+  };
+
+  // ✅ 수정/삭제 후에는 바뀐 단어만 받아서 반영
+  const syncWords = async () => {
+    const changes = await fetchChanges(seqRef.current);
+    if (changes.reset) return fetchAllWords();
+    seqRef.current = changes.seq;
+    setWords((prev) => applyChanges(prev, changes));
   };
 
   useEffect(() => {
@@ -24,7 +38,7 @@ function Home() {
         <div className="detail">(total: {words.length})</div>
       </div>
       {/* ✅ 갱신 함수도 props로 전달 */}
-      <WordTable words={words} refreshWords={fetchAllWords} />
+      <WordTable words={words} refreshWords={syncWords} />
     </div>
   );
 }
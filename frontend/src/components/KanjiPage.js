@@ -1,23 +1,34 @@
 // 특정 한자 페이지 - 그 한자를 가지고 있는 모든 단어들이 표시된다.
 
-import { useState, useEffect } from "react";
+import { useState, useEffect, useRef } from "react";
 import { useParams } from "react-router-dom";
 import WordTable from "./WordTable";
 import '../App.css';
 import { API_URL } from "../constants";
+import { applyChanges, fetchChanges, fetchChangeSeq } from "../api";
 
 function KanjiPage() {
   const { kanji } = useParams();
   const [words, setWords] = useState([]);
+  const seqRef = useRef(null);
 
   // 🔹 데이터를 새로 불러오는 함수
   const fetchWords = async () => {
     if (!kanji) return;
+    seqRef.current = await fetchChangeSeq();
     const res = await fetch(`${API_URL}/kanji/${kanji}`);
     const data = await res.json();
     setWords(data);
   };
 
+  // 🔹 수정/삭제 후에는 바뀐 단어만 받아서 반영
+  const syncWords = async () => {
+    const changes = await fetchChanges(seqRef.current);
+    if (changes.reset) return fetchWords();
+    seqRef.current = changes.seq;
+    setWords((prev) => applyChanges(prev, changes, (word) => word.word.includes(kanji)));
+  };
+
   useEffect(() => {
     fetchWords();
   }, [kanji]);
@@ -29,7 +40,7 @@ function KanjiPage() {
         {/* 🔹 WordTable에 refreshWords 전달 */}
         <div className="detail">(total: {words.length})</div>
       </div>
-      <WordTable words={words} refreshWords={fetchWords} />
+      <WordTable words={words} refreshWords={syncWords} />
     </div>
   );
 }
@@ -39,20 +39,11 @@ function WordTable({ words, refreshWords }) {
 
   const handleCheckCount = async (item, mode) => {
     try {
-      const updatedCount =
-        mode === "increase"
-          ? (item.wrong_count || 0) + 1
-          : Math.max((item.wrong_count || 0) - 1, 0); // 0 이하로 내려가지 않게
-
-      const updated = {
-        ...item,                       // 전체 필드 채움
-        wrong_count: updatedCount,
-      };
-
+      // 오답 수만 서버에서 원자적으로 증감 (0 이하로는 서버가 내려가지 않게 처리)
       const response = await fetch(`${API_URL}/kanji/${item.id}`, {
-        method: "PUT",
+        method: "PATCH",
         headers: { "Content-Type": "application/json" },
-        body: JSON.stringify(updated),
+        body: JSON.stringify({ wrong_count_delta: mode === "increase" ? 1 : -1 }),
       });
 
       if (!response.ok) throw new Error("카운트 수정 실패");